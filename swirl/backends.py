@@ -0,0 +1,72 @@
+"""Output backends: where rendered frames go when a mode shows them.
+
+The hardware backend drives the real strip. The virtual and null
+backends don't need any GPIO libraries, so that modes can be run,
+profiled and tested on an ordinary machine.
+"""
+
+import collections
+import time
+
+import swirl.framebuffer as framebuffer
+
+
+class NullBackend:
+    """Discards frames as fast as possible, counting them."""
+
+    def __init__(self, n=50):
+        self.n = n
+        self.frames = 0
+
+    def show(self, buf):
+        self.frames += 1
+
+
+class VirtualBackend(NullBackend):
+    """Records frames in memory as (timestamp, bytes) pairs.
+
+    Only the most recent max_frames frames are kept.
+    """
+
+    def __init__(self, n=50, max_frames=10000):
+        super().__init__(n)
+        self.recorded = collections.deque(maxlen=max_frames)
+
+    def show(self, buf):
+        self.frames += 1
+        self.recorded.append((time.monotonic(), bytes(buf)))
+
+    def last_frame(self):
+        """Return the most recent frame as a list of (r, g, b) tuples,
+        or None if nothing has been shown yet."""
+        if not self.recorded:
+            return None
+        (t, b) = self.recorded[-1]
+        return list(zip(b[0::3], b[1::3], b[2::3]))
+
+
+class HardwareBackend(NullBackend):
+    """Sends frames to a neopixel strip on a GPIO pin."""
+
+    def __init__(self, n=50, pin="D18"):
+        super().__init__(n)
+        import board
+        import neopixel
+        self.strip = neopixel.NeoPixel(getattr(board, pin), n, auto_write=False)
+
+    def show(self, buf):
+        self.frames += 1
+        framebuffer.write_neopixel(self.strip, buf)
+
+
+backends = {"hardware": HardwareBackend,
+            "virtual": VirtualBackend,
+            "null": NullBackend}
+
+
+def make_backend(name, n=50):
+    try:
+        backend_class = backends[name]
+    except KeyError:
+        raise ValueError("Unknown backend {}, should be one of: {}".format(name, ", ".join(backends)))
+    return backend_class(n)
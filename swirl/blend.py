@@ -0,0 +1,174 @@
+"""Blending whole frames together, for transitions between modes and
+for layering one mode on top of another.
+
+Frames are packed r, g, b bytes. Scaling a frame's brightness is a
+bytes.translate through a lookup table, and combining two frames is a
+numpy operation on the whole buffer if numpy is installed, so that
+blending adds a few microseconds to a frame rather than a python loop
+over every byte. numpy is only imported the first time two frames are
+combined, to keep it out of the driver's startup.
+"""
+
+import functools
+import operator
+import time
+
+import swirl.framebuffer as framebuffer
+
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """numpy, or None if it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.lru_cache(maxsize=257)
+def scale_table(w):
+    """Lookup table for scaling a byte value by w/256, w in 0..256."""
+    return bytes((i * w) >> 8 for i in range(256))
+
+
+def weights(t):
+    """The weights out of 256 for the old and new frames, t of the way
+    (0..1) through a transition."""
+    w = min(max(int(t * 256 + 0.5), 0), 256)
+    return (256 - w, w)
+
+
+def _add(a, b):
+    numpy = _numpy()
+    if numpy is not None:
+        return (numpy.frombuffer(a, dtype=numpy.uint8) + numpy.frombuffer(b, dtype=numpy.uint8)).tobytes()
+    return bytes(map(operator.add, a, b))
+
+
+# byte sums clipped to 255
+_clip = bytes(min(i, 255) for i in range(511))
+
+
+def _add_clipped(a, b):
+    numpy = _numpy()
+    if numpy is not None:
+        s = numpy.frombuffer(a, dtype=numpy.uint8).astype(numpy.uint16) + numpy.frombuffer(b, dtype=numpy.uint8)
+        return numpy.minimum(s, 255).astype(numpy.uint8).tobytes()
+    return bytes(map(_clip.__getitem__, map(operator.add, a, b)))
+
+
+def _max(a, b):
+    numpy = _numpy()
+    if numpy is not None:
+        return numpy.maximum(numpy.frombuffer(a, dtype=numpy.uint8), numpy.frombuffer(b, dtype=numpy.uint8)).tobytes()
+    return bytes(map(max, a, b))
+
+
+def linear(old, new, t):
+    """Fade from old to new: each byte is old*(1-t) + new*t."""
+    (wo, wn) = weights(t)
+    return _add(old.translate(scale_table(wo)), new.translate(scale_table(wn)))
+
+
+def lighten(old, new, t):
+    """Fade old out and new in, showing whichever is brighter, as
+    swirl.colour.max_pixel does."""
+    (wo, wn) = weights(t)
+    return _max(old.translate(scale_table(wo)), new.translate(scale_table(wn)))
+
+
+def wipe(old, new, t):
+    """Replace old with new pixel by pixel, from the centre of the
+    spiral outwards. The last pixel is the one in the centre."""
+    o = len(new) - int(len(new) // 3 * t) * 3
+    return old[:o] + new[o:]
+
+
+# transitions, by name
+blends = {"linear": linear, "max": lighten, "wipe": wipe}
+
+
+def over(below, above, opacity):
+    """above on top of below, at opacity (0..1)."""
+    return linear(below, above, opacity)
+
+
+def add(below, above, opacity):
+    """above added on to below, clipped at full brightness."""
+    (_, w) = weights(opacity)
+    return _add_clipped(below, above.translate(scale_table(w)))
+
+
+def lighter(below, above, opacity):
+    """Whichever of below and above is brighter, byte by byte."""
+    (_, w) = weights(opacity)
+    return _max(below, above.translate(scale_table(w)))
+
+
+def masked(below, above, opacity):
+    """above on top of below as for over, except that black pixels in
+    above are left transparent."""
+    blended = over(below, above, opacity)
+    numpy = _numpy()
+    if numpy is not None:
+        mask = numpy.frombuffer(above, dtype=numpy.uint8).reshape(-1, 3).any(axis=1)
+        b = numpy.frombuffer(below, dtype=numpy.uint8).reshape(-1, 3)
+        o = numpy.frombuffer(blended, dtype=numpy.uint8).reshape(-1, 3)
+        return numpy.where(mask[:, None], o, b).tobytes()
+    out = bytearray(below)
+    for p in range(0, len(above), 3):
+        if above[p] or above[p+1] or above[p+2]:
+            out[p:p+3] = blended[p:p+3]
+    return bytes(out)
+
+
+# ways of putting one layer on top of another, by name
+layer_blends = {"over": over, "add": add, "max": lighter, "masked": masked}
+
+
+def crossfade(frames, old, duration, blend, step=0.02):
+    """Pass (frame, delay) pairs through from frames, blended with the
+    frame old for the first duration seconds after the first frame.
+
+    While the transition is going on, a frame shown for longer than
+    step seconds is split into several, so that the blend moves on
+    every step seconds even if the mode itself changes slowly.
+    """
+    old = bytes(old)
+    started = None
+
+    def progress():
+        return (time.monotonic() - started) / duration
+
+    try:
+        new = None
+        for (frame, delay) in frames:
+            if frame is not None:
+                if isinstance(frame, framebuffer.Frame):
+                    frame = frame.buf
+                new = bytes(frame)
+            if new is None:
+                # nothing to fade to yet
+                yield (frame, delay)
+                continue
+            if started is None:
+                started = time.monotonic()
+
+            remaining = delay
+            t = progress()
+            while t < 1.0:
+                s = min(step, remaining)
+                yield (blend(old, new, t), s)
+                remaining -= s
+                if remaining <= 0:
+                    break
+                t = progress()
+            if t >= 1.0:
+                # the rest of this frame is shown as it is, and so is
+                # everything after it
+                yield (new, remaining)
+                break
+        yield from frames
+    finally:
+        frames.close()
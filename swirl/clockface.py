@@ -0,0 +1,72 @@
+"""Cached geometry for the clock modes.
+
+The hands of a clock only move once a minute (or once a second for the
+second hand), but the clock modes redraw at 20Hz. Working out which
+pixels make up each hand means a sorted distance pass over the whole
+spiral, so that is cached here: per hand angle for the pixel
+orderings, and per displayed time for the clock face itself.
+"""
+
+import functools
+
+import swirl.framebuffer as framebuffer
+from swirl.colour import gamma_scale
+from swirl.topologies import pixels_for_angle
+
+# Clock hand angles are already quantised by the time: the hour hand
+# has 720 positions, the minute and second hands 60 each, so the angle
+# itself is used as the cache key. Rounding angles to a grid instead
+# would change which of two equidistant pixels comes first.
+@functools.lru_cache(maxsize=1024)
+def angle_pixels(angle, loop_in):
+    """Pixel numbers ordered by distance from the point at angle (0..1)
+    around loop loop_in, as in pixels_for_angle, but without distances
+    and cached."""
+    (d, ps) = zip(*pixels_for_angle(angle, loop_in))
+    return ps
+
+
+def dot_clock_angles(hour, minute, second):
+    hour_angle = (0.5 + hour/12.0 + minute/60.0/12.0) % 1.0
+    minute_angle = (0.5 + minute/60.0) % 1.0
+    second_angle = (0.5 + second/60.0) % 1.0
+    return (hour_angle, minute_angle, second_angle)
+
+
+@functools.lru_cache(maxsize=2)
+def dot_clock_face(hour, minute):
+    """The dot clock hour and minute hands for a time, as
+    (frame bytes, pixels used by the hands). This is only
+    recalculated when the displayed minute changes."""
+    (hour_angle, minute_angle, _) = dot_clock_angles(hour, minute, 0)
+
+    mins_scaled = int(minute / 15 + 1)
+    minute_pixels = angle_pixels(minute_angle, 0)[0:mins_scaled]
+
+    if hour == 0:
+        hour_dot_count = 12
+    else:
+        hour_dot_count = hour
+
+    hour_pixels = [p for p in angle_pixels(hour_angle, 1) if p not in minute_pixels]
+    hour_pixels = hour_pixels[0:hour_dot_count]
+
+    face = framebuffer.Frame()
+    for (hour_count, pixel) in enumerate(hour_pixels):
+        factor = hour_count / float(len(hour_pixels))
+        face[pixel] = (gamma_scale(1.0 - 0.6 * factor), gamma_scale(0.2 * factor), gamma_scale(0.2 * factor))
+
+    for pixel in minute_pixels:
+        face[pixel] = (0,0,32)
+
+    return (bytes(face.buf), frozenset(hour_pixels) | frozenset(minute_pixels))
+
+
+@functools.lru_cache(maxsize=2)
+def dot_clock_seconds(hour, minute, second):
+    """The pixels making up the dot clock second hand, avoiding
+    the pixels already used by the other hands."""
+    (_, _, second_angle) = dot_clock_angles(hour, minute, second)
+    (_, used) = dot_clock_face(hour, minute)
+    second_pixels = [p for p in angle_pixels(second_angle, 0) if p not in used]
+    return tuple(second_pixels[0:10])
@@ -1,13 +1,21 @@
 import colorsys
+import functools
+import itertools
 import random
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# number of steps in the float lookup tables. 4096 steps is enough
+# that the table never differs from the calculated value by more
+# than one brightness level
+lut_resolution = 4096
+
 def scale(f):
     """ scale from 0..1 : float -> 0..255 : int"""
-    try:
-      return int(f * 255)
-    except:
-      print("Scale got an exception on input {}".format(f))
-      reraise
+    return int(f * 255)
 
 def gamma(v, gamma_factor=1.9):
     """ gamma correct on range 0..1 : float
@@ -23,14 +31,129 @@ def gamma(v, gamma_factor=1.9):
 
     return (v ** gamma_factor)
 
+@functools.lru_cache(maxsize=16)
+def gamma_table(gamma_factor=1.9):
+    """Lookup table for scale(gamma(v)): entry i is the byte value
+    for v = i / lut_resolution. Tables are made the first time each
+    gamma factor is used, and the most recently used ones are kept.
+
+    Making a table costs a few thousand power calculations, so this
+    is for fixed gamma factors, not ones that change every frame."""
+    return bytes(scale(gamma(i / lut_resolution, gamma_factor)) for i in range(0, lut_resolution + 1))
+
+@functools.lru_cache(maxsize=16)
+def gamma_table_8bit(gamma_factor=1.9):
+    """Lookup table for gamma correcting a 0..255 byte value to another
+    byte value. This is suitable for bytes.translate, to gamma correct
+    a whole frame buffer in one go."""
+    return bytes(scale(gamma(i / 255.0, gamma_factor)) for i in range(0, 256))
+
+def gamma_scale(v, gamma_factor=1.9):
+    """Same as scale(gamma(v, gamma_factor)), but using a lookup table
+    rather than calculating a power each time."""
+    if v < 0 or v > 1:
+        raise ValueError("Attempted gamma correction on out of range value {}".format(v))
+    return gamma_table(gamma_factor)[int(v * lut_resolution + 0.5)]
+
+def gamma8(i, gamma_factor=1.9):
+    """gamma correct an integer 0..255 value, giving another 0..255 value"""
+    return gamma_table_8bit(gamma_factor)[i]
+
 def hsv_to_neo_rgb(h, s=1, v=1):
     """Convert specified HSV values to neopixel compatible RGB. S and V default
     to full brightness, fully saturated, as that is a common use mode
     for designs.
     """
+    if s < 0 or s > 1 or v < 0 or v > 1:
+        raise ValueError("Attempted HSV conversion with out of range s={} v={}".format(s, v))
     (red, green, blue) = colorsys.hsv_to_rgb(h, s, v)
-    return ( scale(gamma(red)), scale(gamma(green)), scale(gamma(blue)) )
+    t = gamma_table()
+    r = lut_resolution
+    return ( t[int(red * r + 0.5)], t[int(green * r + 0.5)], t[int(blue * r + 0.5)] )
+
+
+def hsv_to_neo_rgb_frame(h, s=1, v=1, gamma_factor=1.9):
+    """Convert a whole frame of HSV values to neopixel compatible RGB in
+    one call.
+
+    h is a sequence of hues, one per pixel - for one strip, or for
+    several strips one after another. s and v can be sequences of the
+    same length, or single values to use for every pixel.
+
+    Returns the frame packed as r, g, b bytes, ready to copy into a
+    Frame, giving the same values as calling hsv_to_neo_rgb on each
+    pixel. numpy is used if it is installed.
+    """
+    if numpy is not None:
+        return _hsv_to_neo_rgb_frame_numpy(h, s, v, gamma_factor)
+    else:
+        return _hsv_to_neo_rgb_frame_python(h, s, v, gamma_factor)
+
+def _hsv_to_neo_rgb_frame_numpy(h, s, v, gamma_factor):
+    h = numpy.asarray(h, dtype=float)
+    s = numpy.broadcast_to(numpy.asarray(s, dtype=float), h.shape)
+    v = numpy.broadcast_to(numpy.asarray(v, dtype=float), h.shape)
+    if ((s < 0) | (s > 1) | (v < 0) | (v > 1)).any():
+        raise ValueError("Attempted HSV conversion with out of range s or v")
+
+    # same sector arithmetic as colorsys.hsv_to_rgb
+    h6 = h * 6.0
+    i = numpy.trunc(h6)
+    f = h6 - i
+    i = i.astype(int) % 6
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    rgb = numpy.empty(h.shape + (3,))
+    rgb[..., 0] = numpy.choose(i, [v, q, p, p, t, v])
+    rgb[..., 1] = numpy.choose(i, [t, v, v, q, p, p])
+    rgb[..., 2] = numpy.choose(i, [p, p, t, v, v, q])
+
+    table = numpy.frombuffer(gamma_table(gamma_factor), dtype=numpy.uint8)
+    return table[(rgb * lut_resolution + 0.5).astype(int)].tobytes()
+
+def _hsv_to_neo_rgb_frame_python(h, s, v, gamma_factor):
+    n = len(h)
+    if isinstance(s, (int, float)):
+        s = itertools.repeat(s, n)
+    if isinstance(v, (int, float)):
+        v = itertools.repeat(v, n)
 
+    t = gamma_table(gamma_factor)
+    res = lut_resolution
+    out = bytearray(n * 3)
+    o = 0
+    # this is colorsys.hsv_to_rgb and hsv_to_neo_rgb inlined, to avoid
+    # two function calls per pixel
+    for (hue, sat, val) in zip(h, s, v):
+        if sat < 0 or sat > 1 or val < 0 or val > 1:
+            raise ValueError("Attempted HSV conversion with out of range s={} v={}".format(sat, val))
+        if sat == 0.0:
+            r = g = b = val
+        else:
+            i = int(hue * 6.0)
+            f = (hue * 6.0) - i
+            p = val * (1.0 - sat)
+            q = val * (1.0 - sat * f)
+            u = val * (1.0 - sat * (1.0 - f))
+            i = i % 6
+            if i == 0:
+                (r, g, b) = (val, u, p)
+            elif i == 1:
+                (r, g, b) = (q, val, p)
+            elif i == 2:
+                (r, g, b) = (p, val, u)
+            elif i == 3:
+                (r, g, b) = (p, q, val)
+            elif i == 4:
+                (r, g, b) = (u, p, val)
+            else:
+                (r, g, b) = (val, p, q)
+        out[o] = t[int(r * res + 0.5)]
+        out[o+1] = t[int(g * res + 0.5)]
+        out[o+2] = t[int(b * res + 0.5)]
+        o += 3
+    return bytes(out)
 
 
 def different_hue(hue):
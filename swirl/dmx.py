@@ -0,0 +1,478 @@
+"""Lighting control input: E1.31 (sACN) and Art-Net over UDP.
+
+Lighting desks and software send DMX universes of up to 512 channels.
+The spiral takes 150 of them, r, g, b for each pixel in turn, from one
+universe, starting at channel 1 unless told otherwise.
+
+Packets can arrive late, out of order or more than once. Each source
+numbers its packets, and a packet that is no newer than one that has
+already been shown is thrown away.
+
+Packets go through a jitter buffer, which holds each one for delay
+seconds after it arrives. Packets are shown in sequence order, so one
+that arrives a little out of order is still shown in its place, and
+packets that arrive in a bunch are spread back out to the rate they
+have been coming in at. That costs delay seconds of latency; a delay
+of 0 shows each packet as soon as it arrives.
+
+If nothing arrives for timeout seconds, or an E1.31 source says that
+it is stopping, the spiral goes black.
+
+To check how fast packets can be taken in, run a receiver on the
+loopback interface with a generator sending as fast as it can:
+
+    python3 -m swirl.dmx --seconds 3
+"""
+
+import argparse
+import asyncio
+import heapq
+import random
+import socket
+import struct
+import threading
+import time
+import uuid
+
+e131_port = 5568
+artnet_port = 6454
+
+acn_packet_identifier = b"ASC-E1.17\0\0\0"
+e131_root = struct.Struct(">HH12sHI16s")
+e131_framing = struct.Struct(">HI64sBHBBH")
+e131_dmp = struct.Struct(">HBBHHH")
+# where the DMX start code is, just before the channels
+e131_start_code = e131_root.size + e131_framing.size + e131_dmp.size
+e131_vector_root_data = 4
+e131_vector_data_packet = 2
+e131_vector_dmp_set_property = 2
+e131_option_preview = 0x80
+e131_option_terminated = 0x40
+
+artnet_id = b"Art-Net\0"
+artnet_header = struct.Struct("<8sH")
+artnet_dmx = struct.Struct(">HBBHH")
+artnet_op_dmx = 0x5000
+
+# what a source that doesn't say gets, as in E1.31
+default_priority = 100
+
+
+def parse_e131(data):
+    """Parse an E1.31 data packet into (cid, priority, sequence,
+    options, universe, channels), or None if it isn't one."""
+    if len(data) <= e131_start_code:
+        return None
+    (preamble, _, identifier, _, vector, cid) = e131_root.unpack_from(data, 0)
+    if preamble != 0x10 or identifier != acn_packet_identifier or vector != e131_vector_root_data:
+        return None
+    (_, vector, _, priority, _, sequence, options, universe) = e131_framing.unpack_from(data, e131_root.size)
+    if vector != e131_vector_data_packet:
+        return None
+    (_, vector, address_type, _, _, count) = e131_dmp.unpack_from(data, e131_root.size + e131_framing.size)
+    if vector != e131_vector_dmp_set_property or address_type != 0xa1 or count < 1:
+        return None
+    # the first property value is the DMX start code, and only
+    # start code 0 is levels
+    if data[e131_start_code] != 0:
+        return None
+    return (cid, priority, sequence, options, universe, data[e131_start_code+1:e131_start_code+count])
+
+
+def parse_artnet(data):
+    """Parse an Art-Net ArtDmx packet into (sequence, universe,
+    channels), or None if it isn't one."""
+    if len(data) < artnet_header.size + artnet_dmx.size:
+        return None
+    (identifier, opcode) = artnet_header.unpack_from(data, 0)
+    if identifier != artnet_id or opcode != artnet_op_dmx:
+        return None
+    (_, sequence, _, universe, length) = artnet_dmx.unpack_from(data, artnet_header.size)
+    # the universe is sent low byte first
+    universe = ((universe & 0xff) << 8) | (universe >> 8)
+    start = artnet_header.size + artnet_dmx.size
+    return (sequence, universe, data[start:start+length])
+
+
+def e131_packet(universe, sequence, channels, cid=b"\0" * 16, priority=default_priority,
+                options=0, source_name=b"swirl"):
+    dmp = e131_dmp.pack(0x7000 | (e131_dmp.size + 1 + len(channels)), e131_vector_dmp_set_property,
+                        0xa1, 0, 1, 1 + len(channels)) + b"\0" + bytes(channels)
+    framing = e131_framing.pack(0x7000 | (e131_framing.size + len(dmp)), e131_vector_data_packet,
+                                source_name.ljust(64, b"\0"), priority, 0, sequence, options, universe) + dmp
+    return e131_root.pack(0x10, 0, acn_packet_identifier, 0x7000 | (22 + len(framing)),
+                          e131_vector_root_data, cid) + framing
+
+
+def artnet_packet(universe, sequence, channels):
+    universe = ((universe & 0xff) << 8) | (universe >> 8)
+    return artnet_header.pack(artnet_id, artnet_op_dmx) + \
+        artnet_dmx.pack(14, sequence, 0, universe, len(channels)) + bytes(channels)
+
+
+class Source:
+    """The sequence numbers seen from one source so far, unwrapped
+    from 8 bits into a number that keeps going up."""
+
+    def __init__(self, priority):
+        self.priority = priority
+        self.last = None
+        self.newest = 0
+        self.seen = 0
+
+    def unwrap(self, sequence):
+        """The unwrapped sequence number for a packet, or None if the
+        source has started again from a new sequence number."""
+        if self.last is None:
+            self.last = sequence
+            return self.newest
+        # -128..127, how far on from the newest packet this one is
+        diff = ((sequence - self.last + 128) & 0xff) - 128
+        if diff <= -20:
+            # as E1.31 says: too far back to be out of order, so the
+            # source must have started again
+            self.last = sequence
+            self.newest = 0
+            return None
+        if diff > 0:
+            self.last = sequence
+            self.newest += diff
+            return self.newest
+        return self.newest + diff
+
+
+class JitterBuffer:
+    """Frames waiting to be shown, in sequence order."""
+
+    def __init__(self, delay, smoothing=0.1):
+        self.delay = delay
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.waiting = []
+        self.numbers = set()
+        self.shown = None
+        self.shown_time = None
+        self.period = None
+        self.newest = None
+
+    def push(self, number, frame, now):
+        """Add frame, with unwrapped sequence number number, arriving
+        now. Returns False if it is a duplicate, or too late."""
+        if (self.shown is not None and number <= self.shown) or number in self.numbers:
+            return False
+        if self.newest is not None and number > self.newest[0]:
+            # how far apart the source is sending packets
+            period = (now - self.newest[1]) / (number - self.newest[0])
+            if self.period is None:
+                self.period = period
+            else:
+                self.period += self.smoothing * (period - self.period)
+        if self.newest is None or number > self.newest[0]:
+            self.newest = (number, now)
+        heapq.heappush(self.waiting, (number, now, frame))
+        self.numbers.add(number)
+        return True
+
+    def due(self):
+        """When the first frame is due to be shown, or None if there
+        are none waiting."""
+        if not self.waiting:
+            return None
+        (_, arrived, _) = self.waiting[0]
+        t = arrived + self.delay
+        if self.period and self.shown_time is not None:
+            # no sooner than a period after the last frame, but never
+            # more than twice the delay after it arrived
+            t = min(max(t, self.shown_time + self.period), arrived + 2 * self.delay)
+        return t
+
+    def pop(self, now):
+        (number, _, frame) = heapq.heappop(self.waiting)
+        self.numbers.discard(number)
+        self.shown = number
+        self.shown_time = now
+        return frame
+
+
+class DatagramProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, receiver, parse):
+        self.receiver = receiver
+        self.parse = parse
+
+    def datagram_received(self, data, addr):
+        self.receiver.received(self.parse, data, addr)
+
+
+class DMXReceiver:
+    """Listens for E1.31 and Art-Net, on every interface or just on
+    host, and turns the packets for one universe into frames."""
+
+    def __init__(self, universe=1, artnet_universe=0, channel=1, delay=0.03, timeout=2.5,
+                 host=None, e131_port=e131_port, artnet_port=artnet_port, frame_size=150):
+        self.universe = universe
+        self.artnet_universe = artnet_universe
+        self.channel = channel
+        self.timeout = timeout
+        self.host = host
+        self.ports = {"e131": e131_port, "artnet": artnet_port}
+        self.frame_size = frame_size
+        self.buffer = JitterBuffer(delay)
+        self.changed = threading.Condition()
+        self.active = None
+        self.source = None
+        self.last_packet = float("-inf")
+        self.black = False
+        self.ended = False
+        self.error = None
+        self.ready = threading.Event()
+        self.loop = None
+        self.stopping = None
+        self.addresses = {}
+        self.packets = 0
+        self.discarded = 0
+        self.skipped = 0
+        self.blackouts = 0
+
+    def start(self):
+        """Start listening, in a thread of its own. Raises an exception
+        if the ports can't be listened on."""
+        threading.Thread(target=asyncio.run, args=(self.serve(),), name="dmx receiver", daemon=True).start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        """Stop listening, and end any wait in next_frame()."""
+        with self.changed:
+            if self.loop is not None and not self.ended:
+                self.loop.call_soon_threadsafe(self.stopping.set)
+
+    def received(self, parse, data, addr):
+        """Called on the event loop thread for each packet."""
+        now = time.monotonic()
+        if parse == "e131":
+            packet = parse_e131(data)
+            if packet is None:
+                return
+            (cid, priority, sequence, options, universe, channels) = packet
+            if universe != self.universe or options & e131_option_preview:
+                return
+            key = ("e131", cid)
+            terminated = options & e131_option_terminated
+        else:
+            packet = parse_artnet(data)
+            if packet is None:
+                return
+            (sequence, universe, channels) = packet
+            if universe != self.artnet_universe:
+                return
+            key = ("artnet", addr[0])
+            priority = default_priority
+            terminated = False
+
+        with self.changed:
+            self.packets += 1
+            if key != self.active:
+                # a source of higher priority takes over, and anyone
+                # can once the current one has gone quiet
+                if self.source is not None and priority <= self.source.priority \
+                   and now < self.source.seen + self.timeout:
+                    self.discarded += 1
+                    return
+                self.active = key
+                self.source = Source(priority)
+                self.buffer.reset()
+            source = self.source
+            source.priority = priority
+            source.seen = now
+
+            if terminated:
+                (self.active, self.source) = (None, None)
+                self.buffer.reset()
+                self.last_packet = float("-inf")
+                self.changed.notify_all()
+                return
+
+            if sequence == 0 and key[0] == "artnet":
+                # Art-Net sequence numbers are turned off
+                number = source.newest = source.newest + 1
+            else:
+                number = source.unwrap(sequence)
+                if number is None:
+                    self.buffer.reset()
+                    number = 0
+
+            start = self.channel - 1
+            frame = bytearray(self.frame_size)
+            levels = channels[start:start+self.frame_size]
+            frame[0:len(levels)] = levels
+            if not self.buffer.push(number, frame, now):
+                self.discarded += 1
+                return
+            self.last_packet = now
+            self.black = False
+            self.changed.notify_all()
+
+    def next_frame(self):
+        """Wait for the next frame to be due, and return it, or a black
+        frame if nothing has arrived for too long, or None once the
+        receiver has stopped."""
+        with self.changed:
+            while not self.ended:
+                now = time.monotonic()
+                due = self.buffer.due()
+                if due is not None and due <= now:
+                    frame = self.buffer.pop(now)
+                    # show only the newest of any that are due together
+                    while self.buffer.waiting and self.buffer.due() <= now:
+                        frame = self.buffer.pop(now)
+                        self.skipped += 1
+                    return frame
+                if not self.black and not self.buffer.waiting and now >= self.last_packet + self.timeout:
+                    self.black = True
+                    self.blackouts += 1
+                    return bytearray(self.frame_size)
+                if due is None and not self.black:
+                    due = self.last_packet + self.timeout
+                self.changed.wait(None if due is None else due - now)
+            return None
+
+    async def serve(self):
+        transports = []
+        try:
+            loop = asyncio.get_running_loop()
+            self.stopping = asyncio.Event()
+            for (parse, port) in self.ports.items():
+                for (family, type, proto, _, address) in socket.getaddrinfo(
+                        self.host, port, type=socket.SOCK_DGRAM, flags=socket.AI_PASSIVE):
+                    sock = socket.socket(family, type, proto)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                    if family == socket.AF_INET6:
+                        sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+                    try:
+                        sock.bind(address)
+                    except OSError:
+                        sock.close()
+                        if family == socket.AF_INET6 and self.host is None:
+                            # no IPv6 here
+                            continue
+                        raise
+                    if parse == "e131" and family == socket.AF_INET and self.host is None:
+                        self.join_multicast(sock)
+                    (transport, _) = await loop.create_datagram_endpoint(
+                        lambda parse=parse: DatagramProtocol(self, parse), sock=sock)
+                    transports.append(transport)
+                    self.addresses.setdefault(parse, sock.getsockname()[0:2])
+
+            with self.changed:
+                self.loop = loop
+            self.ready.set()
+            await self.stopping.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            for transport in transports:
+                transport.close()
+            with self.changed:
+                self.ended = True
+                self.changed.notify_all()
+            self.ready.set()
+
+    def join_multicast(self, sock):
+        """E1.31 is usually multicast, to a group for each universe."""
+        group = "239.255.{}.{}".format(self.universe >> 8, self.universe & 0xff)
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP,
+                            socket.inet_aton(group) + socket.inet_aton("0.0.0.0"))
+        except OSError as e:
+            print("dmx receiver: can't join multicast group {}, unicast only: {}".format(group, e))
+
+    def as_dict(self):
+        return {"universe": self.universe,
+                "artnet_universe": self.artnet_universe,
+                "channel": self.channel,
+                "delay": self.buffer.delay,
+                "period": self.buffer.period,
+                "active": repr(self.active),
+                "packets": self.packets,
+                "discarded": self.discarded,
+                "skipped": self.skipped,
+                "blackouts": self.blackouts}
+
+
+def send_packets(address, protocol, seconds, universe, shuffle=0.0):
+    """Send packets for universe to address as fast as possible for
+    seconds, in protocol ("e131" or "artnet"). A fraction shuffle of
+    them are sent twice, or swapped with the next one. Returns how
+    many were sent."""
+    sock = socket.socket(socket.AF_INET6 if ":" in address[0] else socket.AF_INET, socket.SOCK_DGRAM)
+    sock.connect(address)
+    cid = uuid.uuid4().bytes
+    channels = bytearray(150)
+    held = None
+    sent = 0
+    finish = time.monotonic() + seconds
+    try:
+        while time.monotonic() < finish:
+            struct.pack_into(">I", channels, 0, sent)
+            # Art-Net uses sequence 0 to mean there isn't one
+            sequence = sent % 255 + 1
+            if protocol == "e131":
+                packet = e131_packet(universe, sequence, channels, cid=cid)
+            else:
+                packet = artnet_packet(universe, sequence, channels)
+            if held is not None:
+                sock.send(packet)
+                sock.send(held)
+                held = None
+            elif random.random() < shuffle / 2:
+                sock.send(packet)
+                sock.send(packet)
+            elif random.random() < shuffle / 2:
+                held = packet
+            else:
+                sock.send(packet)
+            sent += 1
+    finally:
+        sock.close()
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send E1.31 and Art-Net packets to a receiver on the loopback interface as fast as possible")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--shuffle", type=float, default=0.1,
+                        help="fraction of packets to duplicate or send out of order")
+    parser.add_argument("--delay", type=float, default=0.03,
+                        help="jitter buffer delay in seconds")
+    args = parser.parse_args()
+
+    print("protocol\tsent/s\treceived/s\tdiscarded\tshown/s")
+    for protocol in ("e131", "artnet"):
+        receiver = DMXReceiver(host=args.host, e131_port=0, artnet_port=0, delay=args.delay)
+        receiver.start()
+        shown = [0]
+
+        def show():
+            while receiver.next_frame() is not None:
+                shown[0] += 1
+                # about as long as the strip takes to show a frame
+                time.sleep(0.0015)
+
+        t = threading.Thread(target=show)
+        t.start()
+        universe = receiver.universe if protocol == "e131" else receiver.artnet_universe
+        sent = send_packets(receiver.addresses[protocol], protocol, args.seconds, universe, args.shuffle)
+        time.sleep(args.delay * 2 + 0.1)
+        receiver.stop()
+        t.join()
+        print("{}\t{:.0f}\t{:.0f}\t{}\t{:.0f}".format(protocol, sent / args.seconds, receiver.packets / args.seconds,
+                                                     receiver.discarded, shown[0] / args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""Frame buffers for the LED strip.
+
+Modes used to write each pixel straight into the neopixel object, which
+does brightness scaling and byte reordering in python on every single
+write. Instead, modes render into a Frame, which is a preallocated packed
+bytearray of r, g, b bytes, and the whole frame is copied into the
+strip's own buffer in one go when it is shown, for the versions of the
+neopixel library whose buffer layout write_neopixel() knows.
+"""
+
+import functools
+import time
+
+
+class Frame:
+    """A frame of RGB values for n pixels, stored packed as
+    r, g, b bytes in a bytearray."""
+
+    def __init__(self, n=50):
+        self.n = n
+        self.buf = bytearray(n * 3)
+
+    def __len__(self):
+        return self.n
+
+    def __setitem__(self, p, rgb):
+        if isinstance(p, slice):
+            for (q, c) in zip(range(*p.indices(self.n)), rgb):
+                self[q] = c
+            return
+        if p < 0:
+            p += self.n
+        if p < 0 or p >= self.n:
+            raise IndexError("pixel {} out of range".format(p))
+        o = p * 3
+        try:
+            self.buf[o:o+3] = rgb
+        except TypeError:
+            # colours computed with float maths sometimes arrive as floats
+            self.buf[o:o+3] = bytes(int(c) for c in rgb)
+
+    def __getitem__(self, p):
+        if isinstance(p, slice):
+            return [self[q] for q in range(*p.indices(self.n))]
+        if p < 0:
+            p += self.n
+        if p < 0 or p >= self.n:
+            raise IndexError("pixel {} out of range".format(p))
+        o = p * 3
+        return tuple(self.buf[o:o+3])
+
+    def fill(self, rgb, start=0, end=None):
+        """Set every pixel from start up to (not including) end
+        to the same colour."""
+        if end is None:
+            end = self.n
+        if end > start:
+            self.buf[start*3:end*3] = bytes(int(c) for c in rgb) * (end - start)
+
+    def clear(self):
+        self.buf[:] = bytes(len(self.buf))
+
+    def copy_from(self, other, start=0):
+        """Copy the contents of another frame, or any bytes-like object of
+        packed r, g, b bytes, into this one, starting at pixel start."""
+        if isinstance(other, Frame):
+            other = other.buf
+        o = start * 3
+        if o + len(other) > len(self.buf):
+            raise IndexError("{} bytes starting at pixel {} do not fit in the frame".format(len(other), start))
+        self.buf[o:o+len(other)] = other
+
+    def tuples(self):
+        """Return the frame as a list of (r, g, b) tuples."""
+        b = self.buf
+        return list(zip(b[0::3], b[1::3], b[2::3]))
+
+
+class Strip(Frame):
+    """A frame that knows how to send itself out to the LEDs, with the
+    same auto_write/show behaviour as a neopixel object so that modes
+    can use it in place of one.
+
+    write is called with the frame's bytearray whenever the frame is
+    shown.
+
+    Lots of modes show the same frame over and over again. A frame that
+    is byte for byte the same as the last one written is not written
+    again, unless keepalive seconds have passed since it was, so that
+    a glitched strip still gets refreshed now and then. A keepalive of
+    0 writes every frame.
+    """
+
+    def __init__(self, n=50, *, write, keepalive=0):
+        super().__init__(n)
+        self.write = write
+        self.auto_write = False
+        self.keepalive = keepalive
+        self.last_written = None
+        self.last_written_time = 0
+        self.frames = 0
+        self.unchanged = 0
+
+    def __setitem__(self, p, rgb):
+        super().__setitem__(p, rgb)
+        if self.auto_write:
+            self.show()
+
+    def fill(self, rgb, start=0, end=None):
+        super().fill(rgb, start, end)
+        if self.auto_write:
+            self.show()
+
+    def show(self):
+        self.frames += 1
+        now = time.monotonic()
+        if self.keepalive and self.buf == self.last_written \
+           and now < self.last_written_time + self.keepalive:
+            self.unchanged += 1
+            return
+        self.last_written = bytes(self.buf)
+        self.last_written_time = now
+        self.write(self.buf)
+
+
+# major versions of adafruit_pixelbuf whose buffers write_neopixel()
+# has been checked against (see tests/test_framebuffer.py)
+pixelbuf_versions = ("2",)
+
+
+@functools.lru_cache(maxsize=None)
+def _brightness_table(brightness):
+    """Lookup table for scaling a byte value by brightness, as the
+    neopixel library does."""
+    return bytes(int(i * brightness) for i in range(256))
+
+
+def _bulk_writable(strip):
+    """Whether strip's buffer can be written to directly: a 3 byte per
+    pixel adafruit_pixelbuf strip, from a version in pixelbuf_versions."""
+    try:
+        import adafruit_pixelbuf
+    except ImportError:
+        return False
+    return isinstance(strip, adafruit_pixelbuf.PixelBuf) \
+        and getattr(adafruit_pixelbuf, "__version__", "").split(".")[0] in pixelbuf_versions \
+        and strip.bpp == 3 and not strip._dotstar_mode
+
+
+def write_neopixel(strip, buf):
+    """Copy a packed rgb buffer into a neopixel object and transmit it.
+
+    For a strip from a known version of the library, the bytes are
+    copied straight into the strip's output buffer, one slice assignment
+    per colour channel doing the byte reordering, and one translate
+    doing the brightness scaling if the brightness isn't 1. Otherwise,
+    the pixels go in through the library's own slice assignment, which
+    converts them one at a time.
+    """
+    n = len(strip)
+    if _bulk_writable(strip):
+        o = strip._offset
+        (r, g, b) = strip.parse_byteorder(strip.byteorder)[1]
+        if strip._pre_brightness_buffer is not None:
+            # kept unscaled, for when the brightness is changed
+            pre = strip._pre_brightness_buffer
+            pre[o+r:o+n*3:3] = buf[0::3]
+            pre[o+g:o+n*3:3] = buf[1::3]
+            pre[o+b:o+n*3:3] = buf[2::3]
+        if strip.brightness != 1.0:
+            buf = bytes(buf).translate(_brightness_table(strip.brightness))
+        out = strip._post_brightness_buffer
+        out[o+r:o+n*3:3] = buf[0::3]
+        out[o+g:o+n*3:3] = buf[1::3]
+        out[o+b:o+n*3:3] = buf[2::3]
+    else:
+        strip[0:n] = list(zip(buf[0::3], buf[1::3], buf[2::3]))
+    strip.show()
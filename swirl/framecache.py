@@ -0,0 +1,131 @@
+"""Recorded cycles of periodic modes.
+
+Some modes are a pure function of a phase that repeats exactly, so
+after one full cycle every frame they render is one they have rendered
+before. A mode like that can be declared with its period in frames.
+The first time it runs, its frames are recorded as they go out, one
+after another in a single bytearray. After a whole cycle the mode
+itself is stopped, and the recording is played back instead, which is
+a slice copy per frame rather than trig and HSV conversion per pixel.
+
+Recordings are kept between runs of the mode, up to a total size,
+after which the least recently used are thrown away.
+"""
+
+import collections
+
+import swirl.framebuffer as framebuffer
+
+
+class Loop:
+    """One recorded cycle: period frames of frame_size bytes each,
+    packed into buf, and the delay after each frame."""
+
+    def __init__(self, buf, delays, frame_size):
+        self.buf = buf
+        self.view = memoryview(buf).toreadonly()
+        self.delays = delays
+        self.frame_size = frame_size
+
+    def __len__(self):
+        return len(self.delays)
+
+    @property
+    def nbytes(self):
+        return len(self.buf)
+
+    def frame(self, i):
+        o = i * self.frame_size
+        return self.view[o:o+self.frame_size]
+
+
+class FrameCache:
+    """Loops, by key, with a limit of max_bytes on their total size."""
+
+    def __init__(self, max_bytes=4*1024*1024):
+        self.max_bytes = max_bytes
+        self.loops = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self.loops
+
+    def get(self, key):
+        loop = self.loops.get(key)
+        if loop is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.loops.move_to_end(key)
+        return loop
+
+    def put(self, key, loop):
+        """Store a loop, throwing away the least recently used ones to
+        make room. A loop bigger than the whole cache isn't stored."""
+        if key in self.loops:
+            self.nbytes -= self.loops.pop(key).nbytes
+        if loop.nbytes > self.max_bytes:
+            return
+        while self.loops and self.nbytes + loop.nbytes > self.max_bytes:
+            (_, old) = self.loops.popitem(last=False)
+            self.nbytes -= old.nbytes
+            self.evictions += 1
+        self.loops[key] = loop
+        self.nbytes += loop.nbytes
+
+    def clear(self):
+        self.loops.clear()
+        self.nbytes = 0
+
+    def as_dict(self):
+        return {"loops": list(self.loops),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions}
+
+
+def cached(cache, key, period, frames, frame_size):
+    """Pass (frame, delay) pairs through from frames, recording the
+    first period of them. Once a whole period has been recorded, it is
+    stored in cache under key, frames is closed, and the recording is
+    played back from then on.
+
+    If the loop is in the cache already, frames is closed without
+    being used. A mode that yields None or a frame of the wrong size
+    is passed through without being recorded.
+    """
+    try:
+        loop = cache.get(key)
+
+        if loop is None:
+            buf = bytearray(period * frame_size)
+            delays = []
+            for (frame, delay) in frames:
+                if isinstance(frame, framebuffer.Frame):
+                    frame = frame.buf
+                if frame is None or len(frame) != frame_size:
+                    yield (frame, delay)
+                    yield from frames
+                    return
+                o = len(delays) * frame_size
+                buf[o:o+frame_size] = frame
+                delays.append(delay)
+                yield (frame, delay)
+                if len(delays) == period:
+                    break
+            else:
+                # the mode finished before a whole period
+                return
+            loop = Loop(buf, delays, frame_size)
+            cache.put(key, loop)
+    finally:
+        frames.close()
+
+    while True:
+        for i in range(len(loop)):
+            yield (loop.frame(i), loop.delays[i])
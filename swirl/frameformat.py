@@ -0,0 +1,110 @@
+"""Formats for frames sent to the driver by other programs.
+
+A frame can be sent in any of these ways:
+
+* as a line of hex, 6 digits (rrggbb) per pixel. Pixels missing from
+  the end of the line are black.
+* in binary: the 4 bytes "SWRL", the length of the frame in bytes as a
+  2 byte big-endian number, then that many bytes of r, g, b.
+* as an Open Pixel Control "set pixel colours" message on channel 0 or
+  1: the channel, the command 0, the length as a 2 byte big-endian
+  number, then that many bytes of r, g, b. Other OPC messages are
+  ignored.
+
+In binary and OPC frames too, pixels missing from the end are black,
+and bytes past the end of the spiral are ignored. Each message is
+recognised by its first byte, so a stream can mix them.
+
+OPC messages on other channels are skipped. Their channel byte can look
+like the start of a line of hex or a binary frame, so a message is only
+taken as hex if everything up to the end of the line is hex digits, and
+as binary if it starts with the whole of "SWRL"; otherwise it is taken
+as OPC. The exception is channel 10, a newline, which reads as a blank
+line.
+"""
+
+import struct
+
+binary_header = struct.Struct(">4sH")
+binary_magic = b"SWRL"
+
+opc_header = struct.Struct(">BBH")
+opc_set_pixels = 0
+
+hex_digits = b"0123456789abcdefABCDEF"
+# what a line of hex can start with
+hex_start = frozenset(hex_digits + b" \t\r\n")
+
+
+def _could_be_hex(line):
+    """Whether line is, or is the start of, a line of hex."""
+    return not line.strip().translate(None, hex_digits)
+
+
+def decode_hex(line, frame):
+    """Decode a line of hex into frame (a bytearray)."""
+    digits = bytes(line).strip()
+    # only whole pixels, and no more than there are
+    n = min(len(digits) // 6 * 3, len(frame))
+    frame[0:n] = bytes.fromhex(digits[0:n*2].decode("ascii"))
+    frame[n:] = bytes(len(frame) - n)
+
+
+def decode_binary(data, frame):
+    """Copy r, g, b bytes into frame (a bytearray)."""
+    n = min(len(data), len(frame))
+    frame[0:n] = data[0:n]
+    frame[n:] = bytes(len(frame) - n)
+
+
+def scan(buf, pos, end):
+    """Find the complete messages in buf[pos:end].
+
+    Returns (frames, last, pos): how many frames there are, the newest
+    one as (decode function, start, end) or None, and where whatever
+    is left over, the start of a message still to come, begins."""
+    frames = 0
+    last = None
+    while pos < end:
+        first = buf[pos]
+        if first == binary_magic[0]:
+            if end - pos < binary_header.size:
+                break
+            (magic, length) = binary_header.unpack_from(buf, pos)
+            if magic == binary_magic:
+                stop = pos + binary_header.size + length
+                if stop > end:
+                    break
+                last = (decode_binary, pos + binary_header.size, stop)
+                frames += 1
+                pos = stop
+                continue
+        elif first in hex_start:
+            stop = buf.find(b"\n", pos, end)
+            if _could_be_hex(buf[pos:end if stop < 0 else stop]):
+                if stop < 0:
+                    break
+                last = (decode_hex, pos, stop)
+                frames += 1
+                pos = stop + 1
+                continue
+        # an OPC message
+        if end - pos < opc_header.size:
+            break
+        (channel, command, length) = opc_header.unpack_from(buf, pos)
+        stop = pos + opc_header.size + length
+        if stop > end:
+            break
+        if command == opc_set_pixels and channel in (0, 1):
+            last = (decode_binary, pos + opc_header.size, stop)
+            frames += 1
+        pos = stop
+    return (frames, last, pos)
+
+
+def decode(buf, last, frame_size=150):
+    """Decode the frame that scan() found as last into a new bytearray."""
+    (decoder, start, stop) = last
+    frame = bytearray(frame_size)
+    decoder(memoryview(buf)[start:stop], frame)
+    return frame
@@ -0,0 +1,275 @@
+"""A server that other programs can send frames to over the network.
+
+Frames come over TCP, as a stream of messages in any of the formats in
+swirl/frameformat.py, or over UDP, one message per datagram, on IPv4
+and IPv6. Any number of clients can send at once. The server runs an
+asyncio event loop in a thread of its own, so clients don't need a
+process or a thread each.
+
+Only the newest frame is kept, for the driver to show at its own rate.
+When more than one client is sending, policy decides whose frames are
+shown:
+
+latest - everyone's, so whoever sent last wins
+priority - the client that got there first keeps the spiral until it
+           has sent nothing for idle seconds, and frames from anyone
+           else are dropped until then
+
+To check how fast frames can be sent to it, run a server on the
+loopback interface with a client sending as fast as it can:
+
+    python3 -m swirl.frameserver --seconds 3
+"""
+
+import argparse
+import asyncio
+import socket
+import struct
+import threading
+import time
+
+import swirl.frameformat as frameformat
+
+
+class StreamProtocol(asyncio.Protocol):
+    """One TCP client."""
+
+    # longest incomplete message to wait for the rest of
+    max_buffer = 1 << 17
+
+    def __init__(self, server):
+        self.server = server
+        self.buf = bytearray()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.client = ("tcp",) + tuple(transport.get_extra_info("peername")[0:2])
+        self.server.clients.add(transport)
+
+    def connection_lost(self, exc):
+        self.server.clients.discard(self.transport)
+
+    def data_received(self, data):
+        self.buf += data
+        (frames, last, pos) = frameformat.scan(self.buf, 0, len(self.buf))
+        if last is not None:
+            self.server.received(self.client, frames, self.buf, last)
+        del self.buf[0:pos]
+        if len(self.buf) > self.max_buffer:
+            print("frame server: closing connection from {}: message too long".format(self.client))
+            self.transport.close()
+
+
+class DatagramProtocol(asyncio.DatagramProtocol):
+    """UDP clients, each datagram a whole message."""
+
+    def __init__(self, server):
+        self.server = server
+
+    def datagram_received(self, data, addr):
+        if data and data[0] in frameformat.hex_start and not data.endswith(b"\n"):
+            data += b"\n"
+        (frames, last, pos) = frameformat.scan(data, 0, len(data))
+        if last is not None:
+            self.server.received(("udp",) + tuple(addr[0:2]), frames, data, last)
+
+
+class FrameServer:
+    """Listens for frames on port, TCP and UDP, on every interface or
+    just on host."""
+
+    def __init__(self, port=4399, host=None, policy="latest", idle=1.0, frame_size=150):
+        if policy not in ("latest", "priority"):
+            raise ValueError("Unknown frame server policy {}".format(policy))
+        self.port = port
+        self.host = host
+        self.policy = policy
+        self.idle = idle
+        self.frame_size = frame_size
+        self.changed = threading.Condition()
+        self.latest = None
+        self.ended = False
+        self.error = None
+        self.ready = threading.Event()
+        self.loop = None
+        self.stopping = None
+        self.addresses = []
+        self.owner = None
+        self.owner_seen = 0
+        # transports of the TCP clients connected
+        self.clients = set()
+        self.frames = 0
+        self.dropped = 0
+        self.refused = 0
+
+    def start(self):
+        """Start listening, in a thread of its own. Raises an exception
+        if the ports can't be listened on."""
+        threading.Thread(target=asyncio.run, args=(self.serve(),), name="frame server", daemon=True).start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+
+    def stop(self):
+        """Stop listening, and end any wait in next_frame()."""
+        with self.changed:
+            if self.loop is not None and not self.ended:
+                self.loop.call_soon_threadsafe(self.stopping.set)
+
+    def next_frame(self):
+        """Wait for a frame newer than the last one, and return it, or
+        None once the server has stopped."""
+        with self.changed:
+            while self.latest is None and not self.ended:
+                self.changed.wait()
+            (frame, self.latest) = (self.latest, None)
+            return frame
+
+    def received(self, client, frames, buf, last):
+        """Called on the event loop thread with frames from client, the
+        newest of which scan() found as last in buf."""
+        now = time.monotonic()
+        if self.policy == "priority" and self.owner is not None and self.owner != client \
+           and now < self.owner_seen + self.idle:
+            self.refused += frames
+            return
+        self.owner = client
+        self.owner_seen = now
+
+        frame = frameformat.decode(buf, last, self.frame_size)
+        with self.changed:
+            if self.latest is not None:
+                # never shown
+                self.dropped += 1
+            self.dropped += frames - 1
+            self.frames += frames
+            self.latest = frame
+            self.changed.notify_all()
+
+    async def serve(self):
+        servers = []
+        transports = []
+        try:
+            loop = asyncio.get_running_loop()
+            self.stopping = asyncio.Event()
+
+            server = await loop.create_server(lambda: StreamProtocol(self), self.host, self.port,
+                                              reuse_address=True)
+            servers.append(server)
+            self.addresses += [("tcp",) + s.getsockname()[0:2] for s in server.sockets]
+
+            for (family, type, proto, _, address) in socket.getaddrinfo(
+                    self.host, self.port, type=socket.SOCK_DGRAM, flags=socket.AI_PASSIVE):
+                sock = socket.socket(family, type, proto)
+                if family == socket.AF_INET6:
+                    sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 1)
+                try:
+                    sock.bind(address)
+                except OSError:
+                    sock.close()
+                    if family == socket.AF_INET6 and self.host is None:
+                        # no IPv6 here
+                        continue
+                    raise
+                (transport, _) = await loop.create_datagram_endpoint(lambda: DatagramProtocol(self), sock=sock)
+                transports.append(transport)
+                self.addresses.append(("udp",) + sock.getsockname()[0:2])
+
+            with self.changed:
+                self.loop = loop
+            self.ready.set()
+            await self.stopping.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            for server in servers:
+                server.close()
+            for transport in transports:
+                transport.close()
+            for transport in list(self.clients):
+                transport.close()
+            with self.changed:
+                self.ended = True
+                self.changed.notify_all()
+            self.ready.set()
+
+    def address(self, kind):
+        """The first address being listened on for kind, "tcp" or "udp",
+        as (host, port)."""
+        for a in self.addresses:
+            if a[0] == kind:
+                return a[1:]
+        return None
+
+    def as_dict(self):
+        return {"policy": self.policy,
+                "addresses": self.addresses,
+                "clients": len(self.clients),
+                "frames": self.frames,
+                "dropped": self.dropped,
+                "refused": self.refused}
+
+
+def opc_message(frame, channel=0):
+    return frameformat.opc_header.pack(channel, frameformat.opc_set_pixels, len(frame)) + frame
+
+
+def binary_message(frame):
+    return frameformat.binary_header.pack(frameformat.binary_magic, len(frame)) + frame
+
+
+def send_frames(address, kind, seconds, message):
+    """Send frames to address as fast as possible for seconds, over kind
+    ("tcp" or "udp"), made by message(frame). Returns how many were
+    sent."""
+    family = socket.AF_INET6 if ":" in address[0] else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM if kind == "tcp" else socket.SOCK_DGRAM)
+    sock.connect(address)
+    sent = 0
+    frame = bytearray(150)
+    finish = time.monotonic() + seconds
+    try:
+        while time.monotonic() < finish:
+            struct.pack_into(">I", frame, 0, sent)
+            data = message(bytes(frame))
+            if kind == "tcp":
+                sock.sendall(data)
+            else:
+                sock.send(data)
+            sent += 1
+    finally:
+        sock.close()
+    return sent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send frames to a frame server on the loopback interface as fast as possible")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--host", default="127.0.0.1")
+    args = parser.parse_args()
+
+    print("transport\tformat\tsent/s\treceived/s\tshown/s")
+    for kind in ("tcp", "udp"):
+        for (name, message) in (("opc", opc_message), ("binary", binary_message)):
+            server = FrameServer(port=0, host=args.host)
+            server.start()
+            shown = [0]
+
+            def show():
+                while server.next_frame() is not None:
+                    shown[0] += 1
+                    # about as long as the strip takes to show a frame
+                    time.sleep(0.0015)
+
+            t = threading.Thread(target=show)
+            t.start()
+            sent = send_frames(server.address(kind), kind, args.seconds, message)
+            time.sleep(0.1)
+            server.stop()
+            t.join()
+            print("{}\t{}\t{:.0f}\t{:.0f}\t{:.0f}".format(kind, name, sent / args.seconds,
+                                                         server.frames / args.seconds, shown[0] / args.seconds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Frame rate limits.
+
+Some modes ask for no delay between frames at all, and render as fast
+as python allows, starving the web server and the rest of the Pi. The
+governor decides the delay that is actually used after each frame,
+which is the longest of:
+
+* the delay the mode asked for
+* 1/max_fps, a global frame rate cap
+* the delay that keeps the mode within its CPU budget, the fraction
+  of one CPU it may use, going by the CPU time that recent frames took.
+  That is cpu_budget, unless the mode is declared with a budget of its
+  own.
+* for heavy modes, when the load average per CPU is over load_limit,
+  the same again with the budget cut down in proportion
+
+A max_fps or CPU budget of 0 turns that limit off.
+
+The CPU time counted against a mode is that of the thread rendering
+it, of the thread a loop-style mode runs in, and of any worker process
+rendering it, but not of the web server or the output thread.
+"""
+
+import os
+import time
+
+
+def load_average():
+    """The one minute load average, or None if it can't be read."""
+    try:
+        with open("/proc/loadavg") as f:
+            return float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class Governor:
+    """Works out the delay after each frame of the running mode."""
+
+    def __init__(self, max_fps=100, cpu_budget=0.5, load_limit=1.0, load_interval=5.0, smoothing=0.1):
+        self.max_fps = max_fps
+        self.cpu_budget = cpu_budget
+        self.load_limit = load_limit
+        self.load_interval = load_interval
+        self.smoothing = smoothing
+        self.cpus = os.cpu_count() or 1
+        # CPU time used on the driver's behalf outside this process
+        self.extra_cpu = 0.0
+        # and by threads other than the one calling frame_delay()
+        self.thread_cpu = 0.0
+        self.load = None
+        self.load_checked = None
+        self.start(None)
+
+    def start(self, name, heavy=False, cpu_budget=None):
+        """Start governing a new mode, with a CPU budget of its own, or
+        None for cpu_budget."""
+        self.name = name
+        self.heavy = heavy
+        self.mode_budget = self.cpu_budget if cpu_budget is None else cpu_budget
+        self.cpu_per_frame = None
+        self.last_cpu = None
+        self.delay = 0
+        self.limited_by = None
+
+    def check_load(self):
+        now = time.monotonic()
+        if self.load_checked is None or now >= self.load_checked + self.load_interval:
+            self.load = load_average()
+            self.load_checked = now
+
+    def add_cpu(self, seconds):
+        """Count CPU time used by another process, such as a render
+        worker, against the running mode."""
+        self.extra_cpu += seconds
+
+    def add_thread_cpu(self, seconds):
+        """Count CPU time used by another thread, such as the one a
+        loop-style mode runs in, against the running mode."""
+        self.thread_cpu += seconds
+
+    def frame_delay(self, delay):
+        """Called once per frame with the delay the mode asked for,
+        returning the delay to use."""
+        cpu = time.thread_time() + self.thread_cpu + self.extra_cpu
+        if self.last_cpu is not None:
+            used = cpu - self.last_cpu
+            if self.cpu_per_frame is None:
+                self.cpu_per_frame = used
+            else:
+                self.cpu_per_frame += self.smoothing * (used - self.cpu_per_frame)
+        self.last_cpu = cpu
+
+        limited_by = "mode"
+
+        if self.max_fps and 1.0 / self.max_fps > delay:
+            delay = 1.0 / self.max_fps
+            limited_by = "cap"
+
+        budget = self.mode_budget
+        if budget and self.heavy and self.load_limit:
+            self.check_load()
+            if self.load is not None and self.load / self.cpus > self.load_limit:
+                budget = budget * self.load_limit / (self.load / self.cpus)
+
+        if budget and self.cpu_per_frame and self.cpu_per_frame / budget > delay:
+            delay = self.cpu_per_frame / budget
+            limited_by = "budget" if budget == self.mode_budget else "load"
+
+        self.delay = delay
+        self.limited_by = limited_by
+        return delay
+
+    def fps(self):
+        if not self.delay:
+            return None
+        return 1.0 / self.delay
+
+    def as_dict(self):
+        return {"mode": self.name,
+                "fps": self.fps(),
+                "limited_by": self.limited_by,
+                "cpu_per_frame": self.cpu_per_frame,
+                "heavy": self.heavy,
+                "load": self.load,
+                "max_fps": self.max_fps,
+                "cpu_budget": self.cpu_budget,
+                "mode_cpu_budget": self.mode_budget,
+                "load_limit": self.load_limit}
@@ -0,0 +1,105 @@
+"""Modes layered on top of each other.
+
+A layered mode is a stack of other modes, such as a clock on top of a
+slowly changing background. Each layer runs as a mode of its own,
+rendering into its own buffer at its own rate, and the frames of the
+layers are blended together, bottom layer first, into the frame that
+is shown.
+
+The composite of each layer with everything below it is kept, so when
+only the top layer has changed, only the top layer is blended again,
+and when no layer has changed, nothing is.
+
+Frame generator modes each have their own buffers, so any number of
+them can be layered, but loop-style modes all draw into runtime.pixels,
+so only one layer in a stack can be a loop-style mode.
+"""
+
+import inspect
+import time
+
+import swirl.runtime as runtime
+from swirl.blend import layer_blends
+from swirl.modes import modes
+
+
+class Layer:
+    """One mode in a stack.
+
+    mode - the id of the mode to show in this layer
+    blend - how to put it on top of the layers below, one of
+            swirl.blend.layer_blends
+    opacity - 0..1
+    """
+
+    def __init__(self, mode, blend="over", opacity=1.0):
+        if blend not in layer_blends:
+            raise ValueError("Unknown layer blend {}".format(blend))
+        self.mode = mode
+        self.blend = blend
+        self.opacity = opacity
+
+    @property
+    def info(self):
+        return modes[self.mode]
+
+
+def composite(layers, frame_size=150):
+    """Run the modes in layers, bottom layer first, yielding their
+    composite as (frame, delay) pairs. A frame of None means that no
+    layer has changed since the last one. The layers are stopped when
+    the mode running this stack is."""
+    loop_style = [l.mode for l in layers
+                  if not (inspect.isgeneratorfunction(l.info.func) or inspect.isclass(l.info.func))]
+    if len(loop_style) > 1:
+        raise ValueError("Only one layer can be a loop-style mode, not {}".format(", ".join(loop_style)))
+
+    stop = runtime.current_stop()
+    streams = [runtime.mode_frames(l.info.func, stop, 1.0 / l.info.fps if l.info.fps else 0)
+               for l in layers]
+    blends = [layer_blends[l.blend] for l in layers]
+
+    black = bytes(frame_size)
+    frames = [black] * len(layers)
+    # the composite of each layer with the ones below it
+    composites = [black] * len(layers)
+    now = time.monotonic()
+    due = [now] * len(layers)
+
+    try:
+        while True:
+            now = time.monotonic()
+            changed = None
+            for (i, stream) in enumerate(streams):
+                if due[i] > now:
+                    continue
+                try:
+                    (frame, delay) = next(stream)
+                except StopIteration:
+                    # the layer keeps its last frame
+                    due[i] = float("inf")
+                    continue
+                due[i] = max(due[i] + delay, now)
+                if frame is not None:
+                    frame = bytes(getattr(frame, "buf", frame))
+                    if frame != frames[i]:
+                        frames[i] = frame
+                        if changed is None:
+                            changed = i
+
+            if all(d == float("inf") for d in due):
+                return
+
+            if changed is None:
+                frame = None
+            else:
+                below = composites[changed-1] if changed > 0 else black
+                for i in range(changed, len(layers)):
+                    below = blends[i](below, frames[i], layers[i].opacity)
+                    composites[i] = below
+                frame = below
+
+            yield (frame, max(min(due) - time.monotonic(), 0))
+    finally:
+        for stream in streams:
+            stream.close()
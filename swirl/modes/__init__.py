@@ -0,0 +1,165 @@
+"""The modes that the spiral can display.
+
+The modes are implemented in the modules of this package, grouped
+roughly by what they look like, but they are all declared here. That
+way the index page, the web routes and the disco playlist can be built
+without importing any mode code: a mode's module is only imported the
+first time that mode is selected.
+
+The modes that cost the most to render, the heavy clouds and firefronts
+and the fading automata, may use a quarter of a CPU rather than the
+default budget (see swirl/governor.py), to leave the Pi room for the web
+server.
+"""
+
+from swirl.registry import Registry
+
+modes = Registry()
+declare = modes.declare
+
+
+# solid.py
+declare("3", "swirl.modes.solid:mode3", title="Pink", category="Basic", static=True, fps=5)
+declare("6", "swirl.modes.solid:mode6", title="Black", category="Basic", static=True, fps=5)
+declare("95", "swirl.modes.solid:mode95", title="Nightlight Red", category="Basic", static=True, fps=5)
+declare("62", "swirl.modes.solid:mode62", title="Solid random colour", category="Basic", static=True, fps=5)
+declare("5", "swirl.modes.solid:mode5", title="Freeze", category="Control", static=True, fps=1)
+declare("7", "swirl.modes.solid:mode7", title="Colour wheel", category="Basic", static=True, fps=1)
+declare("13", "swirl.modes.solid:mode13", title="Alignment check", category="Control", fps=3)
+declare("37", "swirl.modes.solid:mode37", title="White", category="Basic", static=True, fps=1)
+declare("103", "swirl.modes.solid:mode103", title="Solid many-crossfades", category="Patterns", disco=True, fps=79)
+
+# dots.py
+declare("1", "swirl.modes.dots:mode1", title="Twinkle rainbow dots", category="Discrete dots", fps=1)
+declare("31", "swirl.modes.dots:mode31", title="Dust, slowly changing colour", category="Slowly changing", fps=2)
+declare("76", "swirl.modes.dots:mode76", title="Outwards random white", category="Patterns", disco=True, fps=33)
+declare("112", "swirl.modes.dots:mode112", title="Outwards random white with trail", category="Patterns", disco=True, fps=33)
+declare("113", "swirl.modes.dots:mode113", title="Outwards random orange with fading trail", category="Patterns", disco=True, fps=33)
+declare("77", "swirl.modes.dots:mode77", title="Outwards going round", category="Patterns", disco=True, fps=33)
+declare("78", "swirl.modes.dots:mode78", title="Outwards random coloured", category="Patterns", disco=True, fps=33)
+declare("79", "swirl.modes.dots:mode79", title="Whole wheel saturated sparkle", category="Patterns", disco=True, fps=33)
+declare("80", "swirl.modes.dots:mode80", title="Whole wheel contrast sparkle", category="Patterns", disco=True, fps=33)
+declare("93", "swirl.modes.dots:mode93", title="Whole wheel random walk sparkle", category="Patterns", disco=True, fps=33)
+declare("56", "swirl.modes.dots:mode56", title="Disco dust", category="Patterns", disco=True, fps=3)
+declare("114", "swirl.modes.dots:mode114", title="Binary white lightning dust", category="Patterns", disco=True, fps=10)
+declare("115", "swirl.modes.dots:mode115", title="Contrasting binary lightning dust", category="Patterns", disco=True, fps=5)
+declare("4", "swirl.modes.dots:mode4", title="Sorting rainbow", category="Discrete dots", fps=10)
+declare("11", "swirl.modes.dots:mode11", title="Outwards explosions", category="Patterns", disco=True, fps=50, cost="medium")
+declare("15", "swirl.modes.dots:mode15", title="Firefly lightning", category="Patterns", disco=True, fps=144, cost="medium")
+declare("20", "swirl.modes.dots:mode20", title="Rainbow lightning", category="Patterns", disco=True, fps=50)
+declare("61", "swirl.modes.dots:mode61", title="Rainbow lightning storm", category="Patterns", disco=True, fps=33)
+declare("107", "swirl.modes.dots:mode107", title="Rainbow lightning storm - truncated red rim", category="Patterns", disco=True, fps=33, cost="medium")
+declare("108", "swirl.modes.dots:mode108", title="Rainbow lightning storm - truncated", category="Patterns", disco=True, fps=89, cost="medium")
+declare("22", "swirl.modes.dots:mode22", title="Twinkle rainbow dots - cycle-half-mode", category="Discrete dots", fps=10)
+declare("23", "swirl.modes.dots:mode23", title="Twinkle rainbow dots - experimental CA", category="Discrete dots", fps=None, cost="heavy")
+declare("25", "swirl.modes.dots:mode25", title="Territory war", category="Discrete dots", fps=None, cost="heavy")
+
+# clocks.py
+declare("2", "swirl.modes.clocks:mode2", title="Minute clock", category="Clocks", fps=20)
+declare("9", "swirl.modes.clocks:mode9", title="Rainbow clock", category="Clocks", fps=100, cost="medium")
+declare("14", "swirl.modes.clocks:mode14", title="Dot clock", category="Clocks", fps=20)
+declare("57", "swirl.modes.clocks:mode57", title="Dot clock (with seconds)", category="Clocks", fps=20)
+
+# wheels.py
+declare("8", "swirl.modes.wheels:mode8", title="Rainbow radar", category="Patterns", disco=True, fps=100, cost="heavy")
+declare("10", "swirl.modes.wheels:mode10", title="Slow rotating colour wheel", category="Slowly changing", fps=50, cost="medium", period=3000)
+declare("12", "swirl.modes.wheels:mode12", title="Fast rotating colour wheel", category="Slowly changing", fps=50, cost="medium", period=300)
+declare("71", "swirl.modes.wheels:mode71", title="Very fast rotating colour wheel", category="Patterns", disco=True, fps=50, cost="medium", period=30)
+declare("75", "swirl.modes.wheels:mode75", title="Rainbow searchlight", category="Patterns", disco=True, fps=50, cost="medium")
+declare("104", "swirl.modes.wheels:mode104", title="Three circumferences", category="Patterns", disco=True, fps=100, cost="medium")
+declare("105", "swirl.modes.wheels:mode105", title="Three circumferences / swapping", category="Patterns", disco=True, fps=100, cost="medium")
+declare("106", "swirl.modes.wheels:mode106", title="Three circumferences / colour chaning", category="Patterns", disco=True, fps=100, cost="medium")
+declare("72", "swirl.modes.wheels:mode72", title="Disco rotator", category="Patterns", disco=True, fps=50, cost="medium")
+declare("94", "swirl.modes.wheels:mode94", title="Multisegment flash", category="Patterns", disco=True, fps=50, cost="medium")
+declare("21", "swirl.modes.wheels:mode21", title="Spinners", category="Patterns", disco=True, fps=100, cost="medium")
+declare("24", "swirl.modes.wheels:mode24", title="Three-segment pulsing colour wheel", category="Patterns", disco=True, fps=33, cost="medium")
+declare("34", "swirl.modes.wheels:mode34", title="RGB spin", category="Patterns", disco=True, fps=20)
+declare("36", "swirl.modes.wheels:mode36", title="Windmill (solid)", category="Patterns", disco=True, fps=40, cost="medium")
+declare("38", "swirl.modes.wheels:mode38", title="Solid spinning spirals", category="Patterns", disco=True, fps=40, cost="medium")
+declare("39", "swirl.modes.wheels:mode39", title="Windmill (fading)", category="Patterns", disco=True, fps=40, cost="medium")
+declare("41", "swirl.modes.wheels:mode41", title="Propellor", category="Patterns", disco=True, fps=20, cost="medium")
+
+# waves.py
+declare("73", "swirl.modes.waves:mode73", title="Oscillators - white sin", category="Patterns", disco=True, fps=100, cost="heavy")
+declare("74", "swirl.modes.waves:mode74", title="Oscillators - red/green discrete", category="Patterns", disco=True, fps=100, cost="medium", period=2500)
+declare("16", "swirl.modes.waves:mode16", title="Inwards spiral colour drift", category="Patterns", disco=True, fps=20)
+declare("35", "swirl.modes.waves:mode35", title="Drunkard spin", category="Patterns", disco=True, fps=100, cost="medium")
+declare("84", "swirl.modes.waves:mode84", title="RGB separated cycling", category="Patterns", disco=True, fps=20)
+declare("85", "swirl.modes.waves:mode85", title="RGB dithered", category="Patterns", disco=True, fps=100, cost="medium")
+declare("28", "swirl.modes.waves:mode28", title="up/down colour battle (monochrome)", category="Patterns", disco=True, fps=None, cost="heavy")
+declare("30", "swirl.modes.waves:mode30", title="up/down colour battle (bi-chrome changing)", category="Patterns", disco=True, fps=None, cost="heavy")
+declare("96", "swirl.modes.waves:mode96", title="RGB phasing sine waves - fast", category="Patterns", disco=True, fps=50, cost="medium")
+declare("97", "swirl.modes.waves:mode97", title="RGB phasing sine waves - dotted", category="Patterns", disco=True, fps=50, cost="medium")
+declare("98", "swirl.modes.waves:mode98", title="RGB phasing sine waves - phasing brightness", category="Patterns", disco=True, fps=50, cost="medium")
+declare("32", "swirl.modes.waves:mode32", title="RGB phasing sine waves", category="Slowly changing", fps=20)
+declare("33", "swirl.modes.waves:mode33", title="RGB pulse", category="Patterns", disco=True, fps=10)
+declare("42", "swirl.modes.waves:mode42", title="Horizontal randoms", category="Patterns", disco=True, fps=20)
+declare("45", "swirl.modes.waves:mode45", title="Rainbow mist", category="Slowly changing", fps=50, cost="medium")
+declare("46", "swirl.modes.waves:mode46", title="Greenfire", category="Patterns", disco=True, fps=None, cost="heavy")
+declare("47", "swirl.modes.waves:mode47", title="Vertical prism (fast)", category="Patterns", disco=True, fps=None, cost="heavy")
+declare("55", "swirl.modes.waves:mode55", title="Vertical prism (slow)", category="Slowly changing", fps=None, cost="heavy")
+declare("58", "swirl.modes.waves:mode58", title="Water", category="Slowly changing", fps=50, cost="medium")
+declare("48", "swirl.modes.waves:mode48", title="RGB scrollbars", category="Patterns", disco=True, fps=50, cost="medium")
+
+# automata.py
+declare("101", "swirl.modes.automata:mode101", title="Rule 22 1-d automata / white crossfade", category="Patterns", disco=True, fps=16, cpu_budget=0.25)
+declare("102", "swirl.modes.automata:mode102", title="Rule 22 1-d automata / white rainbow-fade", category="Patterns", disco=True, fps=60, cost="medium", cpu_budget=0.25)
+declare("81", "swirl.modes.automata:mode81", title="Rule 22 1-d automata / white", category="Patterns", disco=True, fps=10)
+declare("82", "swirl.modes.automata:mode82", title="Rule 22 1-d automata / colours / boundary change", category="Patterns", disco=True, fps=10)
+declare("83", "swirl.modes.automata:mode83", title="Rule 22 1-d automata / colours / topological drift", category="Patterns", disco=True, fps=10)
+declare("92", "swirl.modes.automata:mode92", title="Rule 22 1-d automata / two close colours", category="Patterns", disco=True, fps=10)
+declare("86", "swirl.modes.automata:mode86", title="Electric flicker", category="Patterns", disco=True, fps=20)
+declare("87", "swirl.modes.automata:mode87", title="Red vs Blue dominance", category="Patterns", disco=True, fps=20)
+
+# clouds.py
+declare("18", "swirl.modes.clouds:mode18", title="Bouncing cloud", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("19", "swirl.modes.clouds:mode19", title="Bouncing cloud with trails", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("60", "swirl.modes.clouds:mode60", title="Plasma rainbow", category="Patterns", disco=True, fps=None, cost="heavy", cpu_budget=0.25)
+declare("99", "swirl.modes.clouds:mode99", title="Plasma colour wheel", category="Patterns", disco=True, fps=None, cost="heavy", cpu_budget=0.25)
+declare("27", "swirl.modes.clouds:mode27", title="Lissajous", category="Patterns", disco=True, fps=None, cost="heavy", cpu_budget=0.25)
+declare("40", "swirl.modes.clouds:mode40", title="Spirograph", category="Patterns", disco=True, fps=None, cost="heavy", cpu_budget=0.25)
+declare("43", "swirl.modes.clouds:mode43", title="Three horizontal bars, fading", category="Patterns", disco=True, fps=20, cost="medium")
+declare("44", "swirl.modes.clouds:mode44", title="Four bouncing clouds (hard)", category="Patterns", disco=True, fps=50, cost="heavy", cpu_budget=0.25)
+declare("49", "swirl.modes.clouds:mode49", title="Four bouncing clouds (soft)", category="Patterns", disco=True, fps=50, cost="heavy", cpu_budget=0.25)
+declare("50", "swirl.modes.clouds:mode50", title="Spotlight", category="Patterns", disco=True, fps=3)
+declare("88", "swirl.modes.clouds:mode88", title="Rainbox Spotlight", category="Patterns", disco=True, fps=3)
+declare("51", "swirl.modes.clouds:mode51", title="Rainbow splatter", category="Patterns", disco=True, fps=20, cost="medium")
+declare("59", "swirl.modes.clouds:mode59", title="Poppy", category="Slowly changing", fps=20, cost="medium")
+declare("52", "swirl.modes.clouds:mode52", title="Paintballs", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("53", "swirl.modes.clouds:mode53", title="Sparkles", category="Patterns", disco=True, fps=20, cost="medium")
+declare("54", "swirl.modes.clouds:mode54", title="Snake", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+
+# fire.py
+declare("63", "swirl.modes.fire:mode63", title="Rainbow firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("64", "swirl.modes.fire:mode64", title="Colour firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("65", "swirl.modes.fire:mode65", title="Contrasting firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("66", "swirl.modes.fire:mode66", title="Rainbow/solid firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("67", "swirl.modes.fire:mode67", title="Dark/light contrast firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("68", "swirl.modes.fire:mode68", title="Rainbow firefly firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("109", "swirl.modes.fire:mode109", title="Two-tone firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("110", "swirl.modes.fire:mode110", title="Thin firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("111", "swirl.modes.fire:mode111", title="Two-front firefronts", category="Patterns", disco=True, fps=100, cost="heavy", cpu_budget=0.25)
+declare("69", "swirl.modes.fire:mode69", title="The Sun", category="Patterns", disco=True, fps=50, cost="medium")
+declare("70", "swirl.modes.fire:mode70", title="Realtime Sun (changes over the day)", category="Slowly changing", fps=1)
+
+# rings.py
+declare("17", "swirl.modes.rings:mode17", title="Outwards rings (dense)", category="Patterns", disco=True, fps=10)
+declare("26", "swirl.modes.rings:mode26", title="Outwards rings (sparse)", category="Patterns", disco=True, fps=10)
+declare("116", "swirl.modes.rings:mode116", title="Flashing red outer ring", category="Patterns", disco=True, fps=20)
+declare("117", "swirl.modes.rings:mode117", title="Outer ring sine wave", category="Patterns", disco=True, fps=20)
+declare("118", "swirl.modes.rings:mode118", title="Outer ring sine wave, jumping", category="Patterns", disco=True, fps=20)
+declare("119", "swirl.modes.rings:mode119", title="Two rings sine wave", category="Patterns", disco=True, fps=20)
+declare("120", "swirl.modes.rings:mode120", title="Outer ring sine wave with contrasting ring", category="Patterns", disco=True, fps=20)
+declare("121", "swirl.modes.rings:mode121", title="Two counter-rotating rings", category="Patterns", disco=True, fps=20, cost="medium")
+declare("122", "swirl.modes.rings:mode122", title="Two counter-rotating contrasting rings", category="Patterns", disco=True, fps=20, cost="medium")
+
+# layered.py
+declare("123", "swirl.modes.layered:mode123", title="Dot clock on dust", category="Clocks", fps=None)
+declare("124", "swirl.modes.layered:mode124", title="Dot clock on rainbow mist", category="Clocks", fps=None, cost="medium")
+
+# external.py
+declare("89", "swirl.modes.external:mode89", title="bash API test", category="External API Test", fps=None)
+declare("90", "swirl.modes.external:mode90", title="Haskell API test", category="External API Test", fps=None)
+declare("91", "swirl.modes.external:mode91", title="Haskell pulse lighthouse", category="External API Test", fps=None)
+declare("100", "swirl.modes.external:mode100", title="Frame server, TCP and UDP port 4399", category="External API Test", fps=None)
+declare("125", "swirl.modes.external:mode125", title="E1.31 / Art-Net input", category="External API Test", fps=None)
@@ -0,0 +1,407 @@
+"""One dimensional cellular automata along the strip."""
+
+import random
+
+from swirl.colour import hsv_to_neo_rgb
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import closest_pixels
+
+
+def mode101():
+    pixels.auto_write = False
+
+    last_pixels = [False for n in range(0,50)]
+
+    display_pixels = [random.random() > 0.5 for n in range(0,50)]
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           c = 0
+           if display_pixels[p_left]:
+             c += 1
+           if display_pixels[p]:
+             c += 1
+           if display_pixels[p_right]:
+             c += 1
+
+           new_pixels.append(c == 1) 
+
+        display_pixels = new_pixels
+
+        for frac in range(0,8):
+
+          for p in range(0,50):
+            if display_pixels[p] and not last_pixels[p]:
+                v = 2 ** frac
+                pixels[p] = (v, v, v) 
+            elif not display_pixels[p] and last_pixels[p]:
+                v = 2 ** (7-frac)
+                pixels[p] = (v, v, v) 
+                # this only fades down to 2, not 0, which gives a
+                # slight extra twinkle effect when the 2 goes down
+                # to zero a step later. initially a bug but I like
+                # it.
+
+
+            elif display_pixels[p] and last_pixels[p]:
+                pixels[p] = (128, 128, 128) 
+            else:
+                pixels[p] = (0, 0, 0) 
+
+
+          pixels.show()
+          clock.sleep(0.05)
+
+        last_pixels = display_pixels
+        clock.sleep(0.2)
+
+
+def mode102():
+    pixels.auto_write = False
+
+    last_pixels = [False for n in range(0,50)]
+
+    display_pixels = [random.random() > 0.5 for n in range(0,50)]
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           c = 0
+           if display_pixels[p_left]:
+             c += 1
+           if display_pixels[p]:
+             c += 1
+           if display_pixels[p_right]:
+             c += 1
+
+           new_pixels.append(c == 1) 
+
+        display_pixels = new_pixels
+
+        for frac in range(0,3*8):
+
+          for p in range(0,50):
+            if display_pixels[p] and not last_pixels[p]:
+                # desired sequence: red, yellow, white
+                if frac < 8:
+                  v = 2 ** frac
+                  pixels[p] = (v, 0, 0) 
+                elif frac < 16:
+                  v = 2 ** (frac - 8)
+                  pixels[p] = (127, v, 0) 
+                else:
+                  v = 2 ** (frac - 16)
+                  pixels[p] = (127, 127, v) 
+            elif not display_pixels[p] and last_pixels[p]:
+                if frac < 8:
+                  v = 2 ** (7-frac)
+                  pixels[p] = (v, 127, 127) 
+                elif frac < 16:
+                  v = 2 ** (7 - (frac - 8))
+                  pixels[p] = (0, v, 127) 
+                else:
+                  v = 2 ** (7 - (frac - 16))
+                  pixels[p] = (0, 0, v) 
+            elif display_pixels[p] and last_pixels[p]:
+                pixels[p] = (128, 128, 128) 
+            else:
+                pixels[p] = (0, 0, 0) 
+
+
+          pixels.show()
+          clock.sleep(0.01)
+
+        last_pixels = display_pixels
+        clock.sleep(0.2)
+
+def mode81():
+    pixels.auto_write = False
+
+    display_pixels = [random.random() > 0.5 for n in range(0,50)]
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           c = 0
+           if display_pixels[p_left]:
+             c += 1
+           if display_pixels[p]:
+             c += 1
+           if display_pixels[p_right]:
+             c += 1
+
+           new_pixels.append(c == 1) 
+
+        display_pixels = new_pixels
+
+        for p in range(0,50):
+            if display_pixels[p]:
+                pixels[p] = (128, 128, 128) 
+            else:
+                pixels[p] = (2,2,2) 
+
+
+        pixels.show()
+        clock.sleep(0.1)
+
+def mode82():
+    pixels.auto_write = False
+
+    display_pixels = []
+
+    for p in range(0,50):
+      if random.random() > 0.5:
+        display_pixels.append(random.random())
+      else:
+        display_pixels.append(None)
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           hue = None
+           c = 0
+           if display_pixels[p_left] is not None:
+             c += 1
+             hue = display_pixels[p_left]
+             if p == 0:  # inject colour change on loop
+               hue = (hue + 0.1) % 1.0
+           if display_pixels[p] is not None:
+             c += 1
+             hue = display_pixels[p]
+           if display_pixels[p_right] is not None:
+             c += 1
+             hue = display_pixels[p_right]
+             if p == 49:  # inject colour change on loop
+               hue = (hue + 0.1) % 1.0
+
+           if c == 1:
+               new_pixels.append(hue) 
+           else:
+               new_pixels.append(None) 
+
+        display_pixels = new_pixels
+
+        for p in range(0,50):
+            if display_pixels[p] is not None:
+                pixels[p] = hsv_to_neo_rgb(display_pixels[p])
+            else:
+                pixels[p] = (2,2,2) 
+
+
+        pixels.show()
+        clock.sleep(0.1)
+
+
+def mode83():
+    pixels.auto_write = False
+
+    display_pixels = []
+
+    start_hue = random.random()
+
+    for p in range(0,50):
+      if random.random() > 0.5:
+        display_pixels.append(start_hue)
+      else:
+        display_pixels.append(None)
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           hue = None
+           c = 0
+           if display_pixels[p_left] is not None:
+             c += 1
+             hue = display_pixels[p_left]
+           if display_pixels[p] is not None:
+             c += 1
+             hue = display_pixels[p]
+           if display_pixels[p_right] is not None:
+             c += 1
+             hue = display_pixels[p_right]
+
+           if c == 1:
+               # cause a little bit of colour drift on each generation
+               # with different drift in different parts of the board
+               new_pixels.append(hue + float(p) / 50.0 / 100.0) 
+           else:
+               new_pixels.append(None) 
+
+        display_pixels = new_pixels
+
+        for p in range(0,50):
+            if display_pixels[p] is not None:
+                pixels[p] = hsv_to_neo_rgb(display_pixels[p])
+            else:
+                pixels[p] = (2,2,2) 
+
+
+        pixels.show()
+        clock.sleep(0.1)
+
+def mode92():
+    pixels.auto_write = False
+
+    display_pixels = [random.random() > 0.5 for n in range(0,50)]
+    last_pixels = display_pixels
+
+    prime_hue = random.random()
+
+    if random.random() > 0.5:
+      second_hue = (prime_hue + (1.0/6.0)) % 1.0
+    else:
+      second_hue = (prime_hue - (1.0/6.0)) % 1.0
+
+    prime_rgb = hsv_to_neo_rgb(prime_hue)
+    second_rgb = hsv_to_neo_rgb(second_hue)
+
+    while running():
+        new_pixels = []
+        for p in range(0,50):
+           p_left = (p-1)%50
+           p_right = (p+1)%50
+
+           c = 0
+           if display_pixels[p_left]:
+             c += 1
+           if display_pixels[p]:
+             c += 1
+           if display_pixels[p_right]:
+             c += 1
+
+           new_pixels.append(c == 1) 
+
+        last_pixels = display_pixels
+        display_pixels = new_pixels
+
+        for p in range(0,50):
+            if display_pixels[p]:
+                pixels[p] =  prime_rgb
+            elif last_pixels[p]:
+                pixels[p] = second_rgb
+            else:
+                pixels[p] = (0,0,0) 
+
+
+        pixels.show()
+        clock.sleep(0.1)
+
+
+def mode86():
+    pixels.auto_write = False
+
+    display_pixels = [random.random() > 0.5 for p in range(0,50)]
+    orig_pixels = display_pixels
+
+    ball_size = 5
+
+    distances = {}
+    for p in range(0,50):
+      distances[p] = closest_pixels(p)[0:ball_size]
+
+    while running():
+      display_pixels = orig_pixels
+
+      p = random.randint(0,49)
+      orig_pixels[p] = not orig_pixels[p]
+
+      active = True
+      iters = 0
+      while active and iters < 10:
+        active = False
+        iters += 1
+        new_pixels = []
+
+        for p in range(0,50):
+          cps = distances[p]
+          s = 0
+          for (_, cp) in cps:
+            if display_pixels[cp]: 
+              s += 1
+          new_pixels.append( s >= (ball_size / 2.0) )
+          if new_pixels[p] != display_pixels[p]:
+            active = True
+
+        display_pixels = new_pixels
+
+      for p in range(0,50):
+        if display_pixels[p] and orig_pixels[p]:
+          pixels[p] = (255, 255, 255)
+        elif display_pixels[p]:
+          pixels[p] = (16, 16, 255)
+        elif orig_pixels[p]:
+          pixels[p] = (16,0,0)
+        else:
+          pixels[p] = (0,0,0)
+
+      pixels.show()
+      clock.sleep(0.05)
+
+
+def mode87():
+    pixels.auto_write = False
+
+    display_pixels = [random.random() > 0.5 for p in range(0,50)]
+    orig_pixels = display_pixels
+
+    ball_size = 5
+
+    distances = {}
+    for p in range(0,50):
+      distances[p] = closest_pixels(p)[0:ball_size]
+
+    while running():
+      display_pixels = orig_pixels
+
+      pchange = random.randint(0,49)
+      orig_pixels[pchange] = not orig_pixels[pchange]
+
+      active = True
+      iters = 0
+      while active and iters < 10:
+        active = False
+        iters += 1
+        new_pixels = []
+
+        for p in range(0,50):
+          cps = distances[p]
+          s = 0
+          for (_, cp) in cps:
+            if display_pixels[cp]: 
+              s += 1
+          new_pixels.append( s >= (ball_size / 2.0) )
+          if new_pixels[p] != display_pixels[p]:
+            active = True
+
+        display_pixels = new_pixels
+
+      for p in range(0,50):
+        if display_pixels[p] and orig_pixels[p]:
+          pixels[p] = (0, 0, 255)
+        elif display_pixels[p]:
+          pixels[p] = (0, 0, 16)
+        elif orig_pixels[p]:
+          pixels[p] = (16,0,0)
+        else:
+          pixels[p] = (255,0,0)
+
+      pixels[pchange] = (0,255,0)
+
+      pixels.show()
+      clock.sleep(0.05)
@@ -0,0 +1,112 @@
+"""Clocks."""
+
+import time
+
+import swirl.clockface as clockface
+import swirl.framebuffer as framebuffer
+from swirl.colour import gamma_scale, hsv_to_neo_rgb
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import spiral
+
+
+def mode2():
+    period = 3600.0  # seconds
+    frame_period = 0.05  # seconds
+
+    frame_step = frame_period / period
+    print("Frame step: {} hue units per frame".format(frame_step))
+    hue = 0
+
+    pixels.auto_write = False
+
+    while running():
+        print("Hue: {}".format(hue))
+        pixels.fill(hsv_to_neo_rgb(hue))
+
+        secs = clock.elapsed() % 60
+
+        tick_pixel = int(secs/60.0 * 50.0)
+
+        pixels[tick_pixel] = hsv_to_neo_rgb((hue + 0.5) % 1)
+
+        pixels.show()
+
+        hue = (hue + frame_step) % 1.0
+        clock.sleep(frame_period)
+
+
+def mode9():
+  pixels.auto_write = False
+
+  update_period = 0.01
+  width = 0.12
+
+  rot_hue = 0
+
+
+  while running():
+    pixels.fill( (0,0,0) )
+
+    now = time.localtime()
+
+    # set hour
+    for pixel in range(0,49):
+      frac = spiral.frac[pixel]
+
+      hour_frac = now.tm_hour % 12 / 12.0
+      frac_hue = (frac + rot_hue) % 1
+
+
+      d = (frac + hour_frac + 0.5) % 1
+      if d > width and d < (1-width):
+          intensity = 0
+          # don't set pixel because we want it "transparent" rather than black
+      elif d >= (1-width):
+          d = 1 - d
+          intensity = (width - d) * (1/width)
+          pixels[pixel] = hsv_to_neo_rgb(frac_hue, v=intensity)
+      else:
+          intensity = (width - d) * (1/width)
+          pixels[pixel] = hsv_to_neo_rgb(frac_hue, v=intensity)
+
+    pixels.show()
+
+    rot_hue = rot_hue + (1.0/42300.0 * (update_period / 0.01)) % 1
+    clock.sleep(update_period)
+
+
+def mode14():
+    yield from pmode_dotclock(display_seconds = False)
+
+def mode57():
+    yield from pmode_dotclock(display_seconds = True)
+
+def pmode_dotclock(*, display_seconds):
+  frame = framebuffer.Frame()
+
+  while True:
+
+    t = time.time()
+    frac_sec = t % 1.0
+    now = time.localtime(t)
+    hour = now.tm_hour % 12
+    minute = now.tm_min
+    second = now.tm_sec
+
+    # the hour and minute hands only change once a minute, so the
+    # face is cached and only worked out again when they move
+    (face, _) = clockface.dot_clock_face(hour, minute)
+    frame.copy_from(face)
+
+    if display_seconds:
+        # turn frac_sec into a sawtooth wave
+        if frac_sec < 0.5:
+            intensity = frac_sec
+        else:
+            intensity = 1.0 - frac_sec
+
+        second_colour = (0,gamma_scale(0.3 * intensity),0)
+        for pixel in clockface.dot_clock_seconds(hour, minute, second):
+            frame[pixel] = second_colour
+
+    yield frame
@@ -0,0 +1,773 @@
+"""Bouncing clouds, spotlights and splatters."""
+
+import math
+import random
+import time
+from math import tau
+
+from swirl.colour import hsv_to_neo_rgb
+from swirl.modes.fadepixel import fade_hv_fadepixel, render_hv_fadepixel
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import generate_pixel_pos, nearest_k, pixel_to_layer, bottoms, spiral
+
+
+def mode18():
+    pixels.auto_write = False
+
+    x = 0
+    y = 0
+    ndots = 5
+    hue = 0.2
+
+    radius = 5.0  # this is the radius that the centre point moves within - it doesn't matter if it goes outside the spiral as dots will just squish up against the edge
+
+    velocity_mag = 0.15
+
+    xv = velocity_mag + random.random() * velocity_mag
+    yv = velocity_mag + random.random() * velocity_mag
+
+
+    while running():
+        x = x + xv
+        y = y + yv
+
+        if math.sqrt(x ** 2 + y ** 2) > radius:
+
+          hue = hue + random.random() * 0.1
+          min_dots = 3
+          max_dots = 8
+          ndots = max(min_dots, min(max_dots, ndots + random.randint(0,2) - 1))
+
+          # pick a new velocity - it should be back roughly towards the centre
+          # but with a random deflection
+
+          angle_to_centre = math.atan2(y, x)
+
+          angle_range = 1.3
+          angle_to_centre = angle_to_centre + random.random() * angle_range  - (angle_range * 0.5)
+          new_mag = velocity_mag + velocity_mag * random.random()
+          xv = -math.cos(angle_to_centre) * new_mag
+          yv = -math.sin(angle_to_centre) * new_mag
+
+          # shrink back so we are inside the circle
+          # could do this better to approximate the point at which
+          # we hit the unit circle
+          rescale = radius / math.sqrt(x ** 2 + y ** 2)
+          x = x * rescale
+          y = y * rescale
+
+        s = nearest_k(x, y, ndots)
+
+        dots_to_light = s[0:ndots]
+
+        pixels.fill( (0,0,0) )
+
+        for (d, pixel) in dots_to_light:
+            pixels[pixel] = hsv_to_neo_rgb(hue)
+
+        pixels.show()
+        clock.sleep(0.01)
+
+
+def mode19():
+    pixels.auto_write = False
+
+    # hue of pixel, or None if it should be blank
+    display_pixels = [None for pixel in range(0,50)]
+
+    x = 0
+    y = 0
+    min_dots = 1
+    max_dots = 3
+    hue = 0.2
+
+    radius = 5.0  # this is the radius that the centre point moves within - it doesn't matter if it goes outside the spiral as dots will just squish up against the edge
+
+    velocity_mag = 0.15
+
+    ndots = round( (max_dots + min_dots) / 2)
+    xv = velocity_mag + random.random() * velocity_mag
+    yv = velocity_mag + random.random() * velocity_mag
+
+
+
+    while running():
+        x = x + xv
+        y = y + yv
+
+        if math.sqrt(x ** 2 + y ** 2) > radius:
+
+          hue = hue + 0.05 + random.random() * 0.07
+          ndots = max(min_dots, min(max_dots, ndots + random.randint(0,2) - 1))
+           
+
+          # pick a new velocity - it should be back roughly towards the centre
+          # but with a random deflection
+
+          angle_to_centre = math.atan2(y, x)
+
+          angle_range = 1.3
+          angle_to_centre = angle_to_centre + random.random() * angle_range  - (angle_range * 0.5)
+          new_mag = velocity_mag + velocity_mag * random.random()
+          xv = -math.cos(angle_to_centre) * new_mag
+          yv = -math.sin(angle_to_centre) * new_mag
+
+          # shrink back so we are inside the circle
+          # could do this better to approximate the point at which
+          # we hit the unit circle
+          rescale = radius / math.sqrt(x ** 2 + y ** 2)
+          x = x * rescale
+          y = y * rescale
+
+        s = nearest_k(x, y, ndots)
+
+        dots_to_light = s[0:ndots]
+
+        for dot in dots_to_light:
+            (distance, pixel) = dot
+            display_pixels[pixel] = (hue, 1)
+
+        render_hv_fadepixel(pixels, display_pixels)
+        fade_hv_fadepixel(display_pixels, 0.0075)
+        
+        clock.sleep(0.01)
+
+
+def mode60():
+  """This is a variant of mode20 so TODO refactor?"""
+  pixels.auto_write = False
+  display_pixels = [None for n in range(0,50)]
+
+  start_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+  particle = start_particle
+  hue = random.random()
+
+  first = True
+  boom = False
+
+  tc = 0.001
+  hc = 0.004
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        new_particle = start_particle
+        boom = old_first
+        first = True
+        pixels.show()
+        pixels.fill( (0,0,0) )
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+    # display state
+
+    display_pixels[particle] = (hue, 1)
+    fade_hv_fadepixel(display_pixels, 0.01)
+    render_hv_fadepixel(pixels, display_pixels)
+
+    clock.sleep(tc)
+
+    hue = (hue + hc) % 1.0
+
+    boom = False
+
+
+def mode99():
+  """This is a variant of mode20 and mode60 so TODO refactor?"""
+  pixels.auto_write = False
+  display_pixels = [None for n in range(0,50)]
+
+
+  hue = random.random()
+  start_particle = bottoms[len(bottoms)-1] + int(hue * (bottoms[len(bottoms)-2] - bottoms[len(bottoms)-2]))
+
+  particle = start_particle
+
+  first = True
+  boom = False
+
+  tc = 0.001
+  hc = 0.004
+
+  while running():
+
+    # display state
+
+    display_pixels[particle] = (hue, 1)
+    fade_hv_fadepixel(display_pixels, 0.02)
+    render_hv_fadepixel(pixels, display_pixels)
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        boom = old_first
+        first = True
+        pixels.show()
+        pixels.fill( (0,0,0) )
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+
+    clock.sleep(tc)
+
+    if boom:
+      hue = random.random()
+      start_particle = bottoms[len(bottoms)-1] + int(hue * (bottoms[len(bottoms)-2] - bottoms[len(bottoms)-1]))
+      particle = start_particle
+
+    boom = False
+
+
+def mode27():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    theta = 0
+
+
+    k1 = random.random()*2 + 0.7
+
+    hue = random.random()
+    rgb = hsv_to_neo_rgb(hue)
+
+    compl_hue = (hue+0.5) % 1.0
+    compl_rgb = hsv_to_neo_rgb(compl_hue, v=0.3 + random.random() * 0.7)
+
+    num_first = random.randint(1,2)
+    num_extra = random.randint(num_first,5)
+
+    timescale = random.random()
+
+    while running():
+
+        theta = (time.time() % 3600.0) * (timescale * 10 + 10)
+
+        pixels.fill( (0,0,0) )
+        x = math.cos(theta*k1) * 3.5
+        y = math.sin(theta) * 3.5
+
+        s = nearest_k(x, y, num_extra)
+
+        for n in range(0, num_first):
+            (d, p) = s[n]
+            pixels[p] = rgb
+
+        for n in range(num_first, num_extra):
+            (d, p) = s[n]
+            pixels[p] = compl_rgb
+
+        pixels.show()
+        # clock.sleep(0.001)
+
+
+
+def mode40():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    theta = 0
+
+
+    k1 = random.random()*2 + 0.7
+
+    hue = random.random()
+    rgb = hsv_to_neo_rgb(hue)
+
+    compl_hue = (hue+0.5) % 1.0
+    compl_rgb = hsv_to_neo_rgb(compl_hue, v=0.3 + random.random() * 0.7)
+
+    num_first = 1 # random.randint(1,2)
+    num_extra = num_first # random.randint(num_first,5)
+
+    timescale = random.random() + 1
+
+    star_factor = float(random.randint(1,4)) + random.random() * 0.1
+
+    while running():
+
+        theta = (time.time() % 3600.0) * (timescale * 10 + 10)
+
+        pixels.fill( (0,0,0) )
+
+        scale_r = 4
+
+        r = math.cos(theta * star_factor) * scale_r/2.5 + scale_r/2.0
+
+        x = math.cos(theta) * r
+        y = math.sin(theta) * r
+
+        s = nearest_k(x, y, num_extra)
+
+        for n in range(0, num_first):
+            (d, p) = s[n]
+            pixels[p] = rgb
+
+        for n in range(num_first, num_extra):
+            (d, p) = s[n]
+            pixels[p] = compl_rgb
+
+        pixels.show()
+
+
+def mode43():
+    pixels.auto_write = False
+
+    h = 0.5
+
+    display_pixels = [None for n in range(0,50)]
+
+    hue0 = random.random()
+    hue1 = (hue0 + 0.333) % 1.0
+    hue2 = (hue1 + 0.333) % 1.0
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+        skip = False
+        pos = random.randint(0,12)
+        if pos == 0:
+          h = 3
+          hue = hue0
+        elif pos == 1:
+          h = 0
+          hue = hue1
+        elif pos == 2:
+          h = -3
+          hue = hue2
+        else:
+          skip = True
+
+        if not skip:
+
+          for p in range(0,50):
+              (x, y) = pixel_pos[p]
+
+              d = min(1, abs(y - h) / 2.0)
+
+              v = 1-d
+              if v > 0:
+                display_pixels[p] = (hue, v)
+
+        render_hv_fadepixel(pixels, display_pixels)
+        fade_hv_fadepixel(display_pixels, 0.05)
+
+        clock.sleep(0.05)
+
+
+def mode44():
+    pixels.auto_write = False
+
+    n = 4
+
+    base_hue = random.random()
+
+    # (x,y,hue, count, xv, yv)
+    state = [(random.random()*8.0 - 4.0, random.random()*8.0 - 4.0, base_hue + float(i) / float(n), 7, random.random(), random.random()) for i in range(0,n)]
+
+
+    while running():
+        pixels.fill( (0, 0, 0) )
+        used_pixels = []
+
+        for (x,y,hue,count,xv,yv) in state:
+
+          # enough pixels to still have count after removing used ones
+          s = nearest_k(x, y, count + len(used_pixels))
+
+          def snd(t):
+            (a, b) = t
+            return b
+
+          s = [e for e in s if snd(e) not in used_pixels]
+
+          for p in range(0, count):
+            (d, pix) = s[p]
+            pixels[pix] = hsv_to_neo_rgb(hue)
+            used_pixels.append(pix)
+
+        pixels.show()
+
+
+        for target in range(0, n):
+          (x,y,hue,count,xv,yv) = state[target]
+
+          v_k = 0.2
+          new_x = x + xv * v_k
+          new_y = y + yv * v_k
+
+          if new_x > 5 or new_x < -5:
+              new_x = x
+              xv = -xv
+
+          if new_y > 5 or new_y < -5:
+              new_y = y
+              yv = -yv
+
+          state[target] = (new_x, new_y, hue, count, xv, yv)
+
+        clock.sleep(0.02)
+
+
+def mode49():
+    pixels.auto_write = False
+
+    display_pixels = [None for pixel in range(0,50)]
+
+    n = 4
+
+    base_hue = random.random()
+
+    # (x,y,hue, count, xv, yv)
+    state = [(random.random()*8.0 - 4.0, random.random()*8.0 - 4.0, base_hue + float(i) / float(n), 7, random.random(), random.random()) for i in range(0,n)]
+
+
+    while running():
+        pixels.fill( (0, 0, 0) )
+        used_pixels = []
+
+        for (x,y,hue,count,xv,yv) in state:
+
+          # enough pixels to still have count after removing used ones
+          s = nearest_k(x, y, count + len(used_pixels))
+
+          def snd(t):
+            (a, b) = t
+            return b
+
+          s = [e for e in s if snd(e) not in used_pixels]
+
+          for p in range(0, count):
+            (d, pix) = s[p]
+            display_pixels[pix] = (hue, 1.0 - min(1.0, d/8.0))
+            used_pixels.append(pix)
+
+        render_hv_fadepixel(pixels, display_pixels)
+        fade_hv_fadepixel(display_pixels, 0.05)
+
+        for target in range(0, n):
+          (x,y,hue,count,xv,yv) = state[target]
+
+          v_k = 0.2
+          new_x = x + xv * v_k
+          new_y = y + yv * v_k
+
+          if new_x > 5 or new_x < -5:
+              new_x = x
+              xv = -xv
+
+          if new_y > 5 or new_y < -5:
+              new_y = y
+              yv = -yv
+
+          state[target] = (new_x, new_y, hue, count, xv, yv)
+
+        clock.sleep(0.02)
+
+
+def mode50():
+    pixels.auto_write = False
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+
+      hue = random.random()
+
+      x = random.random() * 6 - 3
+      y = random.random() * 6 - 3
+
+      for p in range(0,50):
+
+        (x1, y1) = pixel_pos[p]
+
+        d = math.sqrt( (x1 - x) ** 2 + (y1 - y) ** 2)
+
+        v = 1-min(1,d/5.0)
+
+        pixels[p] = hsv_to_neo_rgb(hue, v=v)
+
+      pixels.show()
+      clock.sleep(0.3)
+
+
+def mode88():
+    # like mode50, but changes hue rather than brightness
+    pixels.auto_write = False
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+
+      hue_offset = random.random()
+
+      x = random.random() * 6 - 3
+      y = random.random() * 6 - 3
+
+      for p in range(0,50):
+
+        (x1, y1) = pixel_pos[p]
+
+        d = math.sqrt( (x1 - x) ** 2 + (y1 - y) ** 2)
+
+        v = (d/10.0 + hue_offset) % 1.0
+
+        pixels[p] = hsv_to_neo_rgb(v)
+
+      pixels.show()
+      clock.sleep(0.3)
+
+
+def mode51():
+    pixels.auto_write = False
+
+    display_pixels = [None for pixel in range(0,50)]
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+
+      hue = random.random()
+ 
+      (x, y) = random_in_radius(5)
+
+      for p in range(0,50):
+
+        (x1, y1) = pixel_pos[p]
+
+        d = math.sqrt( (x1 - x) ** 2 + (y1 - y) ** 2)
+
+        v = 1-min(1,math.sqrt(d)/2.5)
+
+        opix = display_pixels[p]
+        if opix is None: 
+          display_pixels[p] = (hue, v)
+        else:
+          (oh, ov) = display_pixels[p]
+          if v > ov:
+            display_pixels[p] = (hue, v)
+
+      render_hv_fadepixel(pixels, display_pixels)
+      fade_hv_fadepixel(display_pixels, 0.05)
+
+      clock.sleep(0.05)
+
+
+def mode59():
+    pixels.auto_write = False
+
+    display_pixels = [None for pixel in range(0,50)]
+
+    pixel_pos = generate_pixel_pos()
+    ang = tau / 8.0
+
+    while running():
+
+      hue = random.random()
+ 
+      for p in range(0,50):
+
+        # red bit
+        (x1, y1) = pixel_pos[p]
+
+        (b, frac) = pixel_to_layer(p)
+        r = abs(math.cos(frac * tau + ang) * 5.0)
+        if math.sqrt(x1 ** 2 + y1 ** 2) < r and b >= 2:
+            nx = (0, 1 - abs(b - 3.0)/ 3.0)
+        else:
+            nx = None
+ 
+        # green bit
+        green_width = 2.0
+        d = abs(x1-y1)
+        if d < green_width and y1 < 0 and nx is None and random.random() > 0.9:
+            nx = (0.3333, 1.0 - d/green_width)
+
+
+        if nx is not None:
+            (hue, v) = nx
+            opix = display_pixels[p]
+            if opix is None: 
+                display_pixels[p] = (hue, v)
+            else:
+                (oh, ov) = display_pixels[p]
+                if v > ov:
+                    display_pixels[p] = (hue, v)
+
+      
+
+      render_hv_fadepixel(pixels, display_pixels)
+      fade_hv_fadepixel(display_pixels, 0.05)
+
+      clock.sleep(0.05)
+      ang = ang + 0.005
+
+
+def random_in_radius(r):
+    """Pick a random point inside the radius r circle"""
+    while True:
+
+      x = random.random() * 2*r - r
+      y = random.random() * 2*r - r
+
+      if math.sqrt(x ** 2 + y **2) <= r **2:
+        return (x,y)
+
+
+
+def mode52():
+    pixels.auto_write = False
+
+    pixel_pos = generate_pixel_pos()
+
+    centre_info = []
+
+    for centres in range(0,3):
+      (x,y) = random_in_radius(4)
+      hue = random.random()
+
+      centre_info.append( (x, y, hue, 1.0) )
+
+    while running():
+
+      display_pixels = [None for pixel in range(0,50)]
+
+      for (x,y,hue,intensity) in centre_info:
+
+        for p in range(0,50):
+
+          (x1, y1) = pixel_pos[p]
+
+          d = math.sqrt( (x1 - x) ** 2 + (y1 - y) ** 2)
+
+          v = 1-min(1,math.sqrt(d)/2.5)
+          v *= intensity
+
+          opix = display_pixels[p]
+          if opix is None: 
+            display_pixels[p] = (hue, v)
+          else:
+            (oh, ov) = display_pixels[p]
+            if v > ov:
+              display_pixels[p] = (hue, v)
+
+      render_hv_fadepixel(pixels, display_pixels)
+
+
+      # i think this fading is unnecessary for this particular mode
+      # because all the fading is done by the centre_info intensity
+      # value and display_pixels is regerenated each frame...
+      fade_hv_fadepixel(display_pixels, 0.05)
+
+      (ox, oy, ohue, ointensity) = centre_info[0]
+      new_intensity = max(0, ointensity - 0.05)
+      if new_intensity > 0:
+        centre_info[0] = (ox, oy, ohue, new_intensity)
+      else:
+        del centre_info[0]
+
+        (x,y) = random_in_radius(4)
+        hue = random.random()
+        centre_info.append( (x, y, hue, 1.0) )
+
+      clock.sleep(0.01)
+
+
+def mode53():
+    pixels.auto_write = False
+    
+    display_pixels = [None for pixel in range(0,50)]
+
+    hue = random.random()
+
+    while running():
+
+        display_pixels[random.randint(0, 49)] = (hue, 1)
+
+        render_hv_fadepixel(pixels, display_pixels)
+        fade_hv_fadepixel(display_pixels, 0.05)
+
+        clock.sleep(0.05)
+
+        hue = (hue + 0.005) % 1.0
+
+
+def mode54():
+    pixels.auto_write = False
+    
+    neighbours = spiral.neighbours
+
+    display_pixels = [None for pixel in range(0,50)]
+
+    hue = random.random()
+    pixel = random.randint(0, 49)
+
+    while running():
+
+        display_pixels[pixel] = (hue, 1)
+
+        render_hv_fadepixel(pixels, display_pixels)
+        fade_hv_fadepixel(display_pixels, 0.03)
+
+        clock.sleep(0.01)
+
+        candidates = neighbours.closest(pixel)
+
+        candidates = [(d, n) for (d, n) in candidates if display_pixels[n] is None]
+
+        if candidates != []:
+            (least_d, _) = candidates[0]
+
+            candidates = [(d, n) for (d, n) in candidates if d < least_d * 1.25]
+
+            x = random.randint(0, len(candidates) - 1)
+
+            (d, n) = candidates[x]
+
+            pixel = n
@@ -0,0 +1,1085 @@
+"""Modes made of individual dots: twinkles, sparkles, lightning and
+things moving outwards along the spiral.
+"""
+
+import itertools
+import math
+import random
+import time
+
+import swirl.randomwalk as randomwalk
+from swirl.colour import hsv_to_neo_rgb
+from swirl.modes import modes
+from swirl.runtime import clock, pixels, running, switch_to
+from swirl.topologies import pixel_to_layer, bottoms, spiral
+
+
+def mode1():
+    pixels.auto_write = True
+    pixels.fill( (0,0,0) )
+    n = 0
+    while running():
+        pixel = random.randint(0,49)
+
+        if n == 0:
+            (red, green, blue) = (0,0,0)
+        else:
+            hue = random.random()
+            (red, green, blue) = hsv_to_neo_rgb(hue)
+        pixels[pixel] = (red, green, blue)
+        n = (n+1) % 3
+        clock.sleep(1)
+
+
+def mode31():
+    pixels.auto_write = False
+
+    hue = random.random()
+
+    brightness = []
+
+    rw = randomwalk.randomwalk(low = 0.1, high = 1.0)
+
+    for p in range(0,50):
+        brightness.append(next(rw))
+
+    while running():
+        for p in range(0,50):
+            pixels[p] = hsv_to_neo_rgb(hue, s=0.75, v=brightness[p]) 
+        pixels.show()
+
+        # rotate through all hues every 3 hours
+        hue = (hue + 1.0 / (3.0 * 60.0 * 60.0) ) % 1.0
+        clock.sleep(0.5)
+
+
+def mode76():
+  pixels.auto_write = False
+  angle = random.random()
+  radius = 0
+
+  while running():
+    pixels.fill( (0,0,0) )
+    b1 = bottoms[radius]
+    b2 = bottoms[radius + 1]
+    pix = int(b1 + (b2-b1)*angle)
+    pixels[pix] = (255,255,255) 
+
+    radius += 1
+    if radius >= 5: # TODO wrt len of bottoms
+      radius = 0
+      angle = random.random()
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+# based on mode76 but leaving a trail
+def mode112():
+  pixels.auto_write = False
+  angle = random.random()
+  radius = 0
+  clear = True
+
+  while running():
+    if clear:
+      pixels.fill( (0,0,0) )
+      clear = False
+    b1 = bottoms[radius]
+    b2 = bottoms[radius + 1]
+    pix = int(b1 + (b2-b1)*angle)
+    pixels[pix] = (255,255,255)
+
+    radius += 1
+    if radius >= 5: # TODO wrt len of bottoms
+      radius = 0
+      angle = random.random()
+      clear = True
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+# based on mode76 but leaving a trail, different from mode112
+def mode113():
+  pixels.auto_write = False
+  pixels.fill( (0,0,0) )
+  angle = random.random()
+  radius = 0
+  history = []
+
+  while running():
+    for p in range(0, len(history) - 1):
+      pixels[history[p]] = (64,0,0)
+    if len(history) > 10:
+      pixels[history[0]] = (0,0,0)
+      del history[0]
+    b1 = bottoms[radius]
+    b2 = bottoms[radius + 1]
+    pix = int(b1 + (b2-b1)*angle)
+    pixels[pix] = (255,128,0)
+    history.append(pix)
+
+    radius += 1
+    if radius >= 5: # TODO wrt len of bottoms
+      radius = 0
+      angle = random.random()
+      clear = True
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+
+def mode77():
+  pixels.auto_write = False
+  angle = random.random()
+  radius = 0
+
+  while running():
+    pixels.fill( (0,0,0) )
+    b1 = bottoms[radius]
+    b2 = bottoms[radius + 1]
+    pix = int(b1 + (b2-b1)*angle)
+    pixels[pix] = (255,255,255) 
+
+    radius += 1
+    if radius >= 5: # TODO wrt len of bottoms
+      radius = 0
+      angle += 0.03
+      angle %= 1.0
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+def mode78():
+  pixels.auto_write = False
+  angle = random.random()
+  radius = 0
+
+  while running():
+    pixels.fill( (0,0,0) )
+    b1 = bottoms[radius]
+    b2 = bottoms[radius + 1]
+    pix = int(b1 + (b2-b1)*angle)
+    hue = (angle + radius / 5.0 / 3.0) % 1.0
+    pixels[pix] = hsv_to_neo_rgb(hue) 
+
+    radius += 1
+    if radius >= 5: # TODO wrt len of bottoms
+      radius = 0
+      angle = random.random()
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+def mode79():
+  pixels.auto_write = False
+  hue = random.random()
+  rgb = hsv_to_neo_rgb(hue) 
+
+  while running():
+    pixels.fill( (0,0,0) )
+    for p in range(0,50):
+      if random.random() > 0.5:
+          pixels[p] = rgb
+    pixels.show()
+    clock.sleep(0.03)
+
+
+def mode80():
+  pixels.auto_write = False
+  hue = random.random()
+  rgb = hsv_to_neo_rgb(hue) 
+  contr_rgb = hsv_to_neo_rgb((hue + 0.5)%1.0) 
+
+  while running():
+    pixels.fill( (0,0,0) )
+    for p in range(0,50):
+      r = random.random()
+      if r > 0.95:
+          pixels[p] = contr_rgb
+      elif r > 0.5: 
+          pixels[p] = rgb
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+def mode93():
+  pixels.auto_write = False
+  hue = random.random()
+  rgb = hsv_to_neo_rgb(hue) 
+  contr_rgb = hsv_to_neo_rgb((hue + 0.5)%1.0) 
+
+  primary_rw = randomwalk.randomwalk(low = 0.25, high = 0.75)
+  contr_rw = randomwalk.randomwalk(low = 0.75, high = 1.0)
+
+  while running():
+    pixels.fill( (0,0,0) )
+    primary_thresh = next(primary_rw)
+    contr_thresh = next(contr_rw)
+    for p in range(0,50):
+      r = random.random()
+      if r > contr_thresh:
+          pixels[p] = contr_rgb
+      elif r > primary_thresh:
+          pixels[p] = rgb
+
+    pixels.show()
+    clock.sleep(0.03)
+
+
+def pmode_randomwalk_on_spiral(*, delay=0.3, get_new_frame_state, pixel_colour):
+  pixels.auto_write = False
+
+  while running():
+    frame_state = get_new_frame_state()
+
+    brightness = []
+
+    # slight bias dimmer - the visual effect is pretty
+    # sensitive to the bias amount
+    rw = randomwalk.randomwalk(low = 0.1, high = 1.0, bias = -0.03)
+
+    for p in range(0,50):
+        brightness.append(next(rw))
+
+    for p in range(0,50):
+        pixels[p] = pixel_colour(brightness[p], frame_state)
+    pixels.show()
+
+    clock.sleep(delay)
+
+
+def mode56():
+  def f(brightness, framestate):
+      return hsv_to_neo_rgb(framestate, s=0.75, v=brightness) 
+  pmode_randomwalk_on_spiral(get_new_frame_state = random.random,
+                             pixel_colour=f)
+
+
+def mode114():
+  def const_None():
+      return None
+
+  def f(brightness, framestate):
+      if brightness > 0.5:
+          return (255,255,255)
+      else:
+          return (0,0,0)
+
+  pmode_randomwalk_on_spiral(get_new_frame_state = const_None,
+                             pixel_colour=f,
+                             delay=0.1)
+
+
+def mode115():
+  def two_rgbs():
+    hue = random.random()
+    rgb = hsv_to_neo_rgb(hue, v=1.0)
+
+    hue2 = (hue+0.5)%1.0
+    rgb2 = hsv_to_neo_rgb(hue2, v=1.0)
+
+    return (rgb, rgb2)
+
+  def f(brightness, framestate):
+      (rgb, rgb2) = framestate
+      if brightness > 0.75:
+          return rgb2
+      elif brightness > 0.5:
+          return rgb
+      else:
+          return (0,0,0)
+
+  pmode_randomwalk_on_spiral(get_new_frame_state = two_rgbs,
+                             pixel_colour=f,
+                             delay=0.2)
+
+
+def mode4():
+    pixels.auto_write = False
+    colours = {}
+    for n in range(0,50):
+        colours[n] = random.random()
+
+    for n in range(0,50):
+        pixels[n] = hsv_to_neo_rgb(colours[n])
+
+    pixels.show()
+
+    count = 0
+
+    while running():
+
+        swapped = False
+
+        if count == 0:
+            new_pixel = random.randint(0,49)
+            new_hue = random.random()
+
+        count = (count + 1) % 200
+
+        p1 = random.randint(0,48)
+        p2 = p1 + 1
+
+        if colours[p1] > colours[p2]:
+            tmp = colours[p1]
+            colours[p1] = colours[p2]
+            colours[p2] = tmp
+            swapped = True
+
+        if swapped:
+            for n in range(0,50):
+                pixels[n] = hsv_to_neo_rgb(colours[n])
+
+            pixels.show()
+            clock.sleep(0.1)
+
+
+
+def mode11():
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    hue = 0.5
+    angle = 0.3
+    width = 1
+    speed = 0.2
+    outwards = 0
+
+    while running():
+
+
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+        frac = proportion_around_loop
+
+        # simple radial proportion that assumes that each LED between bottom points
+        # is at a constant distance, with an immediate jump at each bottom point to
+        # be one unit further in.
+        # That leads to some abrupt changes in LED brightness, especially near the end
+        # of the strand
+
+        # this should make b into a number that decreases more smoothly than b,
+        # taking into account how far round the loop we are (which is stored
+        # in frac)
+        b_pro_rated = b + proportion_around_loop
+        radial_proportion = b_pro_rated / (len(bottoms)-1)
+
+        angle_distance = angle-frac
+        if angle_distance > 0.5:
+          angle_distance = 1-angle_distance
+
+
+        distance = (math.sqrt( (angle_distance/width) ** 2 + (outwards - radial_proportion) ** 2))
+        if distance < 0.3:
+          brightness = (0.3 - distance) / 0.3
+        else:
+          brightness = 0
+
+        pixels[pixel] = hsv_to_neo_rgb(hue, v=brightness)
+
+      pixels.show()
+
+      outwards = outwards + speed
+
+      if outwards > 1.3:
+        outwards = 0
+        speed = 0.075 + random.random() * 0.225
+        hue = random.random()
+        angle = random.random()
+        width = 0.1 + random.random() * 0.9
+
+      clock.sleep(0.02)
+
+
+def mode15():
+  pixels.auto_write = False
+
+  cells = [0 for n in range(0,50)]
+
+  particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+
+  first = True
+  boom = False
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        cells[particle] = 1
+        new_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+        boom = old_first
+        first = True
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    if cells[new_particle] != 0: # if we're about to move onto solid, solidify
+      cells[particle] = 1
+      particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+      boom = old_first
+      first = True
+    else:
+      particle = new_particle
+
+    # display state
+
+    for pixel in range(0,50):
+      if cells[pixel] == 0:
+        pixels[pixel] = (0,0,0)
+      elif cells[pixel] == 1:
+        pixels[pixel] = (16,16,255)
+      else:
+        pixels[pixel] = (255,0,0)
+
+    pixels[particle] = (0,32,0)
+
+    pixels.show()
+
+    if boom:
+      for exponent in range(8,0,-1):
+        brightness = (2 ** exponent) - 1
+        for pixel in range(0,50):
+          if cells[pixel] == 0:
+            pixels[pixel] = (0,0,0)
+          elif cells[pixel] == 1:
+            pixels[pixel] = (brightness,brightness,brightness)
+          else:
+            pixels[pixel] = (255,0,0)
+        pixels.show()
+        clock.sleep(0.04)
+      cells = [0 for n in range(0,50)]
+
+    boom = False
+
+    clock.sleep(0.005)
+
+def mode20():
+  pixels.auto_write = False
+
+  particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+  hue = random.random()
+
+  first = True
+  boom = False
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        new_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+        boom = old_first
+        first = True
+        pixels.fill( (0,0,0) )
+        hue = random.random()
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+    # display state
+
+    pixels[particle] = hsv_to_neo_rgb(hue)
+
+    pixels.show()
+
+    boom = False
+
+    clock.sleep(0.02)
+
+
+def mode61():
+  """another reparameterisation of mode20 - TODO factor?"""
+  pixels.auto_write = False
+
+  particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+  hue = random.random()
+
+  first = True
+  boom = False
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        new_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+        boom = old_first
+        first = True
+        pixels.show()
+        clock.sleep(0.03)
+        pixels.fill( (0,0,0) )
+        hue = random.random()
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+    # display state
+
+    pixels[particle] = hsv_to_neo_rgb(hue)
+
+
+    boom = False
+
+
+def mode107():
+  """another reparameterisation of mode20, based on mode61 - TODO factor?"""
+  pixels.auto_write = False
+
+  particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+  hue = random.random()
+
+  first = True
+  boom = False
+
+  blanking_buffer = []
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        new_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+        boom = old_first
+        first = True
+        pixels.show()
+        clock.sleep(0.03)
+        pixels.fill( (0,0,0) )
+        blanking_buffer = []
+        hue = random.random()
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+    # display state
+
+    pixels[particle] = hsv_to_neo_rgb(hue)
+    blanking_buffer.append(particle)
+
+    # this will likely fire only once, or 0 times near the start...
+    # but while vs if will make it converge if end up setting pixels
+    # differently another time
+    while len(blanking_buffer) > 5:
+      pixels[blanking_buffer[0]] = (32,0,0)
+      del blanking_buffer[0]
+
+    boom = False
+
+
+def mode108():
+  """another reparameterisation of mode20, based on mode61, mode107 - TODO factor?"""
+  pixels.auto_write = False
+
+  particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+  hue = random.random()
+
+  first = True
+  boom = False
+
+  blanking_buffer = []
+
+  while running():
+
+    # move particle
+    (b, frac) = pixel_to_layer(particle)
+
+    choice = random.randint(0,2)
+
+    old_first = first
+    first = False
+
+    if choice == 0:
+      new_particle = particle + 1
+      if new_particle >= bottoms[b]:
+        new_particle = bottoms[b+1]
+
+    elif choice == 1:
+      new_particle = particle - 1  # TODO: mod
+      if new_particle < bottoms[b+1]:
+        new_particle = bottoms[b]-1
+    elif choice == 2:
+      # move inwards
+      # determine angle now
+      if b == 0:
+        # if we reach the centre, solidify
+        new_particle = random.randint(bottoms[len(bottoms)-1], bottoms[len(bottoms)-2])
+        boom = old_first
+        first = True
+        pixels.show()
+        clock.sleep(0.03)
+        pixels.fill( (0,0,0) )
+        blanking_buffer = []
+        hue = random.random()
+      else:
+        b = b - 1
+        new_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+
+    particle = new_particle
+
+    # display state
+
+    pixels[particle] = hsv_to_neo_rgb(hue)
+
+    blanking_buffer.append(particle)
+
+    # this will likely fire only once, or 0 times near the start...
+    # but while vs if will make it converge if end up setting pixels
+    # differently another time
+    while len(blanking_buffer) > 3:
+      p = blanking_buffer[0]
+      pixels[p] = (0,0,0)
+      del blanking_buffer[0]
+
+    pixels.show()
+    clock.sleep(0.01)
+    boom = False
+
+
+def mode22():
+    pixels.auto_write = False
+
+    # None = blank, otherwise a hue
+    display_pixels = [None for n in range(0,50)]
+
+    while running():
+
+        active_pixel = random.randint(0,49)
+
+        if display_pixels[active_pixel] is None:
+            # off-rules:
+
+            total_lit = 0
+            for p in display_pixels:
+                if p is not None:
+                    total_lit = total_lit + 1
+
+            if total_lit < 30:
+                display_pixels[active_pixel] = random.random()
+
+        else:
+            display_pixels[active_pixel] = (display_pixels[active_pixel] + 0.1)
+            if display_pixels[active_pixel] >= 1.0:
+                display_pixels[active_pixel] = None
+
+        for pixel in range(0,50):
+            if display_pixels[pixel] is None:
+                pixels[pixel] = (0,0,0)
+            else:
+                pixels[pixel] = hsv_to_neo_rgb(display_pixels[pixel])
+
+        pixels.show()
+
+        clock.sleep(0.1)
+
+
+def mode23():
+    pixels.auto_write = False
+
+    # None = blank, otherwise a hue
+    display_pixels = [None for n in range(0,50)]
+
+    end_rainbow_increase_factor = 1.1
+    blanking_probability = 0.999
+    rotate_period = 0.07
+
+    rotate_time = time.time()
+
+    while running():
+
+        # rotate along spiral with a certain percentage
+        # hopefully this makes the spiralness more visible
+        # than a static display
+
+        new_rotate_time = time.time()
+        if False and new_rotate_time > rotate_time+rotate_period:
+
+            tmp = display_pixels[49]
+            for n in range(49,0,-1):
+                display_pixels[n] = display_pixels[n-1]
+            display_pixels[0] = tmp
+            rotate_time = new_rotate_time
+
+
+        active_pixel = random.randint(0,49)
+
+        # this lets us watch how fast things are considered
+        if False:
+            pixels[active_pixel] = (255,255,255)
+            pixels.show()
+
+        total_lit = 0
+        for p in display_pixels:
+            if p is not None:
+                total_lit = total_lit + 1
+
+        (b, frac) = pixel_to_layer(active_pixel)
+
+        if b >= 1:
+            inwards_particle = int(bottoms[b-1] + (bottoms[b] - bottoms[b-1])*frac)
+            inwards_hue = display_pixels[inwards_particle]
+        else:
+            inwards_hue = None
+
+        if b < len(bottoms):
+            outwards_particle = int(bottoms[b] + (bottoms[b+1] - bottoms[b])*frac)
+            outwards_hue = display_pixels[outwards_particle]
+        else:
+            outwards_hue = None
+
+        if display_pixels[active_pixel] is None:
+            # off-rules:
+            if total_lit < 32:
+                # dark pixel turning on
+                # according to assorted rainbow-forming rules
+
+                # if we're between two lit pixels, choose a hue that is
+                # part of a rainbow between the two:
+                if active_pixel >= 1 and active_pixel <= 48 and \
+                   display_pixels[active_pixel - 1] is not None and \
+                   display_pixels[active_pixel + 1] is not None:
+
+                  diff = (display_pixels[active_pixel + 1] - display_pixels[active_pixel - 1]) 
+                  if diff > 0.5:
+                      diff -= 1.0
+
+                  if abs(diff) < 0.2:  # only do an infill for close colours
+                    new_hue = (display_pixels[active_pixel - 1] + diff / 2.0) % 1.0
+                    display_pixels[active_pixel] = new_hue 
+                  else:
+                    display_pixels[active_pixel] = None
+
+                # pixel downwards is on. pixel upwards is not on, otherwise caught by previous case.
+                elif active_pixel >= 2 and \
+                    display_pixels[active_pixel - 1] is not None and \
+                    display_pixels[active_pixel - 2] is not None:
+
+                    diff = display_pixels[active_pixel - 1] - display_pixels[active_pixel - 2]
+                    if diff > 0.5:
+                        diff -= 1.0
+                    # multiple diff up a bit to try to force the rainbowness
+                    new_hue = (display_pixels[active_pixel - 1] + (diff * end_rainbow_increase_factor)) % 1.0
+                    display_pixels[active_pixel] = new_hue 
+
+                elif active_pixel <= 47 and \
+                    display_pixels[active_pixel + 1] is not None and \
+                    display_pixels[active_pixel + 2] is not None:
+
+                    diff = display_pixels[active_pixel + 1] - display_pixels[active_pixel + 2]
+                    if diff > 0.5:
+                        diff -= 1.0
+                    new_hue = (display_pixels[active_pixel + 1] + (diff * end_rainbow_increase_factor)) % 1.0
+                    display_pixels[active_pixel] = new_hue 
+
+                # possible elif here: look inwards and outwards rather than around the spiral to
+                # find other nearby colours
+                elif inwards_hue is not None or outwards_hue is not None:
+                    if inwards_hue is not None and outwards_hue is None:
+                        display_pixels[active_pixel] = inwards_hue
+                    elif inwards_hue is None and outwards_hue is not None:
+                        display_pixels[active_pixel] = outwards_hue
+                    else:
+                        diff = inwards_hue - outwards_hue
+                        if diff > 0.5:
+                            diff -= 1.0
+                        new_hue = (outwards_hue + diff / 2.0) % 1.0
+                        display_pixels[active_pixel] = new_hue
+
+                else:  # all we can do now is pick a random hue
+                    display_pixels[active_pixel] = random.random()
+
+        else:
+            if total_lit > 20 and random.random() > blanking_probability: # some hysteresis with the off-mode equivalent to keep a decent twinkling zone, perhaps
+                display_pixels[active_pixel] = None
+ 
+            # if we're between two lit pixels, choose a hue that is
+            # part of a rainbow between the two:
+            elif active_pixel >= 1 and active_pixel <= 48 and \
+                display_pixels[active_pixel - 1] is not None and \
+                display_pixels[active_pixel + 1] is not None:
+
+                diff = (display_pixels[active_pixel + 1] - display_pixels[active_pixel - 1]) 
+                if diff > 0.5:
+                    diff -= 1.0
+                new_hue = (display_pixels[active_pixel - 1] + diff / 2.0) % 1.0
+                display_pixels[active_pixel] = new_hue 
+
+            # pixel downwards is on. pixel upwards is not on, otherwise caught by previous case.
+            elif active_pixel >= 2 and \
+                display_pixels[active_pixel - 1] is not None and \
+                display_pixels[active_pixel - 2] is not None:
+
+                diff = display_pixels[active_pixel - 1] - display_pixels[active_pixel - 2]
+                if diff > 0.5:
+                    diff -= 1.0
+
+                forced_diff = max(-0.1, min(0.1, diff * end_rainbow_increase_factor))
+                # multiple diff up a bit to try to force the rainbowness
+                new_hue = (display_pixels[active_pixel - 1] + forced_diff) % 1.0
+                display_pixels[active_pixel] = new_hue 
+
+            elif active_pixel <= 47 and \
+                display_pixels[active_pixel + 1] is not None and \
+                display_pixels[active_pixel + 2] is not None:
+
+                diff = display_pixels[active_pixel + 1] - display_pixels[active_pixel + 2]
+                if diff > 0.5:
+                    diff -= 1.0
+                forced_diff = max(-0.1, min(0.1, diff * end_rainbow_increase_factor))
+                new_hue = (display_pixels[active_pixel + 1] + forced_diff) % 1.0
+                display_pixels[active_pixel] = new_hue 
+
+            else:
+                # we can't do anything to this pixel to enhance rainbowness, so
+                # with a certain percentage, blank it so we can get a new chance
+                # elsewhere. Otherwise leave it untouched.
+
+                if random.random() < 0.1:
+                    display_pixels[active_pixel] = None
+
+                # if we can't enhance the rainbowness of an existing pixel, just leave it as.
+                # pass  
+
+                ##                display_pixels[active_pixel] = (display_pixels[active_pixel] + random.random() * 0.01) % 1.0
+
+        for pixel in range(0,50):
+            if display_pixels[pixel] is None:
+                pixels[pixel] = (0,0,0)
+            else:
+                pixels[pixel] = hsv_to_neo_rgb(display_pixels[pixel])
+
+        pixels.show()
+
+
+
+class M25_state:
+    def __init__(self, hue):
+        self.hue = hue
+        self.born = time.time()
+
+def mode25():
+    pixels.auto_write = False
+
+    target_frac = 0.5
+
+    state = [None for c in range(0,50)]
+
+    neighbours = spiral.neighbours
+
+    iterations_since_last_change = 0
+
+    while running():
+        active_pixel = random.randint(0,49)
+
+        # highlight the chosen pixel
+        # pixels[active_pixel] = (255,0,0)
+        # pixels.show()
+
+        # neighbours of the chosen pixel, not including itself
+        ball = neighbours.neighbours_within(active_pixel, 1.5)
+
+        count_on = 0
+        for (d,p) in ball:
+            if state[p] is not None:
+                count_on += 1
+
+        if state[active_pixel] is not None:
+            count_on += 1
+
+        if state[active_pixel] is not None and count_on == 0: 
+            iterations_since_last_change += 1
+            pass  # leave on, but do not do colour selection
+        elif count_on >= len(ball) * target_frac:
+            if state[active_pixel] is None:
+                iterations_since_last_change += 1
+            else:
+                iterations_since_last_change = 0
+            state[active_pixel] = None
+        elif state[active_pixel] is None:
+            # turn on
+            ball_live = [(d, p) for (d, p) in ball if state[p] is not None]
+            if ball_live == []:
+                state[active_pixel] = M25_state(random.random())
+                iterations_since_last_change = 0
+            else:
+                hues_live = [state[p1].hue for (d1, p1) in ball_live]
+                hues_sorted = sorted(hues_live)
+                hues_grouped = [list(it) for (h, it) in itertools.groupby(hues_sorted)]
+                hues_counted = [(len(l), l[0]) for l in hues_grouped]
+                hues_counted_sorted = sorted(hues_counted)
+                (last_count, _) = hues_counted_sorted[0]
+                minimal_hues = [hue for (count, hue) in hues_counted_sorted if count == last_count]
+
+                if minimal_hues != []:
+                    new_hue = minimal_hues[random.randint(0, len(minimal_hues)-1)]
+                    iterations_since_last_change = 0
+                    state[active_pixel] = M25_state(new_hue)
+                else:
+                    iterations_since_last_change += 1
+        else:
+            ball_live = [(d, p) for (d, p) in ball if state[p] is not None]
+            hues_live = [state[p].hue for (d, p) in ball_live if state[p].hue != state[active_pixel].hue]
+            # hues_live now has the list of colours that are not the colour of this
+            # pixel
+
+            # turn off if any nearby different colours
+            if hues_live != []:
+                state[active_pixel] = None
+                iterations_since_last_change = 0
+            else:
+                iterations_since_last_change += 1
+
+        if iterations_since_last_change > 500:
+            print("NO CHANGE THRESHOLD REACHED")
+            iterations_since_last_change = 0
+            live_pixels = [pixel for pixel in range(0,50) if state[pixel] is not None]
+            # assume some live pixels else we would be getting changes
+            if live_pixels != []:
+                p = random.randint(0, len(live_pixels)-1)
+                state[p] = None
+
+            hues_live = [state[p].hue for p in range(0,50) if state[p] is not None]
+            if hues_live != []:
+                # then we have some colours
+                first_hue = hues_live[0]
+                other_hues = [h for h in hues_live if h != first_hue]
+                if other_hues == []:
+                    print("Game over - restarting")
+                    # one hue has won!
+                    # so it's game over
+                    # restart this game
+                    switch_to(modes["25"])
+
+        hues_sorted = sorted([state[n].hue for n in range(0,50) if state[n] is not None])
+
+        hues = [h for (h, _) in itertools.groupby(hues_sorted)]
+
+        if len(hues) > 1:
+          this_hue_n = random.randint(0, len(hues) - 1)
+
+          this_hue = hues[this_hue_n]
+          old_hue = this_hue
+          next_hue = hues[(this_hue_n + 1) % len(hues)]
+
+          diff = next_hue - this_hue
+
+          if diff > 0.5:
+              diff -= 1.0
+
+          if abs(diff) < 0.1:
+
+            if diff > 0:
+                new_hue = (this_hue - 0.001) % 1.0
+            else:
+                new_hue = (this_hue + 0.001) % 1.0
+
+
+            for n in range(0,50):
+                if state[n] and state[n].hue == old_hue:
+                    state[n].hue = new_hue
+
+        # expire pixels that haven't changed for a while
+        now = time.time()
+        for n in range(0,50):
+            if state[n]:
+                expire_time = state[n].born + 30
+                if expire_time < now:
+                    print("expire a pixel")
+                    state[n] = None
+
+        for pixel in range(0,50):
+            if state[pixel] is None:
+                pixels[pixel] = (0,0,0)
+            else:
+                pixels[pixel] = hsv_to_neo_rgb(state[pixel].hue)
+
+        pixels.show()
@@ -0,0 +1,203 @@
+"""Modes driven by frames from outside the driver: from an external
+program writing them to its stdout, or sent over the network. The
+formats they can be in are described in swirl/frameformat.py, and
+lighting control input, E1.31 and Art-Net, in swirl/dmx.py.
+"""
+
+import os
+import selectors
+import subprocess
+import threading
+
+import swirl.dmx as dmx
+import swirl.frameformat as frameformat
+import swirl.frameserver as frameserver
+from swirl.runtime import on_stop
+
+
+def mode89():
+    yield from pmode_cli("./swc-bash")
+
+def mode90():
+    yield from pmode_cli(["./hs/.cabal-sandbox/bin/swc-hs", "90"])
+
+def mode91():
+    yield from pmode_cli(["./hs/.cabal-sandbox/bin/swc-hs", "91"])
+
+def mode100():
+    yield from pmode_server(frameserver.FrameServer(port=4399,
+                                                    policy=os.environ.get("SWIRL_FRAME_POLICY", "latest"),
+                                                    idle=float(os.environ.get("SWIRL_FRAME_IDLE", "1"))))
+
+def mode125():
+    yield from pmode_server(dmx.DMXReceiver(universe=int(os.environ.get("SWIRL_DMX_UNIVERSE", "1")),
+                                            artnet_universe=int(os.environ.get("SWIRL_ARTNET_UNIVERSE", "0")),
+                                            channel=int(os.environ.get("SWIRL_DMX_CHANNEL", "1")),
+                                            delay=float(os.environ.get("SWIRL_DMX_DELAY", "0.03")),
+                                            timeout=float(os.environ.get("SWIRL_DMX_TIMEOUT", "2.5"))))
+
+
+class FrameReader:
+    """Reads frames from a program's stdout in a thread of its own.
+
+    The reader drains the pipe as fast as the program writes to it,
+    into one preallocated buffer, and keeps only the newest complete
+    frame. So a program that writes frames faster than they are shown
+    doesn't build up a backlog in the pipe: the frames in between are
+    dropped, and counted. A program that stalls doesn't hold up
+    anything but its own mode, which stop() ends straight away.
+    """
+
+    def __init__(self, stream, frame_size=150, buffer_size=1 << 17):
+        self.stream = stream
+        self.frame_size = frame_size
+        self.buf = bytearray(buffer_size)
+        self.view = memoryview(self.buf)
+        self.fill = 0
+        self.changed = threading.Condition()
+        self.latest = None
+        self.ended = False
+        self.error = None
+        self.frames = 0
+        self.dropped = 0
+        self.stopped = False
+        self.wake_w = None
+        self.thread = threading.Thread(target=self.run, name="frame reader", daemon=True)
+
+    def start(self):
+        """Start reading, unless stop() has been called already."""
+        with self.changed:
+            if self.stopped:
+                return
+            os.set_blocking(self.stream.fileno(), False)
+            (self.wake_r, self.wake_w) = os.pipe()
+            self.thread.start()
+
+    def stop(self):
+        """End the reader, and any wait in next_frame(), or stop it
+        from starting at all."""
+        with self.changed:
+            self.stopped = True
+            if self.wake_w is not None:
+                os.write(self.wake_w, b"x")
+            else:
+                # not started, or already ended
+                self.ended = True
+                self.changed.notify_all()
+
+    def next_frame(self):
+        """Wait for a frame newer than the last one, and return it, or
+        None once the reader has ended."""
+        with self.changed:
+            while self.latest is None and not self.ended:
+                self.changed.wait()
+            if self.latest is None and self.error is not None:
+                raise self.error
+            (frame, self.latest) = (self.latest, None)
+            return frame
+
+    def run(self):
+        try:
+            with selectors.DefaultSelector() as selector:
+                selector.register(self.stream, selectors.EVENT_READ)
+                selector.register(self.wake_r, selectors.EVENT_READ)
+                while True:
+                    for (key, _) in selector.select():
+                        if key.fileobj == self.wake_r:
+                            return
+                    n = self.stream.readinto(self.view[self.fill:])
+                    if n is None:
+                        continue
+                    if n == 0:
+                        return
+                    self.fill += n
+                    self.parse()
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.changed:
+                self.ended = True
+                os.close(self.wake_r)
+                os.close(self.wake_w)
+                self.wake_w = None
+                self.changed.notify_all()
+
+    def parse(self):
+        """Find the complete frames in the buffer, decode the newest
+        one, and keep whatever comes after it for next time."""
+        (complete, last, pos) = frameformat.scan(self.buf, 0, self.fill)
+
+        if last is not None:
+            frame = frameformat.decode(self.buf, last, self.frame_size)
+            with self.changed:
+                if self.latest is not None:
+                    # never shown
+                    self.dropped += 1
+                self.dropped += complete - 1
+                self.frames += complete
+                self.latest = frame
+                self.changed.notify_all()
+
+        rest = self.fill - pos
+        self.buf[0:rest] = self.buf[pos:self.fill]
+        self.fill = rest
+        if self.fill == len(self.buf):
+            raise ValueError("Frame longer than {} bytes".format(len(self.buf)))
+
+
+def pmode_cli(command):
+    """Run command, and show the frames it writes to its stdout.
+
+    Frames can be written in any of the formats in swirl/frameformat.py,
+    and mixed:
+
+    * a line of hex, 6 digits (rrggbb) per pixel, ending in a newline
+    * binary: the 4 bytes "SWRL", the length of the frame in bytes as a
+      2 byte big-endian number, then that many bytes of r, g, b. In
+      python, struct.pack(">4sH", b"SWRL", len(frame)) + frame
+    * an Open Pixel Control message on channel 0 or 1
+
+    Binary frames are the cheapest to write and to read, and a program
+    that writes frames as fast as it can should use them. Frames that
+    are written faster than they can be shown are dropped, and only the
+    newest one is shown.
+    """
+    # launch process
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, bufsize=0)
+    reader = FrameReader(process.stdout)
+
+    # the process may never write another frame, so stop waiting for
+    # one when the mode is switched
+    on_stop(reader.stop)
+
+    try:
+        reader.start()
+        while True:
+            frame = reader.next_frame()
+            if frame is None:
+                return
+            yield frame
+    finally:
+        reader.stop()
+        # kill process, and make sure of it if it ignores SIGTERM
+        process.terminate()
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        print("{}: {} frames read, {} dropped".format(command, reader.frames, reader.dropped))
+
+
+def pmode_server(server):
+    server.start()
+    on_stop(server.stop)
+    try:
+        while True:
+            frame = server.next_frame()
+            if frame is None:
+                return
+            yield frame
+    finally:
+        server.stop()
+        print("{}: {}".format(type(server).__name__, server.as_dict()))
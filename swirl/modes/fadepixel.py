@@ -0,0 +1,33 @@
+"""Pixels that fade out over time, shared by several modes."""
+
+from swirl.colour import hsv_to_neo_rgb_frame
+
+
+def render_hv_fadepixel(pixels, display_pixels):
+    """Renders a list of (hue, value) tuples in display_pixels
+    onto the pixels"""
+
+    hues = []
+    values = []
+    for pixel in range(0,50):
+        if display_pixels[pixel] is None:
+            hues.append(0)
+            values.append(0)
+        else:
+            (hue_dp, value_dp) = display_pixels[pixel]
+            hues.append(hue_dp)
+            values.append(value_dp)
+
+    pixels.copy_from(hsv_to_neo_rgb_frame(hues, v=values))
+    pixels.show()
+
+
+def fade_hv_fadepixel(display_pixels, amount):
+      for pixel in range(0,50):
+          if display_pixels[pixel] is not None:
+            (display_hue, value) = display_pixels[pixel]
+            new_value = value - amount
+            if new_value <= 0:
+              display_pixels[pixel] = None
+            else:
+              display_pixels[pixel] = (display_hue, new_value)
@@ -0,0 +1,295 @@
+"""Firefronts and suns."""
+
+import math
+import random
+import time
+from functools import partial
+from math import tau
+
+import swirl.randomwalk as randomwalk
+from swirl.colour import different_hue, gamma, max_pixel, scale
+from swirl.modes.fadepixel import fade_hv_fadepixel, render_hv_fadepixel
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import generate_pixel_pos, spiral
+
+
+def mode63():
+    pmode_firefront(hue_step = 0.01)
+
+def mode64():
+    pmode_firefront(hue_step = 0)
+
+def mode65():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode65_fire_scheme, hue))
+
+def mode65_fire_scheme(hue, x):
+    other_hue = (hue + 0.5) % 1.0
+    if x is None:
+        return (hue, 1)
+    else:
+        return (other_hue, 1)
+
+def mode66():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode66_fire_scheme, hue))
+
+def mode66_fire_scheme(hue, x):
+    other_hue = (hue + 0.5) % 1.0
+    if x is None:
+        return (other_hue, 1)
+    else:
+        (h, v) = x
+
+        return (h, v)
+
+
+def mode67():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode67_fire_scheme, hue))
+
+def mode67_fire_scheme(hue, x):
+    other_hue = (hue + 0.5) % 1.0
+    if x is None:
+        return (other_hue, 0.2)
+    else:
+        (h, v) = x
+
+        if v > 0.1:
+            return (hue, (v-0.1)*(1.0 / 0.9))
+        else:
+            return (other_hue, 0.2) 
+
+def mode68():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode68_fire_scheme, hue))
+
+def mode68_fire_scheme(hue, x):
+    if x is None:
+        return (0, 0)
+    else:
+        (h, v) = x
+        return (random.random(), v)
+
+def mode109():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode109_fire_scheme, hue))
+
+def mode109_fire_scheme(hue_base, x):
+    if x is None:
+        return (0, 0)
+    else:
+        (h, v) = x
+        if v > 0.5:
+            return (hue_base, 1.0)
+        else:
+            return ((hue_base + 0.5) % 1.0, 1.0)
+
+def mode110():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode110_fire_scheme, hue))
+
+def mode110_fire_scheme(hue_base, x):
+    if x is None:
+        return (0, 0)
+    else:
+        (h, v) = x
+        if v > 0.85:
+            return (hue_base, 1.0)
+        elif v > 0.5:
+            return (hue_base, 0.3)
+        else:
+            return (0, 0)
+
+def mode111():
+    hue = random.random()
+    pmode_firefront(hue_step = 0.01, colour_scheme = partial(mode111_fire_scheme, hue))
+
+def mode111_fire_scheme(hue_base, x):
+    if x is None:
+        return (0, 0)
+    else:
+        (h, v) = x
+        if v > 0.80:
+            return (hue_base, 1.0)
+        elif v > 0 and v < 0.2:
+            return ((hue_base + 0.5) % 1.0, 1.0)
+        else:
+            return (0, 0)
+
+
+
+
+
+def pmode_firefront(*, hue_step, colour_scheme = None):
+    pixels.auto_write = False
+    
+    neighbours = spiral.neighbours
+
+    hue = random.random()
+
+    display_pixels = [None for pixel in range(0,50)]
+
+    while running():
+
+        max_v = 0
+        for n in range(0,49):
+            if display_pixels[n] is not None:
+                (h,v) = display_pixels[n]
+                max_v = max(v, max_v)
+
+        if max_v < 0.75: 
+            hue = different_hue(hue)
+            start_pixel = random.randint(0, 49)
+            fire_pixels = [start_pixel]
+            display_pixels[start_pixel] = (hue, 1)
+  
+
+        for n in range(0, 6):
+
+          if colour_scheme is None:
+              schemed_display_pixels = display_pixels
+          else:
+              schemed_display_pixels = [colour_scheme(hv) for hv in display_pixels]
+
+          render_hv_fadepixel(pixels, schemed_display_pixels)
+          fade_hv_fadepixel(display_pixels, 0.03)
+          clock.sleep(0.01)
+
+        new_fire_pixels = []
+
+        for pixel in fire_pixels:
+          if display_pixels[pixel] is not None:
+            (h, v) = display_pixels[pixel]
+
+            if None in display_pixels:
+                least_d = 1.5
+
+                candidates = [(d, n) for (d, n) in neighbours.neighbours_within(pixel, least_d) if display_pixels[n] is None]
+
+                hue = (hue + hue_step) % 1.0
+                for (d,n) in candidates:
+                    if random.random() > 0.5:
+                        display_pixels[n] = (hue, 1)
+                        new_fire_pixels.append(n)
+
+        fire_pixels = new_fire_pixels
+
+def mode69():
+    pixels.auto_write = False
+
+    rw = randomwalk.randomwalk(low = 2, high = 8)
+
+    red1_mod = random.randint(2,5)
+    red1_speed = 2 + random.random() * 4
+
+    orange1_speed = 0.5 + random.random()
+
+    while running():
+
+        gf = next(rw)
+        white_centre = []
+        for pixel in range(0,50):
+            intensity = pixel / 50.0
+            # gf changes every frame, so calculate rather than make a new lookup table
+            v = scale(gamma(intensity, gamma_factor=gf))
+            white_centre.append( (v,v,v) )
+
+
+        red1 = []
+        for pixel in range(0,50):
+            if pixel % red1_mod == int(time.time() * red1_speed) % red1_mod:
+                red1.append( (128,0,0) )
+            else:
+                red1.append( (0,0,0) )
+ 
+        yellow1 = []
+        for pixel in range(0,50):
+            if random.random() > 0.90:
+                v = int(random.random() * 128)
+                yellow1.append( (v,v,0) )
+            else:
+                yellow1.append( (0,0,0) )
+  
+        orange1 = []
+        for pixel in range(0,50):
+            phase = float(pixel) / 50.0 * tau
+            phase += (time.time() * orange1_speed) % tau
+            v = 0.5 + 0.5 * math.sin(-phase)
+            orange1.append( ( int(v * 128), int(v * 48), 0 ) )
+                    
+        for pixel in range(0,50):
+            # pixels[pixel] = orange1[pixel]
+            pixels[pixel] = max_pixel(max_pixel(max_pixel(white_centre[pixel], red1[pixel]), yellow1[pixel]), orange1[pixel])
+
+        pixels.show()
+        clock.sleep(0.02)
+
+
+def mode70():
+    pixels.auto_write = False
+
+    pixel_pos = generate_pixel_pos()
+
+    # approx times for sunrise/sunset in early May
+    sunrise = 5.5
+    sunset = 20.43
+
+    while running():
+
+        t = time.time()
+        now = time.localtime(t)
+        hour = now.tm_hour
+        minute = now.tm_min
+        second = now.tm_sec
+
+        h_m = hour + (minute / 60.0) + (second / 60.0 / 60.0)
+        print("now h_m = {}".format(h_m))
+
+        if h_m < sunrise:
+            print("pre-dawn")
+            rgb = (0,0,0)
+            for pixel in range(0,50):
+                pixels[pixel]=rgb
+
+        elif h_m < (sunrise + 1.0): # rising
+            print("sun rising")
+            frac = h_m - sunrise
+            v = int(255 * frac)
+            rgb = (v, v, v)
+            for pixel in range(0,50):
+                pixels[pixel]=rgb
+
+        elif h_m < sunset:
+            print("daytime")
+            rgb = (255, 255, 255)
+            for pixel in range(0,50):
+                pixels[pixel]=rgb
+
+        elif h_m < (sunset + 1.0): # setting
+            print("sun setting")
+            frac = h_m - sunset
+            frac = 1.0 - frac
+            for pixel in range(0,50):
+                (x, y) = pixel_pos[pixel]
+                y_frac = (5 * (frac * 2.0 - 1.0) + y + 5.0) / 10.0
+                y_frac = min(y_frac, 1)
+                y_frac = max(y_frac, 0)
+                p_frac = frac * y_frac
+                g_boost = frac
+                b_boost = frac * frac
+                r = int(255.0 * p_frac)
+                g = int(255.0 * p_frac * g_boost)
+                b = int(255.0 * p_frac * b_boost)
+                rgb = (r, g, b)
+                print("rgb = {}".format(rgb)) 
+                pixels[pixel]=rgb
+
+        else: # post sunset
+            print("night-time")
+            rgb = (0,0,0)
+            for pixel in range(0,50):
+                pixels[pixel]=rgb
+
+        pixels.show()
+        clock.sleep(1) 
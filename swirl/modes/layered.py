@@ -0,0 +1,11 @@
+"""Modes made by layering other modes on top of each other."""
+
+from swirl.layers import Layer, composite
+
+
+def mode123():
+    yield from composite([Layer("31"), Layer("57", blend="masked")])
+
+
+def mode124():
+    yield from composite([Layer("45", opacity=0.6), Layer("57", blend="masked")])
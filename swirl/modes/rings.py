@@ -0,0 +1,281 @@
+"""Patterns on individual rings of the spiral."""
+
+import math
+import random
+import time
+from math import tau
+
+from swirl.colour import hsv_to_neo_rgb, hsv_to_neo_rgb_frame
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import bottoms
+
+
+def mode17():
+  pixels.auto_write = False
+
+  start_hue = random.random()
+  rings = [start_hue for b in bottoms]
+
+  while running():
+
+    for ring in range(len(rings)-1, 1, -1):
+      rings[ring] = rings[ring-1]
+
+    rings[1] += random.random() * 0.15
+
+    for ring in range(1, len(rings)-1):
+      for pixel in range(bottoms[ring], bottoms[ring+1] - 1, -1):
+        pixels[pixel] = hsv_to_neo_rgb(rings[ring])
+
+    pixels.show()
+
+    clock.sleep(0.1)
+
+def mode26():
+  pixels.auto_write = False
+
+  start_hue = random.random()
+  rings = [None for b in bottoms]
+
+  while running():
+
+    for ring in range(len(rings)-1, 1, -1):
+      rings[ring] = rings[ring-1]
+
+    if random.random() > 0.66:
+        rings[1] = random.random()
+    else:
+        rings[1] = None
+
+    for ring in range(1, len(rings)-1):
+      for pixel in range(bottoms[ring], bottoms[ring+1] - 1, -1):
+        if rings[ring]:
+            pixels[pixel] = hsv_to_neo_rgb(rings[ring])
+        else:
+            pixels[pixel] = (0,0,0)
+
+    pixels.show()
+
+    clock.sleep(0.1)
+
+
+def mode116():
+ init_auto_and_blank()
+
+ black = (0,0,0)
+ red = (255,0,0)
+
+ pixel_ring = range(bottoms[-1],bottoms[-2])
+
+ while running():
+  for p in pixel_ring:
+    pixels[p] = black
+  pixels.show()
+  clock.sleep(0.05)
+  for p in pixel_ring:
+    pixels[p] = red
+  pixels.show()
+  clock.sleep(0.05)
+
+def randintnot(x,y,n):
+  """randint, but not n - to ensure a change"""
+  gen = True
+
+  while gen:
+    nx = random.randint(x,y)
+    if nx != n:
+      gen = False
+
+  return nx
+
+
+def init_auto_and_blank() -> None:
+  pixels.auto_write = False
+  pixels.fill( (0,0,0) )
+
+def mode117():
+ init_auto_and_blank()
+
+ pixel_ring = range(bottoms[-1],bottoms[-2])
+ f1 = 4
+ p1 = 0
+ hue = random.random()
+
+ while running():
+  for p in pixel_ring:
+
+    v = 0.5 + 0.5 * math.sin(p1 + f1 * p/22.0 * 3.1415 * 2)
+    c = hsv_to_neo_rgb(hue, v=v)
+
+    pixels[p] = c
+  pixels.show()
+
+  p1 = (p1 + 0.2) % tau
+
+  ch = random.randint(0,10)
+  if ch == 0:
+    f1 = randintnot(1,4, f1)
+  else:
+    pass # nothing
+
+  clock.sleep(0.05)
+
+def mode118():
+ init_auto_and_blank()
+
+ pixel_ring = range(bottoms[-1],bottoms[-2])
+ f1 = 4
+ p1 = 0
+ hue = random.random()
+
+ while running():
+  for p in pixel_ring:
+
+    v = 0.5 + 0.5 * math.sin(p1 + f1 * p/22.0 * 3.1415 * 2)
+    c = hsv_to_neo_rgb(hue, v=v)
+
+    pixels[p] = c
+  pixels.show()
+
+
+  ch = random.randint(0,2)
+  if ch == 0:
+    f1 = randintnot(1,5, f1)
+  elif ch == 1:
+    p1 = random.random() * math.tau
+  elif ch == 2:
+    hue = random.random()
+  else:
+    pass # nothing
+
+  clock.sleep(0.05)
+
+def mode119():
+ init_auto_and_blank()
+
+ pixel_ring = range(bottoms[-1],bottoms[-2])
+ pixel_ring2 = range(bottoms[-3],bottoms[-4])
+ f1 = 4
+ p1 = 0
+ hue = random.random()
+
+ while running(): 
+  for p in pixel_ring:
+
+    v = 0.5 + 0.5 * math.sin(p1 + f1 * p/22.0 * 3.1415 * 2)
+    c = hsv_to_neo_rgb(hue, v=v)
+
+    pixels[p] = c
+
+  for p in pixel_ring2:
+
+    offset = p - bottoms[-3]
+    v = 0.5 + 0.5 * math.sin(p1 + f1 * offset/(len(pixel_ring2)) * 3.1415 * 2)
+    c = hsv_to_neo_rgb(hue, v=v)
+
+    pixels[p] = c
+ 
+  pixels.show()
+
+
+  ch = random.randint(0,2)
+  if ch == 0:
+    f1 = randintnot(1,5, f1)
+  elif ch == 1:
+    p1 = random.random() * math.tau
+  elif ch == 2:
+    hue = random.random()
+  else:
+    pass # nothing
+
+  clock.sleep(0.05)
+
+
+def mode120():
+ init_auto_and_blank()
+
+ pixel_ring = range(bottoms[-1],bottoms[-2])
+ pixel_ring2 = range(bottoms[-4],bottoms[-5])
+ f1 = 4
+ p1 = 0
+ f2 = 3
+ p2 = 0
+ hue = random.random()
+ hue2 = random.random()
+
+ while running():
+  for p in pixel_ring:
+
+    v = 0.5 + 0.5 * math.sin(p1 + f1 * p/22.0 * 3.1415 * 2)
+    c = hsv_to_neo_rgb(hue, v=v)
+
+    pixels[p] = c
+
+  for p in pixel_ring2:
+
+    c = hsv_to_neo_rgb((hue + 0.5)%1.0)
+
+    pixels[p] = c
+
+  pixels.show()
+
+  p2 = (p2 + 0.1) % tau
+
+  ch = random.randint(0,2)
+  if ch == 0:
+    f1 = randintnot(1,5, f1)
+  elif ch == 1:
+    p1 = random.random() * math.tau
+  elif ch == 2:
+    hue = random.random()
+  else:
+    pass # nothing
+
+  clock.sleep(0.05)
+
+def pmode_tworings(hue1, hue2):
+ init_auto_and_blank()
+
+ pixel_ring1 = range(bottoms[-1],bottoms[-2])
+ f1 = random.randint(1,5)
+
+ pixel_ring2 = range(bottoms[-2],bottoms[-3])
+ f2 = randintnot(1,3,f1)
+
+ start_t = time.time()
+
+ while running():
+
+  now_t = time.time()
+  delta_t = now_t - start_t
+
+  # the two phases move at 2 radians per second
+  # in opposite directions
+
+  def render_ring(direction, pixel_ring, hue, freq):
+
+    phase = (direction * delta_t * 2) % tau
+    values = []
+    for p in pixel_ring:
+      offset = p - pixel_ring[-1]
+
+      values.append(0.5 + 0.5 * math.sin(phase + freq * offset/len(pixel_ring) * tau))
+
+    pixels.copy_from(hsv_to_neo_rgb_frame([hue] * len(pixel_ring), v=values), start=pixel_ring[0])
+
+  render_ring(1, pixel_ring1, hue1, f1)
+  render_ring(-1, pixel_ring2, hue2, f2)
+
+  pixels.show()
+
+  clock.sleep(0.05)
+
+
+def mode121():
+ hue = random.random()
+ pmode_tworings(hue, hue)
+
+def mode122():
+ hue = random.random()
+ hue2 = (hue + 0.5) % 1.0
+ pmode_tworings(hue, hue2)
@@ -0,0 +1,281 @@
+"""Solid colours, and the modes for checking and controlling the spiral."""
+
+import random
+from functools import partial
+
+import swirl.framebuffer as framebuffer
+from swirl.colour import different_hue, gamma_scale, hsv_to_neo_rgb
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import pixel_to_layer, bottoms
+
+
+def mode3():
+    yield from pmode_solid( (255, 0, 32) )
+
+
+def mode6():
+    yield from pmode_solid( (0, 0, 0) )
+
+def mode95():
+    yield from pmode_solid( (1, 0, 0) )
+
+def mode62():
+    yield from pmode_solid( hsv_to_neo_rgb(random.random()) )
+
+def pmode_solid(rgb):
+    frame = framebuffer.Frame()
+    frame.fill( rgb )
+    while True:
+        yield frame
+
+
+def mode5():
+    # leave whatever was last shown
+    while True:
+        yield None
+
+
+def mode7():
+    frame = framebuffer.Frame()
+
+    angle = random.random()
+
+    for pixel in range(0,50):
+      (b, frac) = pixel_to_layer(pixel)
+      frame[pixel] = hsv_to_neo_rgb((frac + angle) % 1.0)
+      
+    while True:
+      yield frame
+
+
+def mode13():
+  pixels.auto_write = False
+
+  toggle = True
+  while running():
+
+    if toggle:
+      pixels.fill( (0,0,32) )
+    else:
+      pixels.fill( (0,0,0) )
+
+    toggle = not toggle
+
+    for b in range(1,len(bottoms)):
+      p = bottoms[b]
+      pixels[p] = (255,0,0)
+
+    for b in range(1, len(bottoms)-1):
+      diff = bottoms[b+1] - bottoms[b]
+      if diff % 2 == 0:  # even number
+        p = bottoms[b] + diff/2
+        pixels[int(p)] = (0,255,0)
+      else:
+        p = bottoms[b] + diff/2
+        pixels[int(p)] = (0,255,0)
+        pixels[int(p)+1] = (0,255,0)
+    
+    pixels.show()
+
+    clock.sleep(0.3)
+
+
+
+
+def mode37():
+    frame = framebuffer.Frame()
+
+    for pixel in range(0,50):
+
+        intensity = 0.25 + 0.75 * pixel / 50.0
+
+        v = gamma_scale(intensity, gamma_factor=4)
+
+        frame[pixel] = (v,v,v) 
+
+    while True:
+        yield frame
+
+
+def numbered_transition(r, last_col, new_col):
+    print(f"in numbered transition {r}")
+
+    if r == 0:
+      pixels.fill(new_col)
+      pixels.show()
+      clock.sleep(0.5)
+    elif r == 1:
+      for p in range(0,50):
+        pixels[p]= (0,0,0)
+        pixels.show()
+        clock.sleep(0.5 / 2.0 / 50.0)
+      for p in range(0,50):
+        pixels[p]= new_col
+        pixels.show()
+        clock.sleep(0.5 / 2.0 / 50.0)
+    elif r == 2:
+      for p in range(0,50):
+        pixels[p]= new_col
+        pixels.show()
+        clock.sleep(0.5 / 50.0)
+    elif r == 3:
+      for p in range(49,-1,-1):
+        pixels[p]= new_col
+        pixels.show()
+        clock.sleep(0.5 / 50.0)
+    elif r == 4:
+      ps = list(range(0,50))
+      while len(ps) > 0:
+        ix = random.randint(0, len(ps) - 1)
+        p = ps[ix]
+        pixels[p] = new_col
+        pixels.show()
+        ps = [x for x in ps if x != p]
+        clock.sleep(0.5 / 50.0) 
+    elif r == 5:
+      ps = list(range(0,5))
+      while len(ps) > 0:
+        ix = random.randint(0, len(ps) - 1)
+        p = ps[ix]
+        for pix in range(p*10, (p+1)*10):
+          pixels[pix] = new_col
+        pixels.show()
+        ps = [x for x in ps if x != p]
+        clock.sleep(0.5 / 5.0) 
+    elif r == 6:
+      ps = list(range(0,5))
+      q = None
+      while len(ps) > 0:
+        ix = random.randint(0, len(ps) - 1)
+        p = ps[ix]
+        for pix in range(p*10, (p+1)*10):
+          pixels[pix] = (0,0,0)
+        if q is not None:
+          for pix in range(q*10, (q+1)*10):
+            pixels[pix] = new_col
+        pixels.show()
+        ps = [x for x in ps if x != p]
+        q = p
+        clock.sleep(0.5 / 6.0) 
+      if q is not None:
+        for pix in range(q*10, (q+1)*10):
+          pixels[pix] = new_col
+      pixels.show()
+      clock.sleep(0.5 / 6.0) 
+    elif r == 7:
+      ps = list(range(0,5))
+      q = None
+      while len(ps) > 0:
+        ix = random.randint(0, len(ps) - 1)
+        p = ps[ix]
+        for pix in range(p*10, (p+1)*10):
+          pixels[pix] = (255,255,255)
+        if q is not None:
+          for pix in range(q*10, (q+1)*10):
+            pixels[pix] = new_col
+        pixels.show()
+        ps = [x for x in ps if x != p]
+        q = p
+        clock.sleep(0.5 / 6.0) 
+      if q is not None:
+        for pix in range(q*10, (q+1)*10):
+          pixels[pix] = new_col
+      pixels.show()
+      clock.sleep(0.5 / 6.0) 
+
+    elif r == 8:
+      n = random.randint(4,10)
+      for o in range(0,n):
+        for p in range(0,50):
+          if p % (n-1) < o: 
+            pixels[p] = new_col
+        pixels.show()
+        clock.sleep(0.5 / n)
+    elif r == 9:
+      for p in range(0,50):
+        pixels[p]= (0,0,0)
+        pixels.show()
+        clock.sleep(0.5 / 2.0 / 50.0)
+      for p in range(49,-1,-1):
+        pixels[p]= new_col
+        pixels.show()
+        clock.sleep(0.5 / 2.0 / 50.0)
+    elif r == 10:
+      pixels.fill(new_col)
+      pixels.show()
+      clock.sleep(0.05)
+      pixels.fill(last_col)
+      pixels.show()
+      clock.sleep(0.1)
+      pixels.fill(new_col)
+      pixels.show()
+      clock.sleep(0.05)
+      pixels.fill(last_col)
+      pixels.show()
+      clock.sleep(0.1)
+      pixels.fill(new_col)
+      pixels.show()
+      clock.sleep(0.1)
+      pixels.fill(last_col)
+      pixels.show()
+      clock.sleep(0.05)
+      pixels.fill(new_col)
+      pixels.show()
+      clock.sleep(0.025)
+      pixels.fill(last_col)
+      pixels.show()
+      clock.sleep(0.025)
+      pixels.fill(new_col)
+      pixels.show()
+    elif r == 11:
+      actions = [ (n, "off") for n in range(0,50) ]
+
+      while actions != []:
+        ix = random.randint(0, len(actions) - 1)
+        (n, act) = actions[ix]
+        del actions[ix] 
+
+        if act == "off":
+          pixels[n] = (0,0,0)
+          actions.append( (n, "on") )
+        elif act == "on":
+          pixels[n] = new_col
+
+        pixels.show()
+        clock.sleep(0.5 / 50 / 2)
+
+
+def mode103():
+  """Solid fills, with random transitions between. Each transition should last 1 second."""
+
+  pixels.auto_write = False
+
+  last_col = (0,0,0)
+  last_hue = 0
+  pixels.fill(last_col)
+
+
+  while running():
+    print("mode103 loop")
+    new_hue = different_hue(last_hue)
+    new_col = hsv_to_neo_rgb(new_hue)
+
+    transition = random.choice([partial(numbered_transition, 0),
+                                partial(numbered_transition, 1),
+                                partial(numbered_transition, 2),
+                                partial(numbered_transition, 3),
+                                partial(numbered_transition, 4),
+                                partial(numbered_transition, 5),
+                                partial(numbered_transition, 6),
+                                partial(numbered_transition, 7),
+                                partial(numbered_transition, 8),
+                                partial(numbered_transition, 9),
+                                partial(numbered_transition,10),
+                                partial(numbered_transition,11)
+                               ])
+
+    transition(last_col, new_col)
+ 
+    last_col = new_col
+    last_hue = new_hue
+    clock.sleep(0.25)
@@ -0,0 +1,601 @@
+"""Sine waves, drifts and scrolling colour patterns."""
+
+import math
+import random
+from math import tau
+
+import swirl.framebuffer as framebuffer
+import swirl.randomwalk as randomwalk
+from swirl.colour import different_hue, gamma_scale, hsv_to_neo_rgb
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import generate_pixel_pos, pixel_to_layer, bottoms, spiral
+
+
+def mode73():
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    phases = [0.0 for n in range(0,50)]
+
+    while running():
+
+      for pixel in range(0,50):
+
+        x = math.sin(phases[pixel])
+
+        x = (x / 2.0) + 0.5
+
+        phases[pixel] += 0.04 + (float(pixel) / 50.0 * 0.02)
+        
+        pixels[pixel] = hsv_to_neo_rgb(0, s=0, v=x)
+
+      pixels.show()
+
+      clock.sleep(0.01)
+
+
+def mode74():
+    frame = framebuffer.Frame()
+
+    # each pixel's phase steps by 0.04 + pixel * 0.0004, which is
+    # (100 + pixel) / 2500, so they all come back round together after
+    # 2500 frames. Counting in 2500ths keeps that exact, where adding
+    # up floats would drift.
+    steps = [100 + pixel for pixel in range(0,50)]
+    phases = [0 for n in range(0,50)]
+
+    while True:
+
+      for pixel in range(0,50):
+
+        p = phases[pixel] / 2500.0
+
+        if p > 0.85:
+          rgb = (0, 255, 0)
+        elif p > 0.7: 
+          rgb = (255, 0, 0)
+        elif p > 0.35: 
+          rgb = (1,1,1)
+        else:
+          rgb = (0,0,0)
+
+
+        phases[pixel] = (phases[pixel] + steps[pixel]) % 2500
+        
+        frame[pixel] = rgb
+
+      yield frame
+
+
+def mode16():
+    pmode_iterator_spiral(iterator=generate_mode16(), delay=0.05)
+
+
+def generate_mode16():
+    hue = random.random()
+
+    while True:
+        hue = (hue + random.random() * 0.1 - 0.05) % 1.0
+        yield hsv_to_neo_rgb(hue)
+
+
+def pmode_iterator_spiral(*, iterator, delay):
+  pixels.auto_write = False
+
+  ps = [(0,0,0) for n in range(0,50)]
+
+  while running():
+    for pixel in range(49,0,-1):
+      ps[pixel] = ps[pixel-1]
+
+    ps[0] = next(iterator)
+
+    for pixel in range(0,50):
+      pixels[pixel] = ps[pixel]
+
+    pixels.show()
+    clock.sleep(delay)
+
+
+def mode35():
+    pmode_iterator_spiral(iterator=generate_mode35(), delay=0.01)
+
+
+def generate_mode35():
+    hue = random.random()
+
+    rw = randomwalk.randomwalk(low = 0, high = 1.0)
+
+    while True:
+
+        v = next(rw)
+
+        if v == 0:
+            hue = random.random()
+
+        yield hsv_to_neo_rgb(hue, v=v)
+
+
+
+def mode84():
+    pixels.auto_write = False
+
+    hue = random.random()
+
+    while running():
+
+      pixels.fill( (0,0,0) )
+
+
+      (r, g, b) = hsv_to_neo_rgb(hue)
+
+      for p in range(0, 50):
+
+
+        k = p % 5
+        if k == 0:
+          pixels[p] = (r, 0, 0)
+        elif k == 1:
+          pixels[p] = (0, g, 0)
+        elif k == 2:
+          pixels[p] = (0, 0, b)
+        else:
+          pixels[p] = (r, g, b)
+
+      pixels.show()
+      hue = (hue + 0.005)
+      clock.sleep(0.05)
+
+
+def mode85():
+    pixels.auto_write = False
+
+    hue = random.random()
+
+    while running():
+
+      error_r = 0
+      error_g = 0
+      error_b = 0
+
+      pixels.fill( (0,0,0) )
+
+
+      (r, g, b) = hsv_to_neo_rgb(hue, v=0.5)
+
+      for p in range(0, 50):
+
+          adjusted_r = r + error_r
+          adjusted_g = g + error_g
+          adjusted_b = b + error_b
+ 
+          if adjusted_r <= 0 and adjusted_g <= 0 and adjusted_b <= 0:
+              pixels[p] = (int(r/6), int(g/6), int(b/6))
+              error_r += r
+              error_g += g
+              error_b += b
+          elif adjusted_r >= adjusted_g and adjusted_r >= adjusted_b:
+              pixels[p] = (255, 0, 0)
+              error_r -= 255
+              error_g += g
+              error_b += b
+          elif adjusted_g >= adjusted_r and adjusted_g >= adjusted_b:
+              pixels[p] = (0, 255, 0)
+              error_g -= 255
+              error_r += r
+              error_b += b
+          elif adjusted_b >= adjusted_r and adjusted_b >= adjusted_g:
+              pixels[p] = (0, 0, 255)
+              error_b -= 255
+              error_r += r
+              error_g += g
+          else:
+              raise RuntimeError("Failed to pick a maximum primary colour")
+
+      pixels.show()
+      hue = (hue + 0.001)
+      clock.sleep(0.01)
+        # clock.sleep(0.001)
+
+
+def mode28():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    hue = random.random()
+
+    rw = randomwalk.randomwalk(low=-4, high=4, spread = 0.5)
+
+    rot = random.random()
+    rot_speed = 0.001 * random.random()
+
+    while running():
+        h = next(rw)
+        pixel_pos = generate_pixel_pos(rot=rot)
+
+        for p in range(0,50):
+            (x, y) = pixel_pos[p]
+
+            d = min(1, abs(y - h) / 5.0)
+
+            pixels[p] = hsv_to_neo_rgb(hue, v = d)
+
+   
+        pixels.show()
+
+        rot = (rot + rot_speed) % 1.0
+
+
+def mode30():
+    """This could be merged with mode28 because only hue
+    choice differs"""
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    hue1 = random.random()
+    hue2 = different_hue(hue1)
+
+    rw = randomwalk.randomwalk(low = -4, high = 4, spread = 0.5)
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+        h = next(rw)
+
+        for p in range(0,50):
+            (x, y) = pixel_pos[p]
+
+            d = min(1, abs(y - h) / 5.0)
+
+            if y > h:
+                hue = hue1
+            else:
+                hue = hue2
+
+            pixels[p] = hsv_to_neo_rgb(hue, v = d)
+
+   
+        pixels.show()
+
+        if h == 4:  # hue1 is invisible, pick new
+            hue1 = different_hue(hue2)
+        if h == -4: # hue2 is invisible, pick new
+            hue2 = different_hue(hue1)
+
+
+def mode96():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    ro = random.random()
+    bo = random.random()
+    go = random.random()
+
+    while running():
+        for p in range(0,50):
+            theta = p/50.0 * tau
+            r = int(128 + 127 * math.sin(ro + theta * 2.0))
+            g = int(128 + 127 * math.sin(bo + theta))
+            b = int(128 + 127 * math.sin(go + theta * -1.0))
+            pixels[p] = (r, g, b) 
+        ro = (ro + 0.23) % tau
+        go = (go + 0.215) % tau
+        bo = (bo + 0.2) % tau
+        pixels.show()
+        clock.sleep(0.02)
+
+
+def mode97():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    ro = random.random()
+    bo = random.random()
+    go = random.random()
+
+    active = [True, False, True, True, True, False, False,False, False, False, False, True, True, False, False, False]
+    active_count = 0
+
+
+    while running():
+        for p in range(0,50):
+            theta = p/50.0 * tau
+            r = int(128 + 127 * math.sin(ro + theta * 2.0))
+            g = int(128 + 127 * math.sin(bo + theta))
+            b = int(128 + 127 * math.sin(go + theta * -1.0))
+            if active[p % len(active)]:
+                pixels[p] = (r, g, b) 
+            else:
+                pixels[p] = (0, 0, 0)
+        ro = (ro + 0.23) % tau
+        go = (go + 0.215) % tau
+        bo = (bo + 0.2) % tau
+
+        if active_count > 2:
+          active_pop = active.pop()
+          active = [active_pop] + active
+          active_count = 0
+
+        active_count += 1 
+
+        pixels.show()
+        
+        clock.sleep(0.02)
+
+def mode98():
+    pixels.auto_write = False
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    ro = random.random()
+    bo = random.random()
+    go = random.random()
+    vo = random.random()
+
+    while running():
+        for p in range(0,50):
+            theta = p/50.0 * tau
+            v = math.sin(vo + theta * -2.7) * 0.5 + 0.5
+            r = int(v * (128 + 127 * math.sin(ro + theta * 2.0)))
+            g = int(v * (128 + 127 * math.sin(bo + theta)))
+            b = int(v * (128 + 127 * math.sin(go + theta * -1.0)))
+            pixels[p] = (r, g, b) 
+        vo = (vo + 0.03) % tau
+        ro = (ro + 0.23) % tau
+        go = (go + 0.215) % tau
+        bo = (bo + 0.2) % tau
+
+        pixels.show()
+        
+        clock.sleep(0.02)
+
+
+
+def mode32():
+    frame = framebuffer.Frame()
+
+    ro = random.random()
+    bo = random.random()
+    go = random.random()
+
+    while True:
+        for p in range(0,50):
+            theta = p/50.0 * tau
+            r = int(128 + 127 * math.sin(ro + theta))
+            g = int(128 + 127 * math.sin(bo + theta * 1.1))
+            b = int(128 + 127 * math.sin(go + theta * (-1.06)))
+            frame[p] = (r, g, b) 
+            ro = (ro + 0.0013) % tau
+            go = (go + 0.0011) % tau
+            bo = (bo + 0.0009) % tau
+        yield frame
+
+
+def mode33():
+  
+  pixels.auto_write = False
+  pixels.fill( (0,0,0) )
+  pixels.show()
+
+
+  while running():
+
+    r_ang = random.random()
+    g_ang = random.random()
+    b_ang = random.random()
+
+    r_width = random.random() * 0.15 + 0.05
+    g_width = random.random() * 0.15 + 0.05
+    b_width = random.random() * 0.15 + 0.05
+
+    for pixel in range(0,50):
+      frac = spiral.frac[pixel]
+      frac_red = (frac + r_ang) % 1
+      frac_green = (frac + g_ang) % 1
+      frac_blue = (frac + b_ang) % 1
+
+      def f(pos, width):
+        if pos > width and pos < (1-width):
+            intensity = 0
+        elif pos >= (1-width):
+            pos = 1 - pos
+            intensity = (width - pos) * (1/width)
+        else:
+            intensity = (width - pos) * (1/width)
+        return int(intensity * 255)
+
+      pixels[pixel] = ( f(frac_red, r_width), f(frac_green, g_width), f(frac_blue, b_width) )
+    pixels.show()
+    clock.sleep(0.1)
+ 
+
+def mode42():
+    pixels.auto_write = False
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+        hue = random.random()
+        h = random.random() * 8.0 - 4.0
+
+        for p in range(0,50):
+            (x, y) = pixel_pos[p]
+
+            d = min(1, abs(y - h) / 2.0)
+
+            pixels[p] = hsv_to_neo_rgb(hue, v = (1-d))
+        pixels.show()
+
+        clock.sleep(0.05)
+
+
+def mode45():
+    pmode_rgb_swirl(delay=0.02, k_step=0.002, active_blue=True)
+
+def mode46():
+    pmode_rgb_swirl(delay=0, k_step=0.02, active_blue=False)
+
+def pmode_rgb_swirl(*, delay, k_step, active_blue):
+    pixels.auto_write = False
+
+    k = 0
+
+    while running():
+
+        for p in range(0,50):
+
+            b = spiral.layer[p]
+            frac = spiral.frac[p]
+
+            red = gamma_scale(0.5 + 0.5 * math.sin(k*1.1 + tau * float(b) / float(len(bottoms)-1)))
+
+            b_prop = float(b) / float(len(bottoms) - 1)
+            v1 = b_prop * (0.5 + 0.5 * math.sin(k*1.2 + tau * frac))
+            v2 = 1 - b_prop
+            fade_frac = 0.5 + 0.5 * math.sin(k/5.0)
+            val = fade_frac * v1 + (1-fade_frac) * v2
+            green = gamma_scale( val )
+
+            if active_blue:
+                (x, y) = (spiral.x[p], spiral.y[p])
+                blue = gamma_scale(0.5 + 0.25 * math.sin(k*1.4 + 1.5 * tau * (y + 6.0) / 12.0) + 0.25 * math.sin(k*1.3 + 1.5 * tau * (x + 6.0) / 12.0))
+            else:
+                blue = 0
+
+            pixels[p] = (red, green, blue)
+
+        k = k + k_step
+        pixels.show()
+        clock.sleep(delay)
+
+
+def mode47():
+    pmode_vertical_prism(k_step = 0.1)
+
+
+def mode55():
+    pmode_vertical_prism(k_step = 0.003)
+
+
+def pmode_vertical_prism(*, k_step):
+    pixels.auto_write = False
+
+    k = random.random() * tau
+    delay = 0
+
+    k_scale_1 = 1 + random.random()
+    k_scale_2 = 1 + random.random()
+    k_scale_3 = 1 + random.random()
+
+    pixel_pos = generate_pixel_pos()
+
+    while running():
+
+        for p in range(0,50):
+
+            (b, frac) = pixel_to_layer(p)
+            (x, y) = pixel_pos[p]
+
+            red = gamma_scale(0.5 + 0.5 * math.sin(k + x))
+            green = gamma_scale(0.5 + 0.5 * math.sin(k*k_scale_1 + x))
+            blue = gamma_scale(0.5 + 0.5 * math.sin(k*k_scale_2 + x))
+
+            pixels[p] = (red, green, blue)
+
+        k = k + k_step
+        pixels.show()
+        clock.sleep(delay)
+
+
+def mode58():
+    pixels.auto_write = False
+
+    k = float(random.randint(0,100)) # 100 is just some arbitrary max... would be better to work out where the three phase contacts co-incide again and use that range (and mod it there for better precision in the loop too)
+    k_step = 0.02
+    delay = 0.02
+
+    pixel_pos = generate_pixel_pos()
+
+    def f(x):
+      x = x / 5.0
+      x = x % 1.5
+
+      if x>1.0:
+          return 0
+      elif x>0.5:  # x = 0.5 .. 1.0
+          return (0.5 - (x - 0.5)) * 2
+      else: # x = 0 .. 0.5
+          return x*2
+
+    ang1 = random.random() * tau
+    ang2 = (ang1 + tau / 3.0) % tau
+
+    while running():
+
+        for p in range(0,50):
+
+            (b, frac) = pixel_to_layer(p)
+            (x, y) = pixel_pos[p]
+
+            red = (( f(k * 0.6123 + x * math.sin(ang1) + y*math.cos(ang1) )))
+            green = math.cos(k * 1.1 + tau * math.sqrt( x**2 + (y - 5.0) ** 2) / 25.0) * 0.5 + 0.5
+            blue = math.sin(k * 1.54 + p/50.0 * tau) * 0.5 + 0.5
+
+            level = ((red + green + blue) / 3)
+            if level < 0.25:
+              v = 1.0 - (0.25 - level) * 3
+              s = 1.0
+            else:
+              v = 1.0
+              s = 1.0 - (level - 0.25) / 0.75
+
+            pixels[p] = hsv_to_neo_rgb(0.66, s=s, v=v)
+
+        k = k + k_step
+        pixels.show()
+        clock.sleep(delay)
+
+
+def mode48():
+    pixels.auto_write = False
+
+    k = float(random.randint(0,100)) # 100 is just some arbitrary max... would be better to work out where the three phase contacts co-incide again and use that range (and mod it there for better precision in the loop too)
+    k_step = 0.5
+    delay = 0.02
+
+    def f(x):
+      x = x / 5.0
+      x = x % 4.0
+
+      if x>1.0:
+          return 0
+      elif x>0.5:  # x = 0.5 .. 1.0
+          return 0.5 - (x - 0.5)
+      else: # x = 0 .. 0.5
+          return x
+
+    ang1 = random.random() * tau
+    ang2 = (ang1 + tau / 3.0) % tau
+    ang3 = (ang2 + tau / 3.0) % tau
+
+    while running():
+
+        for p in range(0,50):
+
+            (x, y) = (spiral.x[p], spiral.y[p])
+
+            red = gamma_scale( f(k * 1.03 + x * math.sin(ang1) + y*math.cos(ang1) ))
+            green = gamma_scale( f(k * 1.07 + x * math.sin(ang2) + y * math.cos(ang2)))
+            blue = gamma_scale( f(k * 1.11 + x * math.sin(ang3) + y * math.cos(ang3)))
+
+            pixels[p] = (red, green, blue)
+
+        k = k + k_step
+        pixels.show()
+        clock.sleep(delay)
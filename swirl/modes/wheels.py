@@ -0,0 +1,915 @@
+"""Colour wheels, searchlights, windmills and other things that go round."""
+
+import colorsys
+import random
+import time
+
+import swirl.randomwalk as randomwalk
+from swirl.colour import gamma_scale, hsv_to_neo_rgb, hsv_to_neo_rgb_frame
+from swirl.runtime import clock, pixels, running
+from swirl.topologies import generate_pixel_pos, pixel_to_layer, bottoms, spiral
+
+
+def mode8():
+  pixels.auto_write = False
+
+  rot_hue = 0
+  rot_pos = 0
+
+  while running():
+
+    hues = []
+    intensities = []
+
+    for frac in spiral.frac:
+      frac_hue = (frac + rot_hue) % 1
+      frac_pos = (frac + rot_pos) % 1
+
+      width = 0.15
+
+      if frac_pos > width and frac_pos < (1-width):
+          intensity = 0
+      elif frac_pos >= (1-width):
+          frac_pos = 1 - frac_pos
+          intensity = (width - frac_pos) * (1/width)
+      else:
+          intensity = (width - frac_pos) * (1/width)
+
+      hues.append(frac_hue)
+      intensities.append(intensity)
+
+    pixels.copy_from(hsv_to_neo_rgb_frame(hues, v=intensities))
+    pixels.show()
+
+    rot_hue = rot_hue + (1.0/600.0) % 1
+    rot_pos = rot_pos + (1.0/423.0) % 1
+    clock.sleep(0.01)
+
+
+def mode10():
+    yield from pmode_rotator()
+
+def mode12():
+    yield from pmode_rotator(spin_speed = 1.0 / 60.0)
+
+def mode71():
+    yield from pmode_rotator(spin_speed = 1.0 / 6.0)
+
+def pmode_rotator(spin_speed = 1.0/600.0):
+    # the wheel turns once every 5 / spin_speed frames, which is the
+    # period these modes are declared with. Counting frames, and working
+    # out the offset from the count, keeps that exact, where adding up
+    # floats would drift.
+    turn = round(5 / spin_speed)
+    n = 0
+
+    # spiral.radial is a radial proportion that decreases smoothly along
+    # the strand, taking into account how far round the loop each pixel is,
+    # rather than jumping at each bottom point
+    radial_proportions = spiral.radial
+
+    while True:
+      offset = (n * spin_speed % 5) / 5.0
+      hues = [(proportion_around_loop + offset) % 1.0 for proportion_around_loop in spiral.frac]
+
+      yield hsv_to_neo_rgb_frame(hues, s=radial_proportions, v=radial_proportions)
+
+      n = (n + 1) % turn
+
+def mode75():
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    # spin_speed = 1.0/60.0
+    offset = 0
+    target_offset = offset
+
+    window = 0.33
+    target_window = window
+
+    window_dir = 0
+    target_window_dir = window_dir
+
+    while running():
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+        frac = (proportion_around_loop + offset) % 1.0
+
+        # simple radial proportion that assumes that each LED between bottom points
+        # is at a constant distance, with an immediate jump at each bottom point to
+        # be one unit further in.
+        # That leads to some abrupt changes in LED brightness, especially near the end
+        # of the strand
+
+        # this should make b into a number that decreases more smoothly than b,
+        # taking into account how far round the loop we are (which is stored
+        # in frac)
+        b_pro_rated = b + proportion_around_loop
+        radial_proportion = b_pro_rated / (len(bottoms)-1)
+
+        if (proportion_around_loop + window_dir) % 1.0 > window:
+          radial_proportion = 0.0
+
+        pixels[pixel] = hsv_to_neo_rgb(frac, s=radial_proportion, v=radial_proportion)
+
+      pixels.show()
+
+      # offset = (offset + spin_speed / 5.0) % 1.0
+
+      active = False
+
+      if target_offset > offset:
+          offset += 0.02
+          if target_offset < offset:
+            target_offset = offset
+          active = True
+
+      if target_offset < offset:
+          offset -= 0.02
+          if target_offset > offset:
+            target_offset = offset
+          active = True
+
+      if target_window > window:
+          window += 0.02
+          if target_window < window:
+            target_window = window
+          active = True
+
+      if target_window < window:
+          window -= 0.02
+          if target_window > window:
+            target_window = window
+          active = True
+
+      if target_window_dir > window_dir:
+          window_dir += 0.02
+          if target_window_dir < window_dir:
+            target_window_dir = window_dir
+          active = True
+
+      if target_window_dir < window_dir:
+          window_dir -= 0.02
+          if target_window_dir > window_dir:
+            target_window_dir = window_dir
+          active = True
+
+
+      if not active:
+          choice = random.randint(1,3)
+          if choice == 1:
+            target_offset = offset + random.random() - 0.5
+          elif choice == 2:
+            target_window = 0.2 + random.random() * 0.4
+          elif choice == 3:
+            target_window_dir = random.random()
+          
+
+      clock.sleep(0.02)
+
+
+def mode104():
+    """randomisation is the same as mode75 so factor that."""
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    offset = 0
+    target_offset = offset
+
+    window = 0.33
+    target_window = window
+
+    window_dir = 0
+    target_window_dir = window_dir
+
+    cols = {}
+    cols[0] = (0,0,0)
+    cols[1] = (0,0,0)
+    cols[2] = (255,0,0)
+    cols[3] = (0,255,0)
+    cols[4] = (0,0,255)
+
+    while running():
+      pixels.fill( (0,0,0) )
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = (spiral.layer[pixel], spiral.frac[pixel])
+
+        o = 0
+        if b == 4:
+           o = offset
+        elif b == 3:
+           o = window
+        elif b == 2:
+           o = window_dir
+        else:
+           o = 0
+
+        frac = (proportion_around_loop + o) % 1.0
+
+        if (frac>0.5 or frac<0):
+          pixels[pixel] = cols[b]
+        else:
+          pixels[pixel] = (0,0,0)
+
+      pixels.show()
+
+      active = False
+
+      if target_offset > offset:
+          offset += 0.02
+          if target_offset < offset:
+            target_offset = offset
+          active = True
+
+      if target_offset < offset:
+          offset -= 0.02
+          if target_offset > offset:
+            target_offset = offset
+          active = True
+
+      if target_window > window:
+          window += 0.02
+          if target_window < window:
+            target_window = window
+          active = True
+
+      if target_window < window:
+          window -= 0.02
+          if target_window > window:
+            target_window = window
+          active = True
+
+      if target_window_dir > window_dir:
+          window_dir += 0.02
+          if target_window_dir < window_dir:
+            target_window_dir = window_dir
+          active = True
+
+      if target_window_dir < window_dir:
+          window_dir -= 0.02
+          if target_window_dir > window_dir:
+            target_window_dir = window_dir
+          active = True
+
+
+      if not active:
+          choice = random.randint(1,3)
+          if choice == 1:
+            target_offset = random.random()
+          elif choice == 2:
+            target_window = random.random()
+          elif choice == 3:
+            target_window_dir = random.random()
+          
+
+      clock.sleep(0.01)
+
+
+def mode105():
+    """randomisation is the same as mode75 so factor that. and mode105"""
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    t_swap = time.time()
+
+    offset = 0
+    target_offset = offset
+
+    window = 0.33
+    target_window = window
+
+    window_dir = 0
+    target_window_dir = window_dir
+
+    cols = {}
+    cols[0] = (0,0,0)
+    cols[1] = (0,0,0)
+    cols[2] = (255,0,0)
+    cols[3] = (0,255,0)
+    cols[4] = (0,0,255)
+
+    while running():
+
+      if t_swap + 0.5 < time.time():
+        t_swap = time.time()
+        swaps = [ (2,3),
+                  (2,4),
+                  (3,4)
+                ]
+
+        (a,b) = swaps[random.randint(0,2)]
+        t = cols[a]
+        cols[a] = cols[b]
+        cols[b] = t
+
+      pixels.fill( (0,0,0) )
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+
+        o = 0
+        if b == 4:
+           o = offset
+        elif b == 3:
+           o = window
+        elif b == 2:
+           o = window_dir
+        else:
+           o = 0
+
+        frac = (proportion_around_loop + o) % 1.0
+
+        if (frac>0.5 or frac<0):
+          pixels[pixel] = cols[b]
+        else:
+          pixels[pixel] = (0,0,0)
+
+      pixels.show()
+
+      active = False
+
+      if target_offset > offset:
+          offset += 0.02
+          if target_offset < offset:
+            target_offset = offset
+          active = True
+
+      if target_offset < offset:
+          offset -= 0.02
+          if target_offset > offset:
+            target_offset = offset
+          active = True
+
+      if target_window > window:
+          window += 0.02
+          if target_window < window:
+            target_window = window
+          active = True
+
+      if target_window < window:
+          window -= 0.02
+          if target_window > window:
+            target_window = window
+          active = True
+
+      if target_window_dir > window_dir:
+          window_dir += 0.02
+          if target_window_dir < window_dir:
+            target_window_dir = window_dir
+          active = True
+
+      if target_window_dir < window_dir:
+          window_dir -= 0.02
+          if target_window_dir > window_dir:
+            target_window_dir = window_dir
+          active = True
+
+
+      if not active:
+          choice = random.randint(1,3)
+          if choice == 1:
+            target_offset = random.random()
+          elif choice == 2:
+            target_window = random.random()
+          elif choice == 3:
+            target_window_dir = random.random()
+          
+
+      clock.sleep(0.01)
+
+
+def mode106():
+    """randomisation is the same as mode75 so factor that. and mode105"""
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    t_swap = time.time()
+
+    offset = 0
+    target_offset = offset
+
+    window = 0.33
+    target_window = window
+
+    window_dir = 0
+    target_window_dir = window_dir
+
+    cols = {}
+    cols[0] = (0,0,0)
+    cols[1] = (0,0,0)
+    cols[2] = (255,0,0)
+    cols[3] = (0,255,0)
+    cols[4] = (0,0,255)
+
+    while running():
+
+      if t_swap + 0.5 < time.time():
+        t_swap = time.time()
+        ring = random.randint(2,5)
+        cols[ring] = hsv_to_neo_rgb(random.random())
+
+      pixels.fill( (0,0,0) )
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+
+        o = 0
+        if b == 4:
+           o = offset
+        elif b == 3:
+           o = window
+        elif b == 2:
+           o = window_dir
+        else:
+           o = 0
+
+        frac = (proportion_around_loop + o) % 1.0
+
+        if (frac>0.5 or frac<0):
+          pixels[pixel] = cols[b]
+        else:
+          pixels[pixel] = (0,0,0)
+
+      pixels.show()
+
+      active = False
+
+      if target_offset > offset:
+          offset += 0.02
+          if target_offset < offset:
+            target_offset = offset
+          active = True
+
+      if target_offset < offset:
+          offset -= 0.02
+          if target_offset > offset:
+            target_offset = offset
+          active = True
+
+      if target_window > window:
+          window += 0.02
+          if target_window < window:
+            target_window = window
+          active = True
+
+      if target_window < window:
+          window -= 0.02
+          if target_window > window:
+            target_window = window
+          active = True
+
+      if target_window_dir > window_dir:
+          window_dir += 0.02
+          if target_window_dir < window_dir:
+            target_window_dir = window_dir
+          active = True
+
+      if target_window_dir < window_dir:
+          window_dir -= 0.02
+          if target_window_dir > window_dir:
+            target_window_dir = window_dir
+          active = True
+
+
+      if not active:
+          choice = random.randint(1,3)
+          if choice == 1:
+            target_offset = random.random()
+          elif choice == 2:
+            target_window = random.random()
+          elif choice == 3:
+            target_window_dir = random.random()
+          
+
+      clock.sleep(0.01)
+
+
+def mode72():
+    spin_speed = 1.0 / 6.0
+
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    offset = 0
+    colour_segs = 1
+    colour_shift_rw = randomwalk.randomwalk(low = 0, high = 1.0)
+
+    next_reconfig_time = 0
+
+    while running():
+
+      if next_reconfig_time < time.time():
+        next_reconfig_time = time.time() + 1.0
+
+        old_segs = colour_segs
+        while colour_segs == old_segs:
+          colour_segs = float(random.randint(2,6))
+
+        colour_shift = next(colour_shift_rw)
+
+        activation_list = [random.random() < 0.8 for n in range(0,50)]
+
+      hues = []
+      values = []
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+        frac = (proportion_around_loop + offset) % 1.0
+
+        frac = int(frac * colour_segs) / colour_segs
+
+        frac = (frac + colour_shift) % 1.0
+
+        # simple radial proportion that assumes that each LED between bottom points
+        # is at a constant distance, with an immediate jump at each bottom point to
+        # be one unit further in.
+        # That leads to some abrupt changes in LED brightness, especially near the end
+        # of the strand
+
+        # this should make b into a number that decreases more smoothly than b,
+        # taking into account how far round the loop we are (which is stored
+        # in frac)
+        b_pro_rated = b + proportion_around_loop
+        radial_proportion = b_pro_rated / (len(bottoms)-1)
+
+        if activation_list[pixel] and b > 2:
+          radial_proportion = 1.0
+        else:
+          radial_proportion = 0.0
+
+        hues.append(frac)
+        values.append(radial_proportion)
+
+      pixels.copy_from(hsv_to_neo_rgb_frame(hues, v=values))
+      pixels.show()
+
+      offset = (offset + spin_speed / 5.0) % 1.0
+
+      clock.sleep(0.02)
+
+
+def mode94():
+    spin_speed = 1.0 / 6.0
+
+    pixels.auto_write = False
+
+    pixels.fill( (0,0,0) )
+    pixels.show()
+
+    offset = 0
+    colour_segs = 1
+
+    next_reconfig_time = 0
+
+    while running():
+
+      now = time.time()
+
+      if next_reconfig_time < now:
+        next_reconfig_time = now + 1.0
+
+        old_segs = colour_segs
+        while colour_segs == old_segs:
+          colour_segs = float(random.randint(2,6))
+
+        colour_shift = random.random()
+
+        activation_list = [True for n in range(0,50)]
+
+      t = next_reconfig_time - now  # will go from 1.0 to 0.0, approx
+
+      if t > 0.9:  # first bit, fade up
+        v_t = 1.0 - t  # 0 .. 0.1
+        v_t = v_t * 10.0  # 0 .. 1.0
+        v_t = min(1.0, max(v_t, 0.0))
+      else:
+        v_t = t / 0.9
+        v_t = v_t ** 0.5
+        v_t = min(1.0, max(v_t, 0.0))
+
+      for pixel in range(0,50):
+        (b, proportion_around_loop) = pixel_to_layer(pixel)
+        frac = (proportion_around_loop + offset) % 1.0
+
+        frac = int(frac * colour_segs) / colour_segs
+
+        frac = (frac + colour_shift) % 1.0
+
+        # simple radial proportion that assumes that each LED between bottom points
+        # is at a constant distance, with an immediate jump at each bottom point to
+        # be one unit further in.
+        # That leads to some abrupt changes in LED brightness, especially near the end
+        # of the strand
+
+        # this should make b into a number that decreases more smoothly than b,
+        # taking into account how far round the loop we are (which is stored
+        # in frac)
+        b_pro_rated = b + proportion_around_loop
+        radial_proportion = b_pro_rated / (len(bottoms)-1)
+
+        if activation_list[pixel] and b > 2:
+          radial_proportion = v_t
+        else:
+          radial_proportion = 0.0
+        
+        pixels[pixel] = hsv_to_neo_rgb(frac, s=1.0, v=radial_proportion)
+
+      pixels.show()
+
+      # offset = (offset + spin_speed / 5.0) % 1.0
+
+      clock.sleep(0.02)
+
+
+
+
+
+def mode21():
+    pixels.auto_write = False
+
+    # the inner loops don't look good in this mode
+    # because not enough pixels so leave them empty
+    min_loop = 3
+
+    min_frac = 0.3
+    max_frac = 0.6
+
+    params = {}
+    for b in range(min_loop, len(bottoms)):
+        params[b] = {}
+        params[b]["hue"] = random.random()
+        params[b]["length"] = min_frac + random.random() * (max_frac - min_frac)
+        params[b]["offset"] = 0
+        params[b]["speed"] = random.random() + 0.3
+        if(random.random() > 0.5):
+            params[b]["speed"] = -params[b]["speed"]
+
+    while running():
+        pixels.fill( (0,0,0) )
+
+        for b in range(min_loop, len(bottoms)):
+            bottom_len = bottoms[b-1] - bottoms[b]
+            slice_len = max(1, int(bottom_len * params[b]["length"]))
+            for s in range(0,slice_len):
+                t = bottoms[b] + int( (params[b]["offset"] + s) % bottom_len)
+                hue = params[b]["hue"]
+                pixels[t] = hsv_to_neo_rgb(hue)
+            params[b]["offset"] = (params[b]["offset"] + params[b]["speed"]) % bottom_len
+
+        pixels.show()
+        clock.sleep(0.01)
+
+        # clock.sleep(0.1)
+
+
+def mode24():
+    pixels.auto_write = False
+
+    gamma_factor = 1.4
+
+    red_exp = 1
+    green_exp = 1
+    blue_exp = 1
+
+    while running():
+        for pixel in range(0,50):
+            (b, frac) = pixel_to_layer(pixel)
+
+            (red, green, blue) = colorsys.hsv_to_rgb(frac, 1, 1)
+
+            red *= red_exp
+            green *= green_exp
+            blue *= blue_exp
+
+            (red, green, blue) = ( gamma_scale(red, gamma_factor=gamma_factor),
+                                   gamma_scale(green, gamma_factor=gamma_factor),
+                                   gamma_scale(blue, gamma_factor=gamma_factor) )
+
+            pixels[pixel] = (red, green, blue)
+      
+        pixels.show()
+
+        red_exp = max(0, red_exp - 0.09)
+        green_exp = max(0, green_exp - 0.09)
+        blue_exp = max(0, blue_exp - 0.09)
+
+        if random.random() < 0.08:
+            red_exp = 1
+        if random.random() < 0.08:
+            green_exp = 1
+        if random.random() < 0.08:
+            blue_exp = 1
+
+        clock.sleep(0.03)
+     
+
+def mode34():
+  
+  pixels.auto_write = False
+  pixels.fill( (0,0,0) )
+  pixels.show()
+
+  r_ang = random.random()
+  g_ang = random.random()
+  b_ang = random.random()
+
+  r_speed = random.random() * 0.05 - 0.025
+  g_speed = random.random() * 0.05 - 0.025
+  b_speed = random.random() * 0.05 - 0.025
+
+  while running():
+
+    for pixel in range(0,50):
+      (b, frac) = pixel_to_layer(pixel)
+      frac_red = (frac + r_ang) % 1
+      frac_green = (frac + g_ang) % 1
+      frac_blue = (frac + b_ang) % 1
+
+      width = 0.15
+
+      def f(pos):
+        if pos > width and pos < (1-width):
+            intensity = 0
+        elif pos >= (1-width):
+            pos = 1 - pos
+            intensity = (width - pos) * (1/width)
+        else:
+            intensity = (width - pos) * (1/width)
+        return int(intensity * 255)
+
+      pixels[pixel] = ( f(frac_red), f(frac_green), f(frac_blue) )
+    pixels.show()
+
+    r_ang = (r_ang + r_speed) % 1.0
+    g_ang = (g_ang + g_speed) % 1.0
+    b_ang = (b_ang + b_speed) % 1.0
+
+    clock.sleep(0.05)
+
+
+def mode36():
+    pixels.auto_write = False
+
+    rot = 0
+
+    hue_1 = random.random()
+    hue_2 = random.random()
+    hue_3 = random.random()
+
+    hue_speed_1 = random.random() * 0.01
+    hue_speed_2 = random.random() * 0.01
+    hue_speed_3 = random.random() * 0.01
+
+    while running():
+      hues = []
+      values = []
+      for pixel in range(0,50):
+        (b, pixel_rot) = (spiral.layer[pixel], spiral.frac[pixel])
+
+        v_frac = float(b) / float(len(bottoms))
+
+        frac = (pixel_rot + rot) % 1.0
+
+        if frac < 1.0/6.0:
+            (h, v) = (0,0)
+        elif frac < 2.0/6.0:
+            (h, v) = (hue_1, v_frac)
+        elif frac < 3.0/6.0:
+            (h, v) = (0,0)
+        elif frac < 4.0/6.0:
+            (h, v) = (hue_2, v_frac)
+        elif frac < 5.0/6.0:
+            (h, v) = (0,0)
+        else:
+            (h, v) = (hue_3, v_frac)
+
+        hues.append(h)
+        values.append(v)
+
+      pixels.copy_from(hsv_to_neo_rgb_frame(hues, v=values))
+      pixels.show()
+
+      rot = rot + 0.025
+
+      hue_1 = (hue_1 + hue_speed_1) % 1.0
+      hue_2 = (hue_2 + hue_speed_2) % 1.0
+      hue_3 = (hue_3 + hue_speed_3) % 1.0
+
+      clock.sleep(0.025)
+
+
+def mode38():
+    pixels.auto_write = False
+
+    rot = 0
+
+    hue_1 = random.random()
+    hue_2 = random.random()
+    hue_3 = random.random()
+
+    hue_speed_1 = random.random() * 0.01
+    hue_speed_2 = random.random() * 0.01
+    hue_speed_3 = random.random() * 0.01
+
+    while running():
+      for pixel in range(0,50):
+        (b, pixel_rot) = pixel_to_layer(pixel)
+
+        v_frac = float(b) / float(len(bottoms))
+
+        frac = (pixel_rot + rot + v_frac / 1.5) % 1.0
+
+        if frac < 2.0/6.0:
+            (h, v) = (hue_1, v_frac)
+        elif frac < 4.0/6.0:
+            (h, v) = (hue_2, v_frac)
+        else:
+            (h, v) = (hue_3, v_frac)
+
+        pixels[pixel] = hsv_to_neo_rgb(h, v=v)
+
+      pixels.show()
+
+      rot = rot + 0.025
+
+      hue_1 = (hue_1 + hue_speed_1) % 1.0
+      hue_2 = (hue_2 + hue_speed_2) % 1.0
+      hue_3 = (hue_3 + hue_speed_3) % 1.0
+
+      clock.sleep(0.025)
+
+
+def mode39():
+    pixels.auto_write = False
+
+    rot = 0
+
+    hue_1 = random.random()
+    hue_2 = random.random()
+    hue_3 = random.random()
+
+    hue_speed_1 = random.random() * 0.01
+    hue_speed_2 = random.random() * 0.01
+    hue_speed_3 = random.random() * 0.01
+
+    while running():
+      for pixel in range(0,50):
+        (b, pixel_rot) = pixel_to_layer(pixel)
+
+        v_frac = float(b) / float(len(bottoms))
+
+        frac = (pixel_rot + rot) % 1.0
+
+        if frac < 2.0/6.0:
+            k = 1 - frac / (2.0/6.0)
+            (h, v) = (hue_1, v_frac * k)
+        elif frac < 4.0/6.0:
+            k = 1- (frac - 2.0/6.0) / (2.0/6.0)
+            (h, v) = (hue_2, v_frac * k)
+        else:
+            k = 1- (frac - 4.0/6.0) / (2.0/6.0)
+            (h, v) = (hue_3, v_frac * k)
+
+        pixels[pixel] = hsv_to_neo_rgb(h, v=v)
+
+      pixels.show()
+
+      rot = rot + 0.025
+
+      hue_1 = (hue_1 + hue_speed_1) % 1.0
+      hue_2 = (hue_2 + hue_speed_2) % 1.0
+      hue_3 = (hue_3 + hue_speed_3) % 1.0
+
+      clock.sleep(0.025)
+
+
+def mode41():
+    pixels.auto_write = False
+
+    h = 0.5
+
+    hue = random.random()
+
+    rot = random.random()
+    rot_speed = random.random() * 0.05 + 0.025
+
+    while running():
+        pixel_pos = generate_pixel_pos(rot=rot)
+
+        for p in range(0,50):
+            (x, y) = pixel_pos[p]
+
+            d = min(1, abs(y - h) / 2.0)
+
+            pixels[p] = hsv_to_neo_rgb(hue, v = (1-d))
+        pixels.show()
+
+        rot = (rot + rot_speed) % 1.0
+        clock.sleep(0.05)
@@ -0,0 +1,132 @@
+"""Registry of the modes that the spiral can display.
+
+Each mode is declared once, with a description of the mode. The web
+routes, the index page and the disco playlist are all generated from
+the registry, rather than being kept in step by hand.
+
+A mode can be declared by decorating its function, or by naming the
+function as "module:function", in which case the module is not
+imported until the mode is first run.
+"""
+
+import importlib
+
+# the order that categories appear on the index page
+categories = ["Basic", "Slowly changing", "Discrete dots", "Clocks",
+              "Patterns", "Control", "External API Test"]
+
+# rough CPU cost of running a mode continuously
+cost_classes = ["light", "medium", "heavy"]
+
+
+class ModeInfo:
+    """Description of one mode.
+
+    id - the name used in the /mode/ URL
+    func - function that runs the mode until it is asked to finish,
+           imported on first use if it was declared by name
+    title - description for the index page
+    category - index page section, one of categories
+    disco - whether the disco autochanger can pick this mode
+    static - whether the mode shows an unchanging frame
+    fps - the frame rate the mode aims for, or None if it runs as
+          fast as it can
+    cost - CPU cost class, one of cost_classes
+    period - for a mode whose frames repeat exactly, the number of
+             frames before they do, so that they can be cached
+    cpu_budget - the fraction of one CPU the mode may use, or None for
+                 the driver's default (see swirl/governor.py)
+    """
+
+    def __init__(self, id, func, *, title, category, disco=False, static=False, fps=None, cost="light", period=None,
+                 cpu_budget=None):
+        if category not in categories:
+            raise ValueError("Mode {} has unknown category {}".format(id, category))
+        if cost not in cost_classes:
+            raise ValueError("Mode {} has unknown cost class {}".format(id, cost))
+        self.id = id
+        if callable(func):
+            self._func = func
+            self.target = "{}:{}".format(func.__module__, func.__name__)
+        else:
+            self._func = None
+            self.target = func
+        self.title = title
+        self.category = category
+        self.disco = disco
+        self.static = static
+        self.fps = fps
+        self.cost = cost
+        self.period = period
+        self.cpu_budget = cpu_budget
+
+    @property
+    def func(self):
+        if self._func is None:
+            (module, name) = self.target.split(":")
+            self._func = getattr(importlib.import_module(module), name)
+        return self._func
+
+    @property
+    def loaded(self):
+        return self._func is not None
+
+    @property
+    def module(self):
+        return self.target.split(":")[0]
+
+    @property
+    def name(self):
+        return self.target.split(":")[1]
+
+    def __repr__(self):
+        return "<mode {} {}>".format(self.id, self.name)
+
+
+class Registry:
+    """The declared modes, in declaration order."""
+
+    def __init__(self):
+        self.modes = {}
+
+    def declare(self, id, func=None, **info):
+        """Add a mode to the registry. func is the mode function or its
+        "module:function" name; without it, this is a decorator for the
+        mode function. The keyword arguments are as for ModeInfo."""
+        if func is None:
+            def decorator(func):
+                self.declare(id, func, **info)
+                return func
+            return decorator
+        info = ModeInfo(id, func, **info)
+        if id in self.modes:
+            raise ValueError("Mode {} declared twice, by {} and {}".format(id, self.modes[id].name, info.name))
+        self.modes[id] = info
+
+    def __getitem__(self, id):
+        return self.modes[id]
+
+    def __contains__(self, id):
+        return id in self.modes
+
+    def __iter__(self):
+        return iter(self.modes.values())
+
+    def __len__(self):
+        return len(self.modes)
+
+    def by_func(self, func):
+        """Look up the ModeInfo for a mode function."""
+        for m in self:
+            if m.loaded and m.func == func:
+                return m
+        raise KeyError(func.__name__)
+
+    def disco_modes(self):
+        return [m for m in self if m.disco]
+
+    def by_category(self):
+        """Return a list of (category, modes) in index page order,
+        with the modes in each category sorted by id."""
+        return [(c, sorted([m for m in self if m.category == c], key=lambda m: (len(m.id), m.id)))
+                for c in categories]
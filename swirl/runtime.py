@@ -0,0 +1,253 @@
+"""What modes see of the driver.
+
+A mode can be written in one of two ways.
+
+A frame generator is a generator function (or a class whose instances
+are iterable) that yields frames, or (frame, delay) pairs to ask for a
+particular delay before the next frame. A frame is a Frame, or any
+bytes-like object of packed r, g, b bytes. Yielding None instead of a
+frame leaves the previous frame showing. Without a delay, frames come
+out at the fps the mode is declared with. The driver decides when to
+ask for each frame, and stops asking when another mode is selected.
+
+A loop-style mode draws into pixels, calls pixels.show() and
+clock.sleep(delay) itself, and keeps going for as long as running()
+says so. LoopMode adapts these to look like frame generators.
+
+When another mode is selected, the stop signal for the running mode
+is set. That cuts short the driver's wait for the next frame, and any
+clock.sleep() or wait() in a loop-style mode, so that the switch
+happens straight away rather than when the mode next gets round to
+checking.
+"""
+
+import inspect
+import queue
+import threading
+import time
+
+import swirl.framebuffer as framebuffer
+
+class StopSignal:
+    """Tells a mode to finish.
+
+    This is a threading.Event, except that callbacks can also be
+    registered to run when it is set, to wake up code that is blocked
+    on something other than the event, such as reading from a pipe.
+    """
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+    def set(self):
+        with self.lock:
+            if self.event.is_set():
+                return
+            self.event.set()
+            callbacks = self.callbacks
+            self.callbacks = []
+        for callback in callbacks:
+            callback()
+
+    def is_set(self):
+        return self.event.is_set()
+
+    def wait(self, timeout=None):
+        """Wait for up to timeout seconds for the signal to be set.
+        Returns True if it was."""
+        return self.event.wait(timeout)
+
+    def on_set(self, callback):
+        """Call callback when the signal is set, or straight away if
+        it has been already."""
+        with self.lock:
+            if not self.event.is_set():
+                self.callbacks.append(callback)
+                return
+        callback()
+
+
+# the driver's mode controller, which runs one mode at a time
+controller = None
+
+# set when the running mode should finish. The controller replaces
+# this with a fresh one for each mode it runs.
+stop = StopSignal()
+
+
+def switch_to(mode):
+    """Ask the current mode to finish, and run mode (a ModeInfo)
+    after it."""
+    controller.switch_to(mode)
+
+
+# the LoopMode that the current thread is running, if any
+_local = threading.local()
+
+
+def _loop():
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        raise RuntimeError("loop-style mode functions must be run by a LoopMode")
+    return loop
+
+
+def current_stop():
+    """The stop signal for the mode running in this thread."""
+    loop = getattr(_local, "loop", None)
+    if loop is None:
+        return stop
+    return loop.stop
+
+
+def running():
+    """True until the current mode has been asked to finish."""
+    return not current_stop().is_set()
+
+
+def wait(delay):
+    """Wait for delay seconds, or until the current mode has been asked
+    to finish. Returns True if it has."""
+    return current_stop().wait(delay)
+
+
+def on_stop(callback):
+    """Call callback when the current mode is asked to finish."""
+    current_stop().on_set(callback)
+
+
+# called with the CPU time a loop-style mode's thread takes for each
+# frame, so that it can be counted against the mode's CPU budget
+count_cpu = None
+
+
+class LoopMode:
+    """Runs a loop-style mode as a frame source.
+
+    The mode runs in a thread of its own. Iterating over a LoopMode
+    gives (frame, delay) pairs: each frame the mode shows, along with
+    the delay it sleeps for afterwards. The mode is held up in show()
+    or sleep() until the next frame is asked for, so the caller rather
+    than the mode decides when frames go out.
+
+    The mode is stopped when parent (a StopSignal) is set, or when the
+    iteration is closed.
+    """
+
+    def __init__(self, func, parent=None):
+        self.func = func
+        self.started = time.monotonic()
+        self.pending = None
+        self.cpu = 0.0
+        self.stop = StopSignal()
+        self.handed_over = queue.Queue()
+        self.resume = threading.Semaphore(0)
+        if parent is not None:
+            parent.on_set(self.stop.set)
+
+    def __iter__(self):
+        thread = threading.Thread(target=self.run, name=self.func.__name__, daemon=True)
+        # wake up the iteration if the mode is stopped while it is
+        # waiting for a frame
+        self.stop.on_set(lambda: self.handed_over.put(None))
+        thread.start()
+        try:
+            while True:
+                item = self.handed_over.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+                self.resume.release()
+        finally:
+            self.stop.set()
+            self.resume.release()
+            thread.join(timeout=1)
+            if thread.is_alive():
+                print("mode {} has not finished after being stopped".format(self.func.__name__))
+
+    def run(self):
+        _local.loop = self
+        self.started = time.monotonic()
+        try:
+            self.func()
+            if self.pending is not None:
+                self.hand_over(0)
+            self.handed_over.put(None)
+        except BaseException as e:
+            self.handed_over.put(e)
+
+    def hand_over(self, delay):
+        frame = self.pending
+        self.pending = None
+        cpu = time.thread_time()
+        if count_cpu is not None:
+            count_cpu(cpu - self.cpu)
+        self.cpu = cpu
+        if self.stop.is_set():
+            return
+        self.handed_over.put((frame, delay))
+        self.resume.acquire()
+
+    def shown(self, buf):
+        # a mode that shows several frames without sleeping in between
+        # wants them out as fast as possible
+        if self.pending is not None:
+            self.hand_over(0)
+        self.pending = bytes(buf)
+
+    def sleep(self, delay):
+        self.hand_over(delay)
+
+
+class ModeClock:
+    """The clock that loop-style modes pace themselves with."""
+
+    def sleep(self, delay):
+        """Finish the frame, and ask for delay seconds before the next
+        one."""
+        _loop().sleep(delay)
+
+    def elapsed(self):
+        """Time in seconds since this mode started."""
+        return time.monotonic() - _loop().started
+
+
+def _shown(buf):
+    _loop().shown(buf)
+
+
+# loop-style modes draw into this frame buffer
+pixels = framebuffer.Strip(50, write=_shown)
+
+# and pace their frames with clock.sleep(delay) rather than
+# time.sleep(delay)
+clock = ModeClock()
+
+
+def with_delays(frames, delay):
+    """Turn the frames of a mode into (frame, delay) pairs, using
+    delay for frames that come without one."""
+    try:
+        for frame in frames:
+            if isinstance(frame, tuple):
+                yield frame
+            else:
+                yield (frame, delay)
+    finally:
+        if hasattr(frames, "close"):
+            frames.close()
+
+
+def mode_frames(func, stop, delay=0):
+    """The frames of a mode function, as (frame, delay) pairs. Frame
+    generator modes are iterated over directly, and loop-style modes
+    are run through a LoopMode, which stops them when stop is set."""
+    if inspect.isgeneratorfunction(func) or inspect.isclass(func):
+        frames = iter(func())
+    else:
+        frames = iter(LoopMode(func, stop))
+    return with_delays(frames, delay)
@@ -0,0 +1,271 @@
+"""Fixed rate frame pacing.
+
+Sleeping for a fixed delay after each frame makes the real frame period
+delay + render time + show time, so animations run slow and drift. The
+clock here works like runLedsInner in hs/src/Main.hs: it keeps an
+absolute deadline for the next frame, and each sleep waits until that
+deadline rather than for a fixed delay.
+
+Showing a frame takes time too: on the real strip, show() blocks while
+the bits go out. The OutputThread here shows frames in a thread of its
+own, at their deadlines, so that the next frame can be rendered while
+the current one is going out.
+"""
+
+import collections
+import threading
+import time
+
+import swirl.framebuffer as framebuffer
+
+
+class ModeStats:
+    """Frame timing counters for one mode."""
+
+    def __init__(self):
+        self.frames = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.last_switch_latency = None
+        self.max_switch_latency = 0.0
+
+    def mean_lateness(self):
+        if self.overruns == 0:
+            return 0.0
+        return self.total_lateness / self.overruns
+
+    def switched(self, latency):
+        """Record the time from a mode switch being asked for to this
+        mode's first frame going out."""
+        self.last_switch_latency = latency
+        self.max_switch_latency = max(self.max_switch_latency, latency)
+
+    def as_dict(self):
+        return {"frames": self.frames,
+                "overruns": self.overruns,
+                "skipped": self.skipped,
+                "mean_lateness": self.mean_lateness(),
+                "max_lateness": self.max_lateness,
+                "last_switch_latency": self.last_switch_latency,
+                "max_switch_latency": self.max_switch_latency}
+
+    def __str__(self):
+        return "{} frames, {} overruns (mean {:.4f}s late, max {:.4f}s), {} frames skipped".format(
+            self.frames, self.overruns, self.mean_lateness(), self.max_lateness, self.skipped)
+
+
+class FrameClock:
+    """Paces frames against absolute deadlines.
+
+    A mode calls sleep(delay) once per frame instead of time.sleep(delay).
+    The deadline advances by delay each time, so time spent rendering and
+    showing the frame comes out of the delay instead of being added to it.
+
+    When a frame finishes after its deadline, that is counted as an overrun.
+    With skip_frames, the deadline then jumps forward to the next whole
+    period in the future, so a slow frame makes the animation drop frames
+    rather than run faster for a while to catch up. Without skip_frames
+    the clock catches up, unless it has fallen more than max_lag seconds
+    behind, in which case it starts again from now.
+    """
+
+    def __init__(self, *, skip_frames=False, max_lag=1.0):
+        self.skip_frames = skip_frames
+        self.max_lag = max_lag
+        self.stats = {}
+        self.start(None)
+
+    def start(self, name):
+        """Start pacing frames for a new mode, with deadlines measured
+        from now."""
+        self.name = name
+        self.started = time.monotonic()
+        self.next_time = self.started
+        self.delay = 0
+        if name not in self.stats:
+            self.stats[name] = ModeStats()
+        self.current = self.stats[name]
+
+    def elapsed(self):
+        """Time in seconds since this mode started."""
+        return time.monotonic() - self.started
+
+    def sleep(self, delay, interrupt=None):
+        """Wait until delay seconds after the previous deadline.
+
+        If interrupt is given, it is an Event (or anything else with
+        a wait(timeout) method) that cuts the wait short when it is
+        set."""
+        self.advance(delay)
+        self.wait(interrupt)
+
+    def advance(self, delay):
+        """Finish a frame, moving the deadline on by delay for the
+        next one."""
+        self.current.frames += 1
+        self.delay = delay
+        if delay <= 0:
+            # unpaced mode: the next frame is due straight away
+            self.next_time = time.monotonic()
+        else:
+            self.next_time += delay
+
+    def wait(self, interrupt=None):
+        """Wait until the deadline, as for sleep()."""
+        now = time.monotonic()
+        remaining = self.next_time - now
+
+        if remaining > 0:
+            self._wait(remaining, interrupt)
+            return
+
+        if self.delay <= 0:
+            # nothing to be late for
+            return
+
+        lateness = -remaining
+        stats = self.current
+        stats.overruns += 1
+        stats.total_lateness += lateness
+        stats.max_lateness = max(stats.max_lateness, lateness)
+
+        if self.skip_frames:
+            missed = int(lateness // self.delay) + 1
+            stats.skipped += missed - 1
+            self.next_time += missed * self.delay
+            self._wait(self.next_time - now, interrupt)
+        elif lateness > self.max_lag:
+            self.next_time = now
+
+    def _wait(self, seconds, interrupt):
+        if interrupt is None:
+            time.sleep(seconds)
+        else:
+            interrupt.wait(seconds)
+
+
+class OutputThread:
+    """Shows frames on a Strip at their deadlines, in a thread of its
+    own.
+
+    The renderer calls submit(frame, deadline) for each frame, and can
+    then get on with the next frame while this one waits for its
+    deadline and goes out. At most depth frames wait to go out. When
+    another is submitted, or when more than one of them is already
+    due, the older ones are dropped: the latest frame wins.
+
+    A renderer that wakes up at a frame's deadline should call
+    wait_taken() before it starts on the next frame, so that it isn't
+    holding the GIL while this thread needs it to pick the frame up.
+
+    A frame can be submitted with an on_shown callback, which is called
+    with the time it finished going out. If the frame is dropped, the
+    callback is passed on to the frame that replaced it.
+    """
+
+    def __init__(self, strip, depth=2):
+        self.strip = strip
+        self.depth = depth
+        self.changed = threading.Condition()
+        self.pending = collections.deque()
+        self.submitted = 0
+        self.taken = 0
+        self.thread = None
+        self.shown = 0
+        self.dropped = 0
+        self.late = 0
+        self.max_lateness = 0.0
+        self.max_show_time = 0.0
+
+    def start(self):
+        with self.changed:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="output", daemon=True)
+                self.thread.start()
+
+    def submit(self, frame, deadline, on_shown=None):
+        """Show frame (a Frame or bytes-like object) at deadline, a
+        time.monotonic() time. The frame is copied, so the caller can
+        go on to reuse its buffer."""
+        if isinstance(frame, framebuffer.Frame):
+            frame = frame.buf
+        item = [deadline, bytes(frame), time.monotonic(), on_shown]
+        if self.thread is None:
+            self.start()
+        with self.changed:
+            if len(self.pending) >= self.depth:
+                self._drop(self.pending.popleft(), self.pending[0] if self.pending else item)
+            self.pending.append(item)
+            self.submitted += 1
+            self.changed.notify_all()
+
+    def _drop(self, item, replacement):
+        if item[3] is not None and replacement[3] is None:
+            replacement[3] = item[3]
+        self.dropped += 1
+        self.taken += 1
+
+    def wait_taken(self, timeout):
+        """Wait for up to timeout seconds for every frame submitted so
+        far to have been picked up to go out, or dropped."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.taken >= self.submitted, timeout)
+
+    def clear(self):
+        """Drop any frames that haven't gone out yet, for when the mode
+        that submitted them has been stopped."""
+        with self.changed:
+            self.dropped += len(self.pending)
+            self.taken += len(self.pending)
+            self.pending.clear()
+            self.changed.notify_all()
+
+    def next_frame(self):
+        """Wait for the first pending frame to be due, and take it,
+        along with any later ones that are due by then."""
+        with self.changed:
+            while True:
+                if not self.pending:
+                    self.changed.wait()
+                    continue
+                remaining = self.pending[0][0] - time.monotonic()
+                if remaining > 0:
+                    # woken early if a frame is submitted or cleared
+                    self.changed.wait(remaining)
+                    continue
+                item = self.pending.popleft()
+                self.taken += 1
+                now = time.monotonic()
+                while self.pending and self.pending[0][0] <= now:
+                    self._drop(item, self.pending[0])
+                    item = self.pending.popleft()
+                self.changed.notify_all()
+                return item
+
+    def run(self):
+        while True:
+            (deadline, buf, submitted, on_shown) = self.next_frame()
+            started = time.monotonic()
+            self.strip.copy_from(buf)
+            self.strip.show()
+            finished = time.monotonic()
+            self.shown += 1
+            # a frame that was submitted after its deadline was late
+            # rendering, which isn't counted here
+            lateness = started - max(deadline, submitted)
+            if lateness > 0.001:
+                self.late += 1
+                self.max_lateness = max(self.max_lateness, lateness)
+            self.max_show_time = max(self.max_show_time, finished - started)
+            if on_shown is not None:
+                on_shown(finished)
+
+    def as_dict(self):
+        return {"shown": self.shown,
+                "dropped": self.dropped,
+                "late": self.late,
+                "max_lateness": self.max_lateness,
+                "max_show_time": self.max_show_time,
+                "depth": self.depth}
@@ -1,13 +1,181 @@
+import array
+import functools
+import heapq
 import math
 from math import tau
 
 bottoms = [50, 49, 46, 37, 22, 0]
 
 
-def pixel_to_layer(pixel):
-    """Given a pixel, return the loop number and fraction around the
-    loop for this pixel.
+def _readonly(typecode, values):
+    return memoryview(array.array(typecode, values)).toreadonly()
+
+
+class SpiralTopology:
+    """The position of every pixel on the spiral, worked out once from
+    a bottoms list rather than every frame.
+
+    Each attribute is a read-only contiguous array indexed by pixel
+    number:
+
+    layer - loop number, 0 being the centre (as from pixel_to_layer)
+    frac - fraction around the loop (as from pixel_to_layer)
+    radial - radial proportion 0..1, pro-rated by how far round the
+             loop the pixel is so that it decreases smoothly along
+             the strip
+    x, y - position, as from generate_pixel_pos
+    angle - polar angle of the position, in radians
+    radius - distance of the position from the centre
+    """
+
+    def __init__(self, bottoms):
+        self.bottoms = tuple(bottoms)
+        self.n = bottoms[0]
+        layers = [_walk_to_layer(bottoms, pixel) for pixel in range(0, self.n)]
+
+        self.layer = _readonly("i", [b for (b, frac) in layers])
+        self.frac = _readonly("d", [frac for (b, frac) in layers])
+        self.radial = _readonly("d", [(b + frac) / (len(bottoms) - 1) for (b, frac) in layers])
+        self.x = _readonly("d", [math.sin((frac % 1.0) * tau) * b for (b, frac) in layers])
+        self.y = _readonly("d", [math.cos((frac % 1.0) * tau) * b for (b, frac) in layers])
+        self.angle = _readonly("d", [math.atan2(x, y) % tau for (x, y) in zip(self.x, self.y)])
+        self.radius = _readonly("d", [math.hypot(x, y) for (x, y) in zip(self.x, self.y)])
+
+    def __len__(self):
+        return self.n
+
+    def pixel_pos(self):
+        """Return a new dict of pixel to (x, y), in the same form as
+        generate_pixel_pos"""
+        return {p: (self.x[p], self.y[p]) for p in range(0, self.n)}
+
+    @functools.cached_property
+    def neighbours(self):
+        """A NeighbourIndex for this topology, made the first time
+        it is needed."""
+        return NeighbourIndex(self)
+
+    @functools.cached_property
+    def points(self):
+        """A PointIndex for this topology, made the first time
+        it is needed."""
+        return PointIndex(self)
+
+
+class NeighbourIndex:
+    """Distances between every pair of pixels in a topology, with each
+    pixel's neighbours pre-sorted by distance, so that modes can look
+    them up rather than calculating and sorting 50 distances each time.
+    """
+
+    def __init__(self, topology):
+        n = len(topology)
+        (xs, ys) = (topology.x, topology.y)
+
+        # same calculation as distances_from_point, so that results
+        # (including the order of ties) are identical
+        self.distances = tuple(
+            tuple(math.sqrt( (xs[p]-xs[q]) ** 2 + (ys[p]-ys[q]) ** 2) for q in range(0, n))
+            for p in range(0, n))
+
+        self._closest = tuple(
+            tuple(sorted((d, q) for (q, d) in enumerate(row)))
+            for row in self.distances)
+
+        self._within = {}
+
+    def distance(self, p, q):
+        return self.distances[p][q]
+
+    def closest(self, p):
+        """All pixels, as (distance, pixel) tuples sorted by distance from
+        pixel p - the same as distances_from_point at p's position. p itself
+        comes first."""
+        return self._closest[p]
+
+    def nearest(self, p, k):
+        """The k pixels closest to pixel p, including p itself."""
+        return self._closest[p][0:k]
+
+    def neighbours_within(self, p, r):
+        """(distance, pixel) tuples for the pixels within distance r
+        of pixel p, not including p, sorted by distance. Results are
+        cached for each p and r, so r should be one of a few fixed
+        values rather than something that changes all the time."""
+        key = (p, r)
+        ball = self._within.get(key)
+        if ball is None:
+            ball = tuple((d, q) for (d, q) in self._closest[p] if d <= r and q != p)
+            self._within[key] = ball
+        return ball
+
+
+class PointIndex:
+    """Finds the pixels closest to an arbitrary point, without working
+    out the distance to every pixel and sorting them.
+
+    The area around the spiral is divided into a grid of square cells.
+    For each cell, the index keeps the few pixels that could possibly be
+    among the k_max closest to some point in that cell, worked out the
+    first time the cell is used. A query then only needs distances to
+    those candidates. Points outside the grid, or queries for more than
+    k_max pixels, fall back to checking every pixel.
     """
+
+    def __init__(self, topology, *, cell_size=0.25, margin=2.0, k_max=10):
+        self.n = len(topology)
+        self.xs = topology.x
+        self.ys = topology.y
+        self.cell_size = cell_size
+        self.k_max = k_max
+        self.x0 = min(self.xs) - margin
+        self.y0 = min(self.ys) - margin
+        self.columns = math.ceil((max(self.xs) + margin - self.x0) / cell_size)
+        self.rows = math.ceil((max(self.ys) + margin - self.y0) / cell_size)
+        self._cells = {}
+
+    def _candidates(self, cell):
+        candidates = self._cells.get(cell)
+        if candidates is None:
+            (c, r) = cell
+            x0 = self.x0 + c * self.cell_size
+            x1 = x0 + self.cell_size
+            y0 = self.y0 + r * self.cell_size
+            y1 = y0 + self.cell_size
+
+            near = []
+            far = []
+            for p in range(0, self.n):
+                (px, py) = (self.xs[p], self.ys[p])
+                near.append(math.hypot(max(x0 - px, 0, px - x1), max(y0 - py, 0, py - y1)))
+                far.append(math.hypot(max(abs(px - x0), abs(px - x1)), max(abs(py - y0), abs(py - y1))))
+
+            # every point in the cell has at least k_max pixels within
+            # this distance, so a pixel that is never closer than this
+            # can't be one of the k_max closest
+            limit = sorted(far)[self.k_max - 1]
+            candidates = tuple(p for p in range(0, self.n) if near[p] <= limit + 1e-9)
+            self._cells[cell] = candidates
+        return candidates
+
+    def nearest_k(self, x, y, k):
+        """The k pixels closest to (x, y), as a list of (distance, pixel)
+        tuples - the same as distances_from_point(x, y)[0:k]."""
+        c = int((x - self.x0) // self.cell_size)
+        r = int((y - self.y0) // self.cell_size)
+        if k <= self.k_max and 0 <= c < self.columns and 0 <= r < self.rows:
+            candidates = self._candidates((c, r))
+        else:
+            candidates = range(0, self.n)
+        (xs, ys) = (self.xs, self.ys)
+        distances = [(math.sqrt( (x-xs[p]) ** 2 + (y-ys[p]) ** 2), p) for p in candidates]
+        if len(distances) > 16:
+            return heapq.nsmallest(k, distances)
+        distances.sort()
+        return distances[0:k]
+
+
+def _walk_to_layer(bottoms, pixel):
     for b in range(0,len(bottoms)-1):
       if pixel < bottoms[b] and pixel >= bottoms[b+1]:
         start = bottoms[b]
@@ -19,6 +187,21 @@ def pixel_to_layer(pixel):
     return (b, frac)
 
 
+spiral = SpiralTopology(bottoms)
+
+
+def pixel_to_layer(pixel):
+    """Given a pixel, return the loop number and fraction around the
+    loop for this pixel.
+
+    Whole pixels are looked up in spiral; pixelish in-between values
+    are calculated.
+    """
+    if type(pixel) is int and 0 <= pixel < spiral.n:
+        return (spiral.layer[pixel], spiral.frac[pixel])
+    return _walk_to_layer(bottoms, pixel)
+
+
 def generate_pixel_pos(*, extra_pixels=[], rot = 0):
     """Generate a list of each pixel's x,y position
     based on bottoms info.
@@ -27,6 +210,9 @@ def generate_pixel_pos(*, extra_pixels=[], rot = 0):
     decreasing radius around the spiral (and perhaps
     I've done that somewhere already?)"""
 
+    if extra_pixels == [] and rot == 0:
+      return spiral.pixel_pos()
+
     pixel_pos = {}
     for pixel in list(range(0,50)) + extra_pixels:
       (b, frac) = pixel_to_layer(pixel)
@@ -53,8 +239,19 @@ def distances_from_point(x, y, *, pixel_pos):
     return s
 
 
+def nearest_k(x, y, k):
+    """Return the k pixels of the spiral closest to (x, y), as a sorted
+    list of (distance, pixel) tuples. This gives the same result as
+    distances_from_point(x, y, pixel_pos=generate_pixel_pos())[0:k] but
+    much more cheaply."""
+    return spiral.points.nearest_k(x, y, k)
+
+
 def closest_pixels(pixelish):
 
+    if type(pixelish) is int and 0 <= pixelish < spiral.n:
+      return list(spiral.neighbours.closest(pixelish))
+
     pixel_pos = generate_pixel_pos(extra_pixels=[pixelish])
 
     (x, y) = pixel_pos[pixelish]
@@ -0,0 +1,324 @@
+"""Modes rendered in worker processes.
+
+Heavy modes spend nearly all of their time running python code, and
+while they do, the web server and the frame pacing have to fight them
+for the GIL. Run in a worker process instead, a mode only competes for
+the CPU, which the OS shares out far more smoothly.
+
+Each worker has a ring of frame slots in shared memory. The worker
+renders the running mode's frames into the ring, as far ahead as there
+are free slots, and the driver takes them out in order and shows them
+as it would frames rendered in process, pacing them itself. Commands
+to run and stop modes go to the worker over a pipe, and errors and
+switch requests come back up it.
+
+Workers are forked when the driver starts, before it has any threads,
+so they start with every module the driver has loaded, and with the
+modules of the modes they will run already imported. One more worker
+than is needed is kept, so that a mode can start straight away in an
+idle worker while the last one is still winding down.
+"""
+
+import mmap
+import multiprocessing
+import queue
+import signal
+import struct
+import threading
+import time
+import traceback
+
+import swirl.runtime as runtime
+from swirl.modes import modes
+
+# slot header: generation, delay, CPU time, kind, frame length
+header = struct.Struct("<IddBH")
+
+# slot kinds
+FRAME = 0
+NO_FRAME = 1
+END = 2
+FAILED = 3
+
+
+class WorkerError(Exception):
+    pass
+
+
+class Ring:
+    """slots frame slots of frame_size bytes each, in shared memory,
+    with semaphores counting the free and filled ones. Each end of the
+    ring keeps its own index."""
+
+    def __init__(self, ctx, slots, frame_size):
+        self.slots = slots
+        self.frame_size = frame_size
+        self.slot_size = header.size + frame_size
+        self.mem = mmap.mmap(-1, slots * self.slot_size)
+        self.free = ctx.Semaphore(slots)
+        self.filled = ctx.Semaphore(0)
+        self.index = 0
+
+    def put(self, stop, generation, kind, frame=None, delay=0.0, cpu=0.0):
+        """Write a slot, waiting for one to be free. Returns False
+        without writing it if stop is set first."""
+        while not self.free.acquire(timeout=0.05):
+            if stop.is_set():
+                return False
+        o = self.index * self.slot_size
+        length = len(frame) if kind == FRAME else 0
+        header.pack_into(self.mem, o, generation, delay, cpu, kind, length)
+        if kind == FRAME:
+            self.mem[o+header.size:o+header.size+length] = frame
+        self.index = (self.index + 1) % self.slots
+        self.filled.release()
+        return True
+
+    def get(self, timeout):
+        """Read a slot as (generation, kind, frame, delay, cpu), or
+        None if there isn't one within timeout seconds."""
+        if not self.filled.acquire(timeout=timeout):
+            return None
+        o = self.index * self.slot_size
+        (generation, delay, cpu, kind, length) = header.unpack_from(self.mem, o)
+        frame = None
+        if kind == FRAME:
+            frame = bytes(self.mem[o+header.size:o+header.size+length])
+        self.index = (self.index + 1) % self.slots
+        self.free.release()
+        return (generation, kind, frame, delay, cpu)
+
+
+class WorkerController:
+    """Stands in for the driver's mode controller in a worker, passing
+    switches that modes ask for back to the driver."""
+
+    def __init__(self, send):
+        self.send = send
+
+    def switch_to(self, info):
+        self.send(("switch", info.id))
+
+
+def serve(conn, ring, preload):
+    """The main loop of a worker process."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    send_lock = threading.Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    runtime.controller = WorkerController(send)
+    for id in preload:
+        modes[id].func
+
+    commands = queue.Queue()
+    # every run up to this generation has been stopped
+    stopped = [0]
+    current = [0, runtime.StopSignal()]
+
+    def listen():
+        try:
+            while True:
+                message = conn.recv()
+                if message[0] == "run":
+                    commands.put(message[1:])
+                elif message[0] == "stop":
+                    stopped[0] = max(stopped[0], message[1])
+                    if current[0] <= stopped[0]:
+                        current[1].set()
+        except (EOFError, OSError):
+            # the driver has gone
+            commands.put(None)
+
+    threading.Thread(target=listen, name="commands", daemon=True).start()
+
+    while True:
+        command = commands.get()
+        if command is None:
+            return
+        (id, generation) = command
+        stop = runtime.stop = runtime.StopSignal()
+        current[:] = [generation, stop]
+        if generation <= stopped[0]:
+            stop.set()
+
+        info = modes[id]
+        cpu = time.process_time()
+        try:
+            frames = runtime.mode_frames(info.func, stop, 1.0 / info.fps if info.fps else 0)
+            try:
+                for (frame, delay) in frames:
+                    if stop.is_set():
+                        break
+                    now = time.process_time()
+                    if frame is None:
+                        kind = NO_FRAME
+                    else:
+                        kind = FRAME
+                        frame = getattr(frame, "buf", frame)
+                    if not ring.put(stop, generation, kind, frame, delay, now - cpu):
+                        break
+                    cpu = now
+                else:
+                    ring.put(stop, generation, END)
+            finally:
+                frames.close()
+        except Exception:
+            send(("error", generation, traceback.format_exc()))
+            ring.put(stop, generation, FAILED)
+        send(("done", generation))
+
+
+class Worker:
+    """A worker process, as seen from the driver."""
+
+    def __init__(self, ctx, slots, frame_size, preload):
+        self.ring = Ring(ctx, slots, frame_size)
+        (self.conn, child_conn) = ctx.Pipe()
+        self.send_lock = threading.Lock()
+        self.recv_lock = threading.Lock()
+        self.generation = 0
+        self.done = 0
+        self.errors = {}
+        self.mode = None
+        self.frames_taken = 0
+        self.process = ctx.Process(target=serve, args=(child_conn, self.ring, preload),
+                                   name="swirl worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def send(self, message):
+        with self.send_lock:
+            try:
+                self.conn.send(message)
+            except OSError:
+                # it has died, which frames() will notice
+                pass
+
+    def idle(self):
+        """Whether the worker has finished everything it was asked to
+        run."""
+        self.check_messages()
+        return self.done == self.generation
+
+    def check_messages(self):
+        with self.recv_lock:
+            self.receive()
+
+    def receive(self):
+        try:
+            while self.conn.poll():
+                message = self.conn.recv()
+                if message[0] == "done":
+                    self.done = max(self.done, message[1])
+                elif message[0] == "error":
+                    self.errors[message[1]] = message[2]
+                elif message[0] == "switch":
+                    runtime.switch_to(modes[message[1]])
+        except (EOFError, OSError):
+            pass
+
+    def frames(self, info, stop, count_cpu=None):
+        """Run a mode in this worker until stop is set or the mode
+        finishes, giving its frames as (frame, delay) pairs.
+        count_cpu is called with the worker's CPU time for each frame."""
+        self.generation += 1
+        generation = self.generation
+        self.mode = info.id
+        self.send(("run", info.id, generation))
+        stop.on_set(lambda: self.send(("stop", generation)))
+        try:
+            while True:
+                item = self.ring.get(timeout=0.02)
+                if item is None:
+                    if stop.is_set():
+                        return
+                    if not self.process.is_alive():
+                        raise WorkerError("worker for mode {} died with exit code {}".format(info.id, self.process.exitcode))
+                    continue
+                (frame_generation, kind, frame, delay, cpu) = item
+                if frame_generation != generation:
+                    # left over from an earlier mode
+                    continue
+                if kind == END:
+                    return
+                if kind == FAILED:
+                    self.check_messages()
+                    raise WorkerError("mode {} failed in worker:\n{}".format(info.id, self.errors.pop(generation, "")))
+                if count_cpu is not None:
+                    count_cpu(cpu)
+                self.frames_taken += 1
+                yield (frame, delay)
+                self.check_messages()
+        finally:
+            self.send(("stop", generation))
+
+    def as_dict(self):
+        return {"pid": self.process.pid,
+                "alive": self.process.is_alive(),
+                "mode": self.mode,
+                "idle": self.idle(),
+                "frames": self.frames_taken}
+
+
+class WorkerPool:
+    """The worker processes, and which modes run in them.
+
+    which is "none", "heavy" for modes declared with cost="heavy", or
+    "all". count_cpu is called with the worker CPU time for each frame,
+    so that it can be counted against the CPU budget.
+    """
+
+    def __init__(self, which="none", count_cpu=None, spares=1, slots=4, frame_size=150):
+        self.which = which
+        self.count_cpu = count_cpu
+        self.count = 1 + spares
+        self.slots = slots
+        self.frame_size = frame_size
+        self.workers = []
+        self.replaced = 0
+
+    def wanted(self, info):
+        """Whether info should be run in a worker."""
+        return self.which == "all" or (self.which == "heavy" and info.cost == "heavy")
+
+    def runs(self, info):
+        """Whether info will be run in a worker, once they have been
+        started."""
+        return bool(self.workers) and self.wanted(info)
+
+    def start(self):
+        """Start the workers. This forks, so it should be called before
+        the driver starts any threads."""
+        if self.which == "none":
+            return
+        self.ctx = multiprocessing.get_context("fork")
+        self.preload = [info.id for info in modes if self.wanted(info)]
+        self.workers = [self.new_worker() for i in range(self.count)]
+
+    def new_worker(self):
+        return Worker(self.ctx, self.slots, self.frame_size, self.preload)
+
+    def frames(self, info, stop):
+        """Run a mode in an idle worker, as for Worker.frames."""
+        for (i, worker) in enumerate(self.workers):
+            if not worker.process.is_alive():
+                # this one forks with other threads running, which
+                # the workers started by start() don't
+                self.workers[i] = self.new_worker()
+                self.replaced += 1
+        idle = [w for w in self.workers if w.idle()] or self.workers
+        worker = idle[0]
+        # keep the busiest workers at the end, so that the idle one
+        # picked next time is the one that has been idle longest
+        self.workers.remove(worker)
+        self.workers.append(worker)
+        return worker.frames(info, stop, self.count_cpu)
+
+    def as_dict(self):
+        return {"which": self.which,
+                "replaced": self.replaced,
+                "workers": [w.as_dict() for w in self.workers]}
@@ -0,0 +1,20 @@
+import swirl.blend as blend
+from swirl.topologies import spiral
+
+old = bytes([10] * 150)
+new = bytes([200] * 150)
+
+
+def test_wipe_starts_at_the_centre():
+    frame = blend.wipe(old, new, 0.1)
+    shown = [p for p in range(50) if frame[p*3] == 200]
+    hidden = [p for p in range(50) if frame[p*3] == 10]
+    # the last pixel is in the centre, the first on the outside
+    assert 49 in shown
+    assert 0 in hidden
+    assert max(spiral.radius[p] for p in shown) < max(spiral.radius[p] for p in hidden)
+
+
+def test_wipe_ends():
+    assert blend.wipe(old, new, 0.0) == old
+    assert blend.wipe(old, new, 1.0) == new
@@ -0,0 +1,53 @@
+import os
+import threading
+
+import swirl.runtime as runtime
+from swirl.modes.external import FrameReader, pmode_cli
+
+
+def pipe():
+    (r, w) = os.pipe()
+    return (open(r, "rb", buffering=0), open(w, "wb", buffering=0))
+
+
+def within(seconds, func):
+    """Call func in a thread, returning [its result], or [] if it is
+    still going after seconds."""
+    result = []
+    t = threading.Thread(target=lambda: result.append(func()), daemon=True)
+    t.start()
+    t.join(timeout=seconds)
+    return result
+
+
+def test_reader_stopped_before_it_starts():
+    (r, w) = pipe()
+    reader = FrameReader(r)
+    reader.stop()
+    reader.start()
+    assert within(1, reader.next_frame) == [None]
+    assert not reader.thread.is_alive()
+    r.close()
+    w.close()
+
+
+def test_reader_stopped_while_waiting():
+    (r, w) = pipe()
+    reader = FrameReader(r)
+    reader.start()
+    w.write(b"ff0000\n")
+    assert within(1, reader.next_frame)[0][0:3] == b"\xff\x00\x00"
+    threading.Timer(0.1, reader.stop).start()
+    assert within(1, reader.next_frame) == [None]
+    reader.thread.join(timeout=1)
+    assert not reader.thread.is_alive()
+    r.close()
+    w.close()
+
+
+def test_cli_mode_already_stopped(monkeypatch):
+    stop = runtime.StopSignal()
+    stop.set()
+    monkeypatch.setattr(runtime, "stop", stop)
+    frames = pmode_cli(["sleep", "30"])
+    assert within(5, lambda: list(frames)) == [[]]
@@ -0,0 +1,46 @@
+import pytest
+
+import swirl.framebuffer as framebuffer
+
+adafruit_pixelbuf = pytest.importorskip("adafruit_pixelbuf")
+
+
+class Strip(adafruit_pixelbuf.PixelBuf):
+    def __init__(self, n, **kwargs):
+        super().__init__(n, auto_write=False, **kwargs)
+        self.sent = None
+
+    def _transmit(self, buffer):
+        self.sent = bytes(buffer)
+
+
+frame = bytes((i * 37) % 256 for i in range(150))
+
+
+def per_pixel(strip):
+    strip[0:len(strip)] = list(zip(frame[0::3], frame[1::3], frame[2::3]))
+    strip.show()
+    return strip.sent
+
+
+def test_the_checked_version_is_installed():
+    # if this fails, check write_neopixel() against the new version's
+    # buffers, and add it to pixelbuf_versions
+    assert adafruit_pixelbuf.__version__.split(".")[0] in framebuffer.pixelbuf_versions
+    assert framebuffer._bulk_writable(Strip(50, byteorder="GRB"))
+
+
+@pytest.mark.parametrize("byteorder", ["RGB", "GRB", "BRG"])
+@pytest.mark.parametrize("brightness", [1.0, 0.5, 0.2])
+def test_bulk_copy_matches_the_library(byteorder, brightness):
+    strip = Strip(50, byteorder=byteorder, brightness=brightness)
+    framebuffer.write_neopixel(strip, frame)
+    assert strip.sent == per_pixel(Strip(50, byteorder=byteorder, brightness=brightness))
+    # and the unscaled colours are kept, as the library keeps them
+    assert [tuple(c) for c in strip[0:50]] == [tuple(frame[p*3:p*3+3]) for p in range(50)]
+
+
+def test_other_strips_go_through_the_library():
+    strip = Strip(50, byteorder="GRBW")
+    framebuffer.write_neopixel(strip, frame)
+    assert strip.sent == per_pixel(Strip(50, byteorder="GRBW"))
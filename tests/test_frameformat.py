@@ -0,0 +1,40 @@
+import pytest
+
+import swirl.frameformat as frameformat
+
+
+def opc(channel, data, command=frameformat.opc_set_pixels):
+    return frameformat.opc_header.pack(channel, command, len(data)) + data
+
+
+def frames_in(buf):
+    (frames, last, pos) = frameformat.scan(buf, 0, len(buf))
+    return (frames, None if last is None else bytes(frameformat.decode(buf, last, 6)), pos)
+
+
+def test_formats():
+    assert frames_in(b"ff0000\r\n") == (1, bytes([255, 0, 0, 0, 0, 0]), 8)
+    assert frames_in(b"ff000000ff00\n") == (1, bytes([255, 0, 0, 0, 255, 0]), 13)
+    assert frames_in(b"SWRL\x00\x03\x01\x02\x03") == (1, bytes([1, 2, 3, 0, 0, 0]), 9)
+
+
+@pytest.mark.parametrize("channel", [0, 1])
+def test_opc(channel):
+    buf = opc(channel, bytes([1, 2, 3]))
+    assert frames_in(buf) == (1, bytes([1, 2, 3, 0, 0, 0]), len(buf))
+
+
+@pytest.mark.parametrize("channel", [2, ord("S"), ord("0"), ord("a"), ord("F"), ord(" "), ord("\t"), ord("\r")])
+def test_opc_other_channels_are_skipped(channel):
+    buf = opc(channel, bytes([4, 5, 6])) + opc(0, bytes([1, 2, 3]))
+    assert frames_in(buf) == (1, bytes([1, 2, 3, 0, 0, 0]), len(buf))
+
+
+@pytest.mark.parametrize("channel", [ord("S"), ord("0"), ord(" ")])
+def test_incomplete_opc_waits(channel):
+    buf = opc(channel, bytes([4, 5, 6]))
+    assert frames_in(buf[:-1]) == (0, None, 0)
+
+
+def test_incomplete_hex_waits():
+    assert frames_in(b"ff0000") == (0, None, 0)
@@ -0,0 +1,59 @@
+import pytest
+
+import swirl.governor as governor
+from swirl.modes import modes
+
+
+class FakeTime:
+    def __init__(self):
+        self.cpu = 0.0
+
+    def thread_time(self):
+        return self.cpu
+
+    def monotonic(self):
+        return 0.0
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    t = FakeTime()
+    monkeypatch.setattr(governor, "time", t)
+    return t
+
+
+def run_frames(g, t, cpu_per_frame, frames=20):
+    for _ in range(frames):
+        t.cpu += cpu_per_frame
+        delay = g.frame_delay(0.01)
+    return delay
+
+
+def test_mode_over_its_budget_is_slowed_down(fake_time):
+    g = governor.Governor(max_fps=0, cpu_budget=0.5, load_limit=0)
+    g.start("greedy", cpu_budget=0.1)
+    # 5ms a frame in a tenth of a CPU is a frame every 50ms
+    assert run_frames(g, fake_time, 0.005) == pytest.approx(0.05)
+    assert g.limited_by == "budget"
+
+
+def test_mode_without_a_budget_gets_the_default(fake_time):
+    g = governor.Governor(max_fps=0, cpu_budget=0.5, load_limit=0)
+    g.start("ordinary")
+    # 4ms a frame is within half a CPU at the 10ms the mode asks for
+    assert run_frames(g, fake_time, 0.004) == pytest.approx(0.01)
+    assert g.limited_by == "mode"
+
+
+def test_cpu_of_other_threads_counts(fake_time):
+    g = governor.Governor(max_fps=0, cpu_budget=0.5, load_limit=0)
+    g.start("loop style", cpu_budget=0.1)
+    for _ in range(20):
+        g.add_thread_cpu(0.005)
+        delay = g.frame_delay(0.01)
+    assert delay == pytest.approx(0.05)
+
+
+def test_heavy_modes_have_budgets():
+    for id in ("27", "63", "101"):
+        assert modes[id].cpu_budget == 0.25